@@ -0,0 +1,108 @@
+"""
+Асинхронный режим бота: AsyncTeleBot и асинхронный пул соединений psycopg 3.
+
+Запуск: python async_main.py (вместо python main.py).
+Бизнес-логика (SQL-запросы, разбор результатов, кэши, клавиатуры, графики) общая
+с синхронным режимом; асинхронные версии функций находятся в пакетах database/aio,
+inline_keyboard/aio и handlers/aio.
+Как и в main.py, бот создаётся внутри функций: процессы отрисовки графиков импортируют
+этот модуль как __mp_main__ и не должны загружать telebot, Flask и слой БД.
+"""
+import asyncio
+
+from config import (BOT_TOKEN, CLEANUP_SCHEDULE, RECURRING_SCHEDULE,
+                    SCHEDULER_JITTER, STATS_SCHEDULE)
+
+
+def create_bot():
+    """
+    Создаёт асинхронное хранилище состояний FSM, бота и очередь отправки и регистрирует все обработчики.
+
+    Returns:
+        tuple: (bot, storage, outbound).
+    """
+    from telebot.async_telebot import AsyncTeleBot
+
+    from handlers.aio.register import register_all_handlers
+    from outbound import AsyncOutboundBot, AsyncOutboundDispatcher
+    from state_storage import create_async_state_storage
+
+    # Асинхронное хранилище состояний FSM: в памяти или в PostgreSQL, см. STATE_STORAGE
+    storage = create_async_state_storage()
+    bot = AsyncTeleBot(BOT_TOKEN, state_storage=storage)
+
+    # Запросы обработчиков к Bot API проходят через очередь отправки с ограничением частоты
+    outbound = AsyncOutboundDispatcher(bot)
+    register_all_handlers(bot, AsyncOutboundBot(bot, outbound))
+    return bot, storage, outbound
+
+
+def create_scheduler(storage, outbound):
+    """
+    Создаёт планировщик фоновых задач (см. main.py). Блокировки и история запусков планировщика
+    используют синхронный пул соединений, поэтому он остаётся открытым и в асинхронном режиме.
+    """
+    from database.aio.clean_old_categories import delete_old_deleted_categories
+    from database.aio.connection import get_async_pool_stats
+    from database.aio.recurring import materialize_recurring_expenses
+    from database.aio.states import purge_idle_states
+    from database.user_data import user_id_cache
+    from scheduler import Scheduler
+    from state_storage import STATE_IDLE_TTL, STATE_STORAGE
+
+    scheduler = Scheduler()
+
+    def report_stats():
+        """Выводит метрики пула соединений, кэшей и фоновых задач."""
+        print(f'[i] Пул соединений с БД: {get_async_pool_stats()}')
+        print(f'[i] Кэш состояний чатов: {storage.stats()}')
+        print(f'[i] Кэш ID пользователей: {user_id_cache.stats()}')
+        print(f'[i] Очередь отправки: {outbound.stats()}')
+        print(f'[i] Фоновые задачи: {scheduler.stats()}')
+
+    async def purge_idle_chat_states():
+        """Удаляет из таблицы bot_states состояния давно неактивных чатов."""
+        print(f'Удалено неактивных состояний чатов: {await purge_idle_states(STATE_IDLE_TTL)}')
+
+    scheduler.add_job('clean_old_categories', CLEANUP_SCHEDULE, delete_old_deleted_categories, jitter=SCHEDULER_JITTER)
+    if STATE_STORAGE == 'postgres':
+        scheduler.add_job('purge_idle_states', CLEANUP_SCHEDULE, purge_idle_chat_states, jitter=SCHEDULER_JITTER)
+    scheduler.add_job('recurring_expenses', RECURRING_SCHEDULE, materialize_recurring_expenses, jitter=SCHEDULER_JITTER)
+    scheduler.add_job('report_stats', STATS_SCHEDULE, report_stats, exclusive=False)
+    return scheduler
+
+
+async def run(bot, outbound, scheduler):
+    from charts.renderer import prewarm_charts_in_background
+    from database.aio.connection import close_async_pool, open_async_pool
+
+    await open_async_pool()
+    # Планировщик работает в своём потоке, а корутинные задачи выполняет в цикле событий бота
+    scheduler.loop = asyncio.get_running_loop()
+    scheduler.start()
+    # Стек графиков загружается в фоне, параллельно с началом обработки обновлений
+    prewarm_charts_in_background()
+    try:
+        await bot.infinity_polling(skip_pending=True)
+    finally:
+        scheduler.stop()
+        await outbound.close()
+        await close_async_pool()
+        await bot.close_session()
+
+
+def main():
+    from database.migrations import apply_migrations
+    from keep_alive import keep_alive
+
+    # Миграции применяются синхронно до запуска цикла событий
+    if not apply_migrations():
+        raise SystemExit('[!] Не удалось применить миграции базы данных.')
+    bot, storage, outbound = create_bot()
+    scheduler = create_scheduler(storage, outbound)
+    keep_alive()
+    asyncio.run(run(bot, outbound, scheduler))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Микробенчмарк диспетчеризации обновлений: роутер (handlers/router.py) против прежней
+цепочки обработчиков с фильтрами-лямбдами, которые проверялись по очереди.
+
+Запуск:
+    python -m benchmarks.dispatch --updates 200000
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from telebot import util
+
+from config import key_board_buttons
+from handlers.router import Router
+from states import UserState
+
+CALLBACK_PREFIXES = ['rename_category:', 'delete_category:', 'confirm_delete:', 'cancel_delete:',
+                     'select_expense_category:', 'time_interval_']
+STATE_NAMES = [UserState.WAITING_FOR_CATEGORY_NAME.name, UserState.WAITING_FOR_NEW_CATEGORY_NAME.name,
+               UserState.WAITING_FOR_EXPENSE_AMOUNT.name]
+
+
+class FakeBot:
+    """Заглушка бота: хранит состояния в словаре и считает обращения к хранилищу."""
+
+    def __init__(self, states: dict):
+        self.states = states
+        self.get_state_calls = 0
+
+    def get_state(self, chat_id):
+        self.get_state_calls += 1
+        return self.states.get(chat_id)
+
+
+def handler(*_):
+    return None
+
+
+def build_legacy_chain(bot: FakeBot):
+    """Повторяет порядок и фильтры обработчиков из прежней версии handlers/register.py."""
+    def state_is(name):
+        return lambda message: bot.get_state(message.chat.id) == name
+
+    def text_is(text):
+        return lambda message: message.text == text
+
+    messages = [
+        lambda message: util.extract_command(message.text) in ['start'],
+        text_is(key_board_buttons['create_category']),
+        state_is(UserState.WAITING_FOR_CATEGORY_NAME.name),
+        text_is(key_board_buttons['rename_category']),
+        state_is(UserState.WAITING_FOR_NEW_CATEGORY_NAME.name),
+        text_is(key_board_buttons['delete_category']),
+        text_is(key_board_buttons['expenses']),
+        state_is(UserState.WAITING_FOR_EXPENSE_AMOUNT.name),
+        text_is(key_board_buttons['statistics']),
+        text_is(key_board_buttons['basic_expenses']),
+        lambda message: True,
+    ]
+    callbacks = [
+        lambda query: query.data.startswith('rename_category:'),
+        lambda query: query.data.startswith('delete_category:'),
+        lambda query: query.data.startswith('confirm_delete:') or query.data.startswith('cancel_delete:'),
+        lambda query: query.data.startswith('select_expense_category:'),
+        lambda query: query.data.startswith('time_interval_'),
+    ]
+    return messages, callbacks
+
+
+def build_router(bot: FakeBot) -> Router:
+    router = Router(bot)
+    router.command('start', handler)
+    for text in key_board_buttons.values():
+        router.button(text, handler)
+    for state in (UserState.WAITING_FOR_CATEGORY_NAME, UserState.WAITING_FOR_NEW_CATEGORY_NAME,
+                  UserState.WAITING_FOR_EXPENSE_AMOUNT):
+        router.state(state, handler)
+    for prefix in CALLBACK_PREFIXES:
+        router.callback(prefix, handler)
+    router.default_message_handler = handler
+    return router
+
+
+def make_updates(count: int, chats: int):
+    """Смесь обновлений: кнопки, ввод в состоянии, свободный текст, команды и callback-запросы."""
+    rng = random.Random(0)
+    buttons = list(key_board_buttons.values())
+    updates = []
+    for _ in range(count):
+        chat = SimpleNamespace(id=rng.randrange(chats))
+        kind = rng.random()
+        if kind < 0.3:
+            updates.append(('message', SimpleNamespace(chat=chat, text=rng.choice(buttons))))
+        elif kind < 0.55:
+            updates.append(('message', SimpleNamespace(chat=chat, text=str(rng.randint(1, 5000)))))
+        elif kind < 0.6:
+            updates.append(('message', SimpleNamespace(chat=chat, text='/start')))
+        else:
+            data = rng.choice(CALLBACK_PREFIXES + ['time_interval_for_basic_expenses_'])
+            updates.append(('callback', SimpleNamespace(data=f'{data}{rng.randint(1, 999)}')))
+    return updates
+
+
+def run_legacy(bot: FakeBot, updates) -> float:
+    messages, callbacks = build_legacy_chain(bot)
+    started = time.perf_counter()
+    for kind, update in updates:
+        for test in (messages if kind == 'message' else callbacks):
+            if test(update):
+                break
+    return time.perf_counter() - started
+
+
+def run_router(bot: FakeBot, updates) -> float:
+    router = build_router(bot)
+    started = time.perf_counter()
+    for kind, update in updates:
+        if kind == 'message':
+            router.resolve_message(update)
+        else:
+            router.resolve_callback(update)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--updates', type=int, default=200_000, help='число обновлений')
+    parser.add_argument('--chats', type=int, default=1000, help='число разных чатов')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    # Примерно треть чатов находится в одном из состояний ожидания ввода
+    states = {chat: rng.choice(STATE_NAMES) for chat in range(args.chats) if rng.random() < 0.3}
+    updates = make_updates(args.updates, args.chats)
+
+    results = []
+    for title, run in (('Цепочка фильтров', run_legacy), ('Роутер', run_router)):
+        bot = FakeBot(states)
+        elapsed = run(bot, updates)
+        results.append(elapsed)
+        print(f"{title:<17} {elapsed / args.updates * 1e6:6.2f} мкс/обновление, "
+              f"обращений к хранилищу состояний: {bot.get_state_calls}")
+    print(f"Ускорение: {results[0] / results[1]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
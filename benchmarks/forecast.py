@@ -0,0 +1,189 @@
+"""
+Бенчмарк прогноза трат: загрузка дневных итогов (database.statistics.daily_totals)
+и векторный расчёт forecast.build_forecast для пользователя с многолетней историей.
+
+Запуск (на отдельной, не боевой базе из DB_URL):
+    python -m benchmarks.forecast --years 6 --categories 20 --repeat 30 --budget-ms 100
+
+Скрипт создаёт тестового пользователя с расходами по каждой категории за каждый день
+истории, замеряет загрузку и расчёт прогноза, сверяет результат с построчной
+реализацией на чистом Python и удаляет созданные данные. Код возврата 1 — если медиана
+загрузки и расчёта вместе превышает бюджет --budget-ms.
+"""
+import argparse
+import calendar
+import math
+import statistics
+import struct
+import time
+from datetime import date
+
+from database.connection import db_connection
+from database.migrations import apply_migrations
+from database.statistics import daily_totals
+from forecast import (FORECAST_RATE_DAYS, FORECAST_TREND_DAYS, ROLLING_WINDOWS,
+                      build_forecast, daily_matrix, trend_slopes)
+from time_interval import date_range_interval, forecast_interval
+
+BENCH_TELEGRAM_ID = -1  # Несуществующий в Telegram ID для тестового пользователя
+
+
+def seed(years: int, categories: int) -> int:
+    """Создаёт тестового пользователя с ежедневными расходами по всем категориям. Возвращает ID пользователя."""
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO users (telegram_id, username) VALUES (%s, 'benchmark')
+            ON CONFLICT (telegram_id) DO UPDATE SET username = EXCLUDED.username
+            RETURNING id
+        """, (BENCH_TELEGRAM_ID,))
+        user_id = cur.fetchone()[0]
+
+        cur.execute("""
+            INSERT INTO categories (user_id, name, is_deleted)
+            SELECT %s, 'Категория ' || n, n %% 5 = 0
+            FROM generate_series(1, %s) AS n
+            RETURNING id
+        """, (user_id, categories))
+        category_ids = [row[0] for row in cur.fetchall()]
+
+        # Расходы генерируются на стороне БД; дневные итоги заполняют триггеры daily_category_totals
+        cur.execute("""
+            INSERT INTO expenses (user_id, category_id, amount, date)
+            SELECT %s, c.id, round((random() * 3000)::numeric, 2),
+                   day + random() * interval '1 day'
+            FROM unnest(%s::int[]) AS c(id),
+                 generate_series(CURRENT_DATE - make_interval(years => %s), CURRENT_DATE - 1,
+                                 interval '1 day') AS day
+        """, (user_id, category_ids, years))
+        cur.execute("ANALYZE expenses")
+        cur.execute("ANALYZE daily_category_totals")
+        conn.commit()
+    return user_id
+
+
+def cleanup(user_id: int) -> None:
+    """Удаляет данные тестового пользователя."""
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM expenses WHERE user_id = %s", (user_id,))
+        cur.execute("DELETE FROM categories WHERE user_id = %s", (user_id,))
+        cur.execute("DELETE FROM users WHERE id = %s", (user_id,))
+        conn.commit()
+
+
+def loop_forecast(data: dict) -> dict:
+    """Построчная реализация основных показателей build_forecast на чистом Python — для сверки и сравнения."""
+    period_days = (data['end_date'] - data['start_date']).days + 1
+    matrix = [[0.0] * period_days for _ in data['categories']]
+    for row, category in zip(matrix, data['categories']):
+        days = struct.unpack(f">{len(category['days']) // 4}i", category['days'])
+        totals = struct.unpack(f">{len(category['totals']) // 8}d", category['totals'])
+        for day, total in zip(days, totals):
+            row[day] = total
+    daily = [sum(row[day] for row in matrix) for day in range(period_days)]
+    rolling = {
+        window: [sum(daily[max(0, day - window + 1):day + 1]) / min(window, day + 1) for day in range(period_days)]
+        for window in ROLLING_WINDOWS
+    }
+
+    today = data['end_date']
+    month_offset = max(0, (date(today.year, today.month, 1) - data['start_date']).days)
+    month_spent = sum(daily[month_offset:])
+    spending_days = [day for day, total in enumerate(daily) if total]
+    first_day = spending_days[0] if spending_days else period_days - 1
+    last_day = period_days - 1
+
+    rate_window = daily[max(first_day, last_day - FORECAST_RATE_DAYS):last_day]
+    daily_rate = sum(rate_window) / len(rate_window) if rate_window else 0.0
+    remaining_days = calendar.monthrange(today.year, today.month)[1] - today.day
+
+    slopes = []
+    trend_start = max(first_day, last_day - FORECAST_TREND_DAYS)
+    size = last_day - trend_start
+    x_mean = (size - 1) / 2
+    x_square = sum((x - x_mean) ** 2 for x in range(size))
+    for row in matrix:
+        slopes.append(sum((x - x_mean) * row[trend_start + x] for x in range(size)) / x_square if size > 1 else 0.0)
+
+    return {
+        'rolling': rolling,
+        'projected_total': month_spent + daily_rate * remaining_days,
+        'slopes': slopes,
+    }
+
+
+def measure(func, repeat: int, *args) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(title: str, timings: list[float]) -> None:
+    print(f"{title:<22} медиана {statistics.median(timings):8.2f} мс, "
+          f"p95 {statistics.quantiles(timings, n=20)[-1]:8.2f} мс, макс {max(timings):8.2f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=6, help='глубина истории в годах')
+    parser.add_argument('--categories', type=int, default=20, help='число категорий')
+    parser.add_argument('--repeat', type=int, default=30, help='число повторов каждого замера')
+    parser.add_argument('--budget-ms', type=float, default=100, help='бюджет на загрузку и расчёт прогноза, мс')
+    args = parser.parse_args()
+
+    if not apply_migrations():
+        raise SystemExit(1)
+    user_id = seed(args.years, args.categories)
+    try:
+        interval = forecast_interval()
+        today = interval['end_date'].date()
+        full_interval = date_range_interval(today.replace(year=today.year - args.years), today)
+
+        data = daily_totals(user_id, interval)
+        full_data = daily_totals(user_id, full_interval)
+        forecast, reference = build_forecast(data), loop_forecast(data)
+        # Порядок суммирования у NumPy другой, поэтому сравнение с допуском на погрешность float
+        assert math.isclose(forecast['projected_total'], reference['projected_total'], rel_tol=1e-9), \
+            'Прогнозы на конец месяца не совпадают'
+        last_day = (data['end_date'] - data['start_date']).days
+        slopes = trend_slopes(daily_matrix(data)[:, last_day - FORECAST_TREND_DAYS:last_day])
+        assert all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6) for a, b in zip(slopes, reference['slopes'])), \
+            'Тренды не совпадают'
+        for window, series in forecast['rolling'].items():
+            assert all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6) for a, b in zip(series, reference['rolling'][window])), \
+                'Скользящие средние не совпадают'
+
+        # Прогрев пула соединений и кэша страниц
+        measure(daily_totals, 3, user_id, interval)
+        measure(build_forecast, 3, data)
+
+        load_ms = measure(daily_totals, args.repeat, user_id, interval)
+        compute_ms = measure(build_forecast, args.repeat, data)
+        loop_ms = measure(loop_forecast, args.repeat, data)
+        full_load_ms = measure(daily_totals, args.repeat, user_id, full_interval)
+        full_compute_ms = measure(build_forecast, args.repeat, full_data)
+        full_loop_ms = measure(loop_forecast, args.repeat, full_data)
+    finally:
+        cleanup(user_id)
+
+    print(f"История: {args.years} лет, категорий: {args.categories}, "
+          f"дневных итогов: {sum(len(category['days']) // 4 for category in full_data['categories'])}")
+    report('Загрузка (365 дн.)', load_ms)
+    report('Расчёт NumPy/pandas', compute_ms)
+    report('Расчёт на Python', loop_ms)
+    report(f'Загрузка ({args.years} лет)', full_load_ms)
+    report(f'Расчёт ({args.years} лет)', full_compute_ms)
+    report(f'На Python ({args.years} лет)', full_loop_ms)
+    print(f"Ускорение расчёта по медиане: {statistics.median(loop_ms) / statistics.median(compute_ms):.2f}x "
+          f"(365 дн.), {statistics.median(full_loop_ms) / statistics.median(full_compute_ms):.2f}x ({args.years} лет)")
+
+    total = statistics.median(load_ms) + statistics.median(compute_ms)
+    print(f"Загрузка и расчёт: {total:.2f} мс при бюджете {args.budget_ms:.0f} мс")
+    if total > args.budget_ms:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
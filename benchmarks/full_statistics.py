@@ -0,0 +1,120 @@
+"""
+Бенчмарк full_statistics: один запрос с GROUPING SETS против прежних двух запросов
+(statistics_for_week_or_month + statistics_by_category).
+
+Запуск (на отдельной, не боевой базе из DB_URL):
+    python -m benchmarks.full_statistics --expenses 200000 --repeat 50
+
+Скрипт создаёт тестового пользователя с категориями и расходами,
+замеряет оба варианта и удаляет созданные данные.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from database.connection import db_connection
+from database.migrations import apply_migrations
+from database.statistics import (full_statistics, statistics_by_category,
+                                 statistics_for_week_or_month)
+from time_interval import get_time_interval
+
+BENCH_TELEGRAM_ID = -1  # Несуществующий в Telegram ID для тестового пользователя
+
+
+def seed(expenses: int, categories: int, days: int) -> int:
+    """Создаёт тестового пользователя и заполняет его расходы. Возвращает ID пользователя."""
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO users (telegram_id, username) VALUES (%s, 'benchmark')
+            ON CONFLICT (telegram_id) DO UPDATE SET username = EXCLUDED.username
+            RETURNING id
+        """, (BENCH_TELEGRAM_ID,))
+        user_id = cur.fetchone()[0]
+
+        cur.execute("""
+            INSERT INTO categories (user_id, name, is_deleted)
+            SELECT %s, 'Категория ' || n, n %% 5 = 0
+            FROM generate_series(1, %s) AS n
+            RETURNING id
+        """, (user_id, categories))
+        category_ids = [row[0] for row in cur.fetchall()]
+
+        # Расходы генерируются на стороне БД, чтобы не гонять данные по сети
+        cur.execute("""
+            INSERT INTO expenses (user_id, category_id, amount, date)
+            SELECT %s,
+                   (%s::int[])[1 + floor(random() * %s)::int],
+                   round((random() * 5000)::numeric, 2),
+                   NOW() - random() * make_interval(days => %s)
+            FROM generate_series(1, %s)
+        """, (user_id, category_ids, len(category_ids), days, expenses))
+        cur.execute("ANALYZE expenses")
+        conn.commit()
+    return user_id
+
+
+def cleanup(user_id: int) -> None:
+    """Удаляет данные тестового пользователя."""
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM expenses WHERE user_id = %s", (user_id,))
+        cur.execute("DELETE FROM categories WHERE user_id = %s", (user_id,))
+        cur.execute("DELETE FROM users WHERE id = %s", (user_id,))
+        conn.commit()
+
+
+def two_queries(user_id: int, start_date: datetime, end_date: datetime) -> dict:
+    """Прежняя реализация full_statistics: два запроса на двух соединениях."""
+    return {
+        'total_expenses': statistics_for_week_or_month(user_id, start_date, end_date),
+        'expenses_by_category': statistics_by_category(user_id, start_date, end_date),
+    }
+
+
+def measure(func, repeat: int, *args) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--expenses', type=int, default=100_000, help='число расходов тестового пользователя')
+    parser.add_argument('--categories', type=int, default=20, help='число категорий')
+    parser.add_argument('--days', type=int, default=365, help='глубина истории в днях')
+    parser.add_argument('--interval', type=int, default=30, help='период статистики в днях')
+    parser.add_argument('--repeat', type=int, default=30, help='число повторов каждого варианта')
+    args = parser.parse_args()
+
+    if not apply_migrations():
+        raise SystemExit(1)
+    user_id = seed(args.expenses, args.categories, args.days)
+    try:
+        dates = get_time_interval(args.interval)
+        interval = (user_id, dates['start_date'], dates['end_date'])
+
+        old, new = two_queries(*interval), full_statistics(*interval)
+        assert round(old['total_expenses'], 2) == round(new['total_expenses'], 2), 'Общие суммы не совпадают'
+        assert old['expenses_by_category'] == new['expenses_by_category'], 'Суммы по категориям не совпадают'
+
+        # Прогрев пула соединений и кэша страниц
+        measure(two_queries, 3, *interval)
+        measure(full_statistics, 3, *interval)
+
+        old_ms = measure(two_queries, args.repeat, *interval)
+        new_ms = measure(full_statistics, args.repeat, *interval)
+    finally:
+        cleanup(user_id)
+
+    print(f"Расходов: {args.expenses}, категорий: {args.categories}, период: {args.interval} дн.")
+    for title, timings in (('Два запроса', old_ms), ('Один запрос', new_ms)):
+        print(f"{title:<12} медиана {statistics.median(timings):8.2f} мс, "
+              f"мин {min(timings):8.2f} мс, макс {max(timings):8.2f} мс")
+    print(f"Ускорение по медиане: {statistics.median(old_ms) / statistics.median(new_ms):.2f}x")
+
+
+if __name__ == '__main__':
+    main()
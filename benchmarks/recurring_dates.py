@@ -0,0 +1,109 @@
+"""
+Проверки дат регулярных расходов: first_occurrence, next_occurrence, materialization_batch
+и разбор аргументов команды '/recurring' (parse_recurring_args). БД не нужна.
+
+Запуск:
+    python -m benchmarks.recurring_dates
+
+Код возврата 1 — если какая-то проверка не прошла.
+"""
+import traceback
+from datetime import date
+
+from database.recurring import (RECURRING_MAX_PERIODS, first_occurrence,
+                                materialization_batch, next_occurrence)
+from handlers.recurring_handler import parse_recurring_args
+
+CATEGORIES = [{'id': 1, 'name': 'аренда'}, {'id': 2, 'name': 'еда вне дома'}]
+
+
+def check_monthly_clamping() -> None:
+    """31-е число в коротком месяце переносится на последний день, а в следующем возвращается к 31-му."""
+    assert next_occurrence('monthly', 31, date(2026, 1, 31)) == date(2026, 2, 28)
+    assert next_occurrence('monthly', 31, date(2028, 1, 31)) == date(2028, 2, 29)
+    assert next_occurrence('monthly', 31, date(2026, 2, 28)) == date(2026, 3, 31)
+    assert next_occurrence('monthly', 30, date(2026, 12, 30)) == date(2027, 1, 30)
+    assert first_occurrence('monthly', 31, date(2026, 2, 10)) == date(2026, 2, 28)
+    assert first_occurrence('monthly', 5, date(2026, 2, 10)) == date(2026, 3, 5)
+    assert first_occurrence('monthly', 10, date(2026, 2, 10)) == date(2026, 2, 10)
+
+
+def check_daily_and_weekly() -> None:
+    """Ежедневные правила начинаются с даты старта, еженедельные — с ближайшего нужного дня недели."""
+    assert first_occurrence('daily', None, date(2026, 10, 16)) == date(2026, 10, 16)
+    assert next_occurrence('daily', None, date(2026, 12, 31)) == date(2027, 1, 1)
+    # 16.10.2026 — пятница (5)
+    assert first_occurrence('weekly', 5, date(2026, 10, 16)) == date(2026, 10, 16)
+    assert first_occurrence('weekly', 1, date(2026, 10, 16)) == date(2026, 10, 19)
+    assert next_occurrence('weekly', 1, date(2026, 10, 19)) == date(2026, 10, 26)
+
+
+def check_materialization_batch() -> None:
+    """Пропущенные даты записываются по сегодняшнюю включительно, будущие правила только переносятся."""
+    today = date(2026, 3, 31)
+    rows = [
+        (1, 'monthly', 31, date(2026, 1, 31)),
+        (2, 'weekly', 2, date(2026, 4, 7)),
+    ]
+    rule_ids, periods, advance_ids, next_dates = materialization_batch(rows, today)
+    assert rule_ids == [1, 1, 1]
+    assert periods == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)]
+    assert advance_ids == [1, 2]
+    assert next_dates == [date(2026, 4, 30), date(2026, 4, 7)]
+
+
+def check_max_periods_cap() -> None:
+    """Правило, пропущенное дольше RECURRING_MAX_PERIODS дат, дописывается за несколько запусков."""
+    start = date(2024, 1, 1)
+    today = date(2026, 10, 16)
+    rule_ids, periods, _, next_dates = materialization_batch([(7, 'daily', None, start)], today)
+    assert len(periods) == RECURRING_MAX_PERIODS
+    assert periods[0] == start
+    assert next_dates == [next_occurrence('daily', None, periods[-1])]
+
+    # Следующий запуск продолжает с сохранённой next_date без пропусков и повторов
+    _, more_periods, _, _ = materialization_batch([(7, 'daily', None, next_dates[0])], today)
+    assert more_periods[0] == next_occurrence('daily', None, periods[-1])
+    assert not set(periods) & set(more_periods)
+
+
+def check_parse_args() -> None:
+    """Аргументы '/recurring': периодичность и день, несколько строк и некорректный ввод."""
+    today = date(2026, 10, 16)
+
+    rule = parse_recurring_args('аренда 30000 ежемесячно 5', CATEGORIES, today)
+    assert rule == {'category_id': 1, 'category': 'аренда', 'amount': 30000.0, 'frequency': 'monthly', 'day': 5}
+    assert parse_recurring_args('аренда 30000', CATEGORIES, today)['day'] == 16
+    assert parse_recurring_args('еда вне дома 500 еженедельно пн', CATEGORIES, today)['day'] == 1
+    assert parse_recurring_args('аренда 100 ежедневно', CATEGORIES, today)['day'] is None
+
+    # Категория и сумма на разных строках, как в пакетной записи трат
+    assert parse_recurring_args('аренда\n30000', CATEGORIES, today)['amount'] == 30000.0
+    assert parse_recurring_args('аренда 30000\nежемесячно\n5-го', CATEGORIES, today)['day'] == 5
+    assert parse_recurring_args('еда  вне\tдома 500', CATEGORIES, today)['category_id'] == 2
+
+    for args in ('', ' \n ', 'аренда', 'такси 300', 'аренда 100 ежедневно 5',
+                 'аренда 100 ежемесячно 32', 'аренда 100 еженедельно 8', 'аренда 100 еженедельно xx'):
+        assert parse_recurring_args(args, CATEGORIES, today) is None, args
+
+
+CHECKS = (check_monthly_clamping, check_daily_and_weekly, check_materialization_batch,
+          check_max_periods_cap, check_parse_args)
+
+
+def main() -> None:
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"OK    {check.__name__}")
+        except Exception:
+            failed += 1
+            print(f"FAIL  {check.__name__}")
+            traceback.print_exc()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
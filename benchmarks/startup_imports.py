@@ -0,0 +1,73 @@
+"""
+Замер времени импорта модулей при старте бота.
+
+Создаёт бота и планировщик из main.py (create_bot, create_scheduler) в отдельном
+интерпретаторе с `-X importtime` и выводит модули с наибольшей стоимостью импорта,
+а также суммарное время по пакетам. Сам `import main` почти ничего не загружает:
+зависимости бота импортируются внутри этих функций.
+
+Запуск:
+    python -m benchmarks.startup_imports            # холодный старт бота
+    python -m benchmarks.startup_imports --charts   # плюс загрузка стека графиков
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def collect_import_times(code: str) -> list[tuple[str, int, int]]:
+    """
+    Выполняет код в новом интерпретаторе и разбирает вывод -X importtime.
+
+    Returns:
+        list[tuple[str, int, int]]: Тройки (модуль, собственное время, накопленное время) в микросекундах.
+    """
+    env = dict(os.environ)
+    env.setdefault('BOT_TOKEN', '0:startup-profile')  # TeleBot проверяет наличие токена при создании
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # Формат строки: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--charts', action='store_true', help='дополнительно загрузить стек графиков')
+    parser.add_argument('--top', type=int, default=15, help='сколько самых дорогих модулей показать')
+    args = parser.parse_args()
+
+    code = 'import main; main.create_scheduler(*main.create_bot()[1:])'
+    if args.charts:
+        code += '; from charts.renderer import load_chart_stack; load_chart_stack()'
+    rows = collect_import_times(code)
+
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"Суммарное время импорта: {total_us / 1000:.1f} мс, модулей: {len(rows)}")
+
+    print("\nСамые дорогие модули (накопленное время, мс):")
+    for name, _, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split('.')[0]] += self_us
+    print("\nПо пакетам верхнего уровня (собственное время, мс):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f}  {package}")
+
+
+if __name__ == '__main__':
+    main()
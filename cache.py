@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Маркер отсутствия значения в кэше (None может быть валидным закэшированным значением)
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Потокобезопасный кэш с ограничением размера (вытеснение по LRU)
+    и временем жизни записей (TTL).
+
+    Args:
+        maxsize (int): Максимальное количество записей. При переполнении
+                       вытесняется давно не использовавшаяся запись.
+        ttl (float | None): Время жизни записи в секундах по умолчанию.
+                            None — записи не устаревают.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        if maxsize < 1:
+            raise ValueError("Размер кэша должен быть положительным.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # ключ -> (значение, момент устаревания или None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Возвращает значение по ключу или `default`, если записи нет или она устарела.
+        Найденная запись становится самой "свежей" для LRU.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float | None = MISSING) -> None:
+        """
+        Сохраняет значение. `ttl` переопределяет время жизни по умолчанию для этой записи.
+        """
+        if ttl is MISSING:
+            ttl = self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Удаляет запись по ключу и возвращает её значение (или `default`)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики кэша.
+
+        Returns:
+            dict: Словарь с ключами 'size', 'maxsize', 'hits', 'misses', 'evictions' и 'hit_rate'.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
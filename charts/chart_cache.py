@@ -0,0 +1,78 @@
+import hashlib
+import io
+import json
+import os
+
+from cache import MISSING, TTLCache
+
+# Версия оформления графиков: входит в ключ кэша. Увеличивайте при любом визуальном
+# изменении графиков, чтобы не отдавать картинки в старом стиле.
+# Задаётся здесь, а не в модулях графиков, чтобы вычисление ключа не импортировало Matplotlib.
+CHART_STYLE_VERSION = 1
+
+# Кэш отрисованных графиков, адресуемый по содержимому входных данных.
+# Значение — список Telegram file_id уже отправленных картинок (повторная отправка
+# не загружает байты заново) либо PNG-байты, если file_id получить не удалось.
+CHART_CACHE_SIZE = int(os.getenv('CHART_CACHE_SIZE', 1000))
+CHART_CACHE_TTL = 24 * 60 * 60
+
+chart_cache = TTLCache(maxsize=CHART_CACHE_SIZE, ttl=CHART_CACHE_TTL)
+
+
+def chart_cache_key(chart_type: str, data: dict) -> str:
+    """
+    Вычисляет ключ кэша графика по типу графика, версии стиля и данным.
+
+    Args:
+        chart_type (str): Тип графика (ключ из charts.renderer.CHART_TYPES).
+        data (dict): Входные данные графика. Decimal и даты сериализуются как строки.
+
+    Returns:
+        str: SHA-256 в шестнадцатеричном виде.
+    """
+    payload = json.dumps(
+        [chart_type, CHART_STYLE_VERSION, data],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_cached_charts(key: str) -> list | None:
+    """
+    Возвращает закэшированные графики, готовые к отправке.
+
+    Returns:
+        list | None: Список file_id (str) или PNG-буферов (io.BytesIO); None при промахе.
+    """
+    cached = chart_cache.get(key)
+    if cached is MISSING:
+        return None
+    # Для байтов каждый раз создаётся новый буфер: отправка сдвигает позицию чтения
+    return [item if isinstance(item, str) else _to_buffer(item, i) for i, item in enumerate(cached)]
+
+
+def remember_charts(key: str, charts: list, messages: list) -> None:
+    """
+    Сохраняет отправленные графики в кэш.
+
+    Args:
+        key (str): Ключ из chart_cache_key.
+        charts (list): Отправленные графики (file_id или PNG-буферы).
+        messages (list): Сообщения Telegram, полученные в ответ на отправку (по одному на график).
+    """
+    file_ids = [message.photo[-1].file_id for message in messages if getattr(message, 'photo', None)]
+    if len(file_ids) == len(charts):
+        chart_cache.set(key, file_ids)
+    else:
+        chart_cache.set(key, [item if isinstance(item, str) else item.getvalue() for item in charts])
+
+
+def forget_charts(key: str) -> None:
+    """Удаляет запись из кэша (например, если Telegram отклонил закэшированный file_id)."""
+    chart_cache.pop(key)
+
+
+def _to_buffer(png: bytes, index: int) -> io.BytesIO:
+    buffer = io.BytesIO(png)
+    buffer.name = f'chart_{index + 1}.png'
+    return buffer
@@ -0,0 +1,114 @@
+import io
+from math import ceil
+
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+from charts.output import figure_to_buffer
+from charts.statistics_charts import generate_expense_charts
+
+MAX_CATEGORIES_PER_CHART = 6  # пар столбцов на одном графике
+
+
+def _rubles(value: float) -> str:
+    return f'{int(round(value)):,}'.replace(',', ' ')
+
+
+def _change_text(delta: float, change: float | None, separator: str = '\n') -> str:
+    """Подпись изменения: '+1 200 ₽ (+15.0%)'; без процентов, если в прошлом периоде трат не было."""
+    sign = '+' if delta > 0 else ('−' if delta < 0 else '')
+    text = f'{sign}{_rubles(abs(delta))} ₽'
+    if change is not None:
+        text += f'{separator}({sign}{abs(change)}%)'
+    return text
+
+
+def generate_comparison_charts(data: dict, save_dir: str | None = None) -> list[io.BytesIO]:
+    """
+    Генерирует графики сравнения двух периодов: сгруппированные столбчатые диаграммы
+    (для каждой категории — столбцы прошлого и текущего периода и подпись изменения),
+    а следом — обычные диаграммы расходов текущего периода (generate_expense_charts).
+    Если категорий много, они разбиваются на несколько графиков.
+
+    Args:
+        data (dict): Результат database.statistics.comparison_statistics, дополненный
+                     подписями периодов 'current_label' и 'previous_label'.
+        save_dir (str | None): Отладочный режим: директория, куда дополнительно сохраняются
+                               копии PNG-файлов. По умолчанию графики на диск не пишутся.
+
+    Returns:
+        list[io.BytesIO]: Список буферов с PNG-изображениями диаграмм.
+    """
+    categories = data['categories']
+    num_charts = max(1, ceil(len(categories) / MAX_CATEGORIES_PER_CHART))
+    chunk_size = ceil(len(categories) / num_charts)
+    dark_bg = '#1e1f26'
+    previous_color, current_color = '#7f8c8d', '#5dade2'
+    chart_buffers = []
+
+    for i in range(num_charts):
+        part = categories[i * chunk_size:(i + 1) * chunk_size]
+        labels = [f"{item['name']}\n(Удалено)" if item['is_deleted'] else item['name'] for item in part]
+        positions = range(len(part))
+        width = 0.38
+
+        fig = Figure(figsize=(max(8, round(len(part) * 1.6)), 5.5))
+        ax = fig.subplots()
+        fig.patch.set_facecolor(dark_bg)
+        ax.set_facecolor(dark_bg)
+
+        ax.bar([x - width / 2 for x in positions], [item['previous'] for item in part],
+               width=width, color=previous_color, label=data['previous_label'])
+        ax.bar([x + width / 2 for x in positions], [item['current'] for item in part],
+               width=width, color=current_color, label=data['current_label'])
+
+        max_val = max([max(item['current'], item['previous']) for item in part] or [0]) or 1
+        padding = max_val * 0.04
+
+        # Изменение по категории — над парой столбцов: рост красным, снижение зелёным
+        for x, item in zip(positions, part):
+            color = '#e74c3c' if item['delta'] > 0 else ('#2ecc71' if item['delta'] < 0 else 'white')
+            ax.text(x, max(item['current'], item['previous']) + padding, _change_text(item['delta'], item['change']),
+                    ha='center', va='bottom', color=color, fontsize=9)
+
+        title = 'Сравнение периодов' if num_charts == 1 else f'Сравнение периодов ({i + 1}/{num_charts})'
+        ax.set_title(title, color='white', fontsize=14)
+        ax.set_xticks(list(positions), labels)
+
+        # Итоги обоих периодов и их изменение — на первом графике
+        if i == 0:
+            total_delta = data['current_total'] - data['previous_total']
+            ax.text(
+                0.01, 0.97,
+                f"Всего: {_rubles(data['current_total'])} ₽ против {_rubles(data['previous_total'])} ₽ "
+                f"({_change_text(total_delta, data['change'], ' ')})",
+                transform=ax.transAxes, ha='left', va='top', fontsize=11, color='white'
+            )
+
+        # Легенда — под строкой итогов, чтобы не перекрывать её
+        legend = ax.legend(loc='upper left', bbox_to_anchor=(0.0, 0.91), facecolor=dark_bg, edgecolor='white', fontsize=9)
+        for text in legend.get_texts():
+            text.set_color('white')
+
+        ax.tick_params(colors='white')
+        for spine in ax.spines.values():
+            spine.set_color('white')
+        ax.yaxis.grid(True, linestyle='--', color='white', alpha=0.2)
+        ax.yaxis.set_major_formatter(
+            FuncFormatter(lambda x, _: f"{int(x):,}".replace(',', ' ') if x >= 1000 else str(int(x)))
+        )
+        # Запас сверху под подписи изменений, итоги и легенду
+        ax.set_ylim(0, max_val * 1.5)
+        fig.tight_layout(rect=(0.0, 0.1, 1, 1))
+
+        chart_buffers.append(figure_to_buffer(fig, f'comparison_{i + 1}.png', save_dir))
+
+    current_categories = [
+        {'name': item['name'], 'amount': item['current'], 'is_deleted': item['is_deleted']}
+        for item in categories if item['current']
+    ]
+    if current_categories:
+        chart_buffers.extend(generate_expense_charts(
+            {'expenses_by_category': current_categories, 'total_expenses': data['current_total']}, save_dir
+        ))
+    return chart_buffers
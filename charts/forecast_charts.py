@@ -0,0 +1,94 @@
+import io
+
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+from charts.output import figure_to_buffer
+from forecast import build_forecast
+
+FORECAST_CHART_DAYS = 180  # дней истории на графике трат по дням
+
+
+def _rubles(value: float) -> str:
+    return f'{int(round(value)):,}'.replace(',', ' ')
+
+
+def _style_axes(ax, dark_bg: str) -> None:
+    ax.set_facecolor(dark_bg)
+    ax.tick_params(colors='white')
+    for spine in ax.spines.values():
+        spine.set_color('white')
+    ax.yaxis.grid(True, linestyle='--', color='white', alpha=0.2)
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: _rubles(x)))
+
+
+def generate_forecast_charts(data: dict, save_dir: str | None = None) -> list[io.BytesIO]:
+    """
+    Генерирует линейные графики прогноза трат (см. forecast.build_forecast):
+    сверху — траты по дням и скользящие средние, снизу — траты текущего месяца нарастающим
+    итогом с прогнозом до конца месяца и трендами категорий.
+
+    Args:
+        data (dict): Результат database.statistics.daily_totals.
+        save_dir (str | None): Отладочный режим: директория, куда дополнительно сохраняется
+                               копия PNG-файла. По умолчанию график на диск не пишется.
+
+    Returns:
+        list[io.BytesIO]: Список из одного буфера с PNG-изображением.
+    """
+    forecast = build_forecast(data)
+    dark_bg = '#1e1f26'
+    rolling_colors = {7: '#5dade2', 30: '#f5b041'}
+
+    fig = Figure(figsize=(10, 9))
+    fig.patch.set_facecolor(dark_bg)
+    history_ax, month_ax = fig.subplots(2, 1, gridspec_kw={'height_ratios': (1, 1.2)})
+
+    # Траты по дням и скользящие средние
+    daily = forecast['daily'].iloc[-FORECAST_CHART_DAYS:]
+    history_ax.plot(daily.index, daily.values, color='white', alpha=0.3, linewidth=0.8, label='По дням')
+    for window, series in forecast['rolling'].items():
+        history_ax.plot(daily.index, series.iloc[-FORECAST_CHART_DAYS:].values, color=rolling_colors.get(window),
+                        linewidth=2, label=f'Среднее за {window} дн.')
+    history_ax.set_title('Траты по дням', color='white', fontsize=14)
+    _style_axes(history_ax, dark_bg)
+    history_ax.tick_params(axis='x', labelrotation=30)
+    legend = history_ax.legend(loc='upper left', facecolor=dark_bg, edgecolor='white', fontsize=9)
+    for text in legend.get_texts():
+        text.set_color('white')
+
+    # Месяц нарастающим итогом и прогноз до конца месяца
+    today = forecast['today']
+    spent_days = list(range(1, forecast['month_cumulative'].size + 1))
+    month_ax.plot(spent_days, forecast['month_cumulative'], color='#5dade2', linewidth=2.5, marker='o',
+                  markersize=3, label='Потрачено')
+    if forecast['projection'].size:
+        month_ax.plot([today.day, *range(today.day + 1, forecast['month_days'] + 1)],
+                      [forecast['month_spent'], *forecast['projection']],
+                      color='#e74c3c', linewidth=2, linestyle='--', label='Прогноз')
+    month_ax.annotate(f"{_rubles(forecast['projected_total'])} ₽", (forecast['month_days'], forecast['projected_total']),
+                      textcoords='offset points', xytext=(-10, 8), ha='right', color='white', fontsize=11)
+    month_ax.set_xlim(1, forecast['month_days'])
+    month_ax.set_ylim(0, max(forecast['projected_total'], forecast['month_spent'], 1) * 1.35)
+    month_ax.set_title(f'Прогноз на {today:%m.%Y}', color='white', fontsize=14)
+    month_ax.set_xlabel('День месяца', color='white')
+    _style_axes(month_ax, dark_bg)
+
+    summary = [
+        f"Потрачено: {_rubles(forecast['month_spent'])} ₽, в среднем {_rubles(forecast['daily_rate'])} ₽ в день",
+        f"Прогноз на конец месяца: {_rubles(forecast['projected_total'])} ₽",
+    ]
+    if forecast['trends']:
+        summary.append('Тренды за 90 дней:')
+        for trend in forecast['trends']:
+            sign = '+' if trend['monthly_delta'] >= 0 else '−'
+            summary.append(f"  {trend['name']}: {sign}{_rubles(abs(trend['monthly_delta']))} ₽/мес "
+                           f"({sign}{abs(trend['change'])}%)")
+    month_ax.text(0.01, 0.97, '\n'.join(summary), transform=month_ax.transAxes, ha='left', va='top',
+                  fontsize=9, color='white')
+    legend = month_ax.legend(loc='upper right', facecolor=dark_bg, edgecolor='white', fontsize=9)
+    for text in legend.get_texts():
+        text.set_color('white')
+
+    fig.tight_layout()
+    return [figure_to_buffer(fig, 'forecast.png', save_dir)]
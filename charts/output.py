@@ -0,0 +1,47 @@
+import io
+import os
+
+import matplotlib
+
+# Разрешение, с которым сохраняются все графики
+CHART_DPI = 200
+
+# Общие настройки стиля графиков. Применяются один раз при импорте модуля (в том числе
+# в каждом процессе рендеринга), а не при построении каждого графика: графики строятся
+# параллельно, и изменение глобальных rcParams во время рендеринга было бы гонкой.
+CHART_RC = {
+    # Шрифты с поддержкой кириллицы
+    'font.family': 'DejaVu Sans',
+    'font.sans-serif': ['Arial Unicode MS', 'DejaVu Sans'],
+    # Отключение использования минуса в Unicode, чтобы избежать проблем с отображением
+    'axes.unicode_minus': False,
+}
+
+matplotlib.rcParams.update(CHART_RC)
+
+
+def figure_to_buffer(fig, filename: str, save_dir: str | None = None) -> io.BytesIO:
+    """
+    Сохраняет фигуру Matplotlib в PNG в памяти.
+
+    Args:
+        fig (matplotlib.figure.Figure): Фигура для сохранения.
+        filename (str): Имя файла; присваивается буферу (его использует Telegram при загрузке)
+                        и используется при сохранении копии на диск.
+        save_dir (str | None): Отладочный режим: если указана директория, копия PNG
+                               дополнительно записывается в неё. По умолчанию на диск ничего не пишется.
+
+    Returns:
+        io.BytesIO: Буфер с PNG, позиционированный на начало.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=CHART_DPI, bbox_inches='tight')
+    buffer.name = filename
+    buffer.seek(0)
+
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+        with open(os.path.join(save_dir, filename), 'wb') as f:
+            f.write(buffer.getbuffer())
+
+    return buffer
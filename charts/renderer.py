@@ -0,0 +1,284 @@
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import (BrokenExecutor, CancelledError,
+                                ProcessPoolExecutor, ThreadPoolExecutor)
+
+# Параметры пула рендеринга графиков (можно переопределить через переменные окружения)
+CHART_EXECUTOR = os.getenv('CHART_EXECUTOR', 'process')  # 'process' или 'thread'
+CHART_WORKERS = int(os.getenv('CHART_WORKERS', 2))
+CHART_MAX_PENDING = int(os.getenv('CHART_MAX_PENDING', 8))  # выполняемые + ожидающие задания
+CHART_RENDER_TIMEOUT = float(os.getenv('CHART_RENDER_TIMEOUT', 30))  # сек. на одно задание
+
+
+# Типы графиков: имя -> 'модуль:функция'. Модули с Matplotlib импортируются только
+# при первом построении графика (и только в процессе рендеринга), а не при старте бота.
+CHART_TYPES = {
+    'expenses': 'charts.statistics_charts:generate_expense_charts',
+    'top_categories': 'charts.top_categories_charts:generate_top_categories_pie',
+    'comparison': 'charts.comparison_charts:generate_comparison_charts',
+    'forecast': 'charts.forecast_charts:generate_forecast_charts',
+}
+
+
+class ChartRendererBusy(Exception):
+    """Очередь рендеринга заполнена: новое задание не принято."""
+
+
+def get_chart_function(chart_type: str):
+    """
+    Возвращает функцию построения графика по его типу, импортируя модуль при первом обращении.
+
+    Args:
+        chart_type (str): Ключ из CHART_TYPES.
+
+    Returns:
+        Callable: Функция построения графика.
+    """
+    module_name, func_name = CHART_TYPES[chart_type].split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def load_chart_stack() -> None:
+    """Импортирует все модули графиков (и вместе с ними Matplotlib)."""
+    for chart_type in CHART_TYPES:
+        get_chart_function(chart_type)
+
+
+def _render(chart_type: str, *args):
+    """Точка входа задания рендеринга (выполняется в процессе или потоке пула)."""
+    return get_chart_function(chart_type)(*args)
+
+
+class ChartRenderer:
+    """
+    Пул рендеринга графиков вне потоков обработчиков бота.
+
+    По умолчанию графики строятся в отдельных процессах, так что тяжёлый рендеринг
+    не конкурирует за GIL с обработкой сообщений. Количество одновременно принятых
+    заданий ограничено `max_pending`: при переполнении submit() сразу выбрасывает
+    ChartRendererBusy, чтобы обработчик мог попросить пользователя повторить позже.
+
+    Результат доставляется через колбэки в отдельном потоке доставки, поэтому
+    поток обработчика не ждёт окончания рендеринга.
+    """
+
+    def __init__(self, mode: str = CHART_EXECUTOR, workers: int = CHART_WORKERS,
+                 max_pending: int = CHART_MAX_PENDING, timeout: float = CHART_RENDER_TIMEOUT):
+        if mode not in ('process', 'thread'):
+            raise ValueError(f"Неизвестный режим рендеринга: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        # Колбэки (отправка сообщений в Telegram) выполняются здесь, а не в служебном потоке пула
+        self._delivery = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chart-delivery')
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.mode == 'process':
+                    # 'spawn' вместо 'fork': процесс бота многопоточный, а fork копирует
+                    # состояние блокировок других потоков
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=load_chart_stack
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='chart-render')
+            return self._executor
+
+    @staticmethod
+    def _run_callback(callback, value) -> None:
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Ошибка в колбэке рендеринга графика: {e}")
+
+    def _reset_executor(self, executor) -> None:
+        """Пересоздаёт пул, если его процесс аварийно завершился (BrokenProcessPool)."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self) -> None:
+        """
+        Заранее запускает пул и загружает в него стек графиков,
+        чтобы первый запрос пользователя не ждал импорта Matplotlib.
+        """
+        executor = self._get_executor()
+        if self.mode == 'process':
+            # Процессы запускаются по мере поступления заданий, а инициализатор импортирует графики
+            futures = [executor.submit(os.getpid) for _ in range(self.workers)]
+        else:
+            futures = [executor.submit(load_chart_stack)]
+        for future in futures:
+            future.result()
+
+    def submit(self, chart_type: str, *args, on_result, on_error) -> None:
+        """
+        Ставит построение графика в очередь.
+
+        Ровно один из колбэков будет вызван в потоке доставки: `on_result(результат)`
+        при успехе или `on_error(исключение)` при ошибке. Если рендеринг не уложился
+        в timeout, on_error получит TimeoutError, а поздний результат будет отброшен.
+
+        Args:
+            chart_type (str): Тип графика (ключ из CHART_TYPES).
+            *args: Аргументы функции построения (должны сериализоваться pickle в режиме 'process').
+            on_result: Колбэк для результата рендеринга.
+            on_error: Колбэк для исключения.
+
+        Raises:
+            ChartRendererBusy: Если принято уже max_pending заданий.
+        """
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"Неизвестный тип графика: {chart_type}")
+        if not self._slots.acquire(blocking=False):
+            raise ChartRendererBusy()
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_render, chart_type, *args)
+        except BrokenExecutor:
+            self._reset_executor(executor)
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_render, chart_type, *args)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        settled = threading.Lock()  # Гарантирует однократный вызов колбэков
+
+        def deliver(callback, value) -> None:
+            if settled.acquire(blocking=False):
+                self._delivery.submit(self._run_callback, callback, value)
+
+        def on_timeout() -> None:
+            deliver(on_error, TimeoutError(f"Рендеринг графика занял больше {self.timeout} сек."))
+
+        timer = threading.Timer(self.timeout, on_timeout)
+        timer.daemon = True
+
+        def on_done(done_future) -> None:
+            # Слот освобождается только по завершении задания: зависший рендеринг
+            # продолжает занимать место в очереди и ограничивает нагрузку
+            self._slots.release()
+            timer.cancel()
+            if done_future.cancelled():
+                # Задание отменено при пересоздании сломанного пула (_reset_executor):
+                # exception() здесь бросил бы CancelledError, и пользователь ждал бы таймаута
+                deliver(on_error, CancelledError('Рендеринг графика отменён: пул процессов перезапущен'))
+                return
+            error = done_future.exception()
+            if isinstance(error, BrokenExecutor):
+                self._reset_executor(executor)
+            if error is not None:
+                deliver(on_error, error)
+            else:
+                deliver(on_result, done_future.result())
+
+        timer.start()
+        future.add_done_callback(on_done)
+
+    async def render_async(self, chart_type: str, *args):
+        """
+        Строит график из асинхронного кода (асинхронный режим бота, см. async_main.py).
+
+        Задание выполняется в том же пуле через loop.run_in_executor, поэтому цикл событий
+        не блокируется. Ограничение очереди и таймаут такие же, как у submit().
+
+        Args:
+            chart_type (str): Тип графика (ключ из CHART_TYPES).
+            *args: Аргументы функции построения.
+
+        Returns:
+            Результат функции построения графика.
+
+        Raises:
+            ChartRendererBusy: Если принято уже max_pending заданий.
+            TimeoutError: Если рендеринг не уложился в timeout.
+        """
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"Неизвестный тип графика: {chart_type}")
+        if not self._slots.acquire(blocking=False):
+            raise ChartRendererBusy()
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            future = loop.run_in_executor(executor, _render, chart_type, *args)
+        except BrokenExecutor:
+            self._reset_executor(executor)
+            executor = self._get_executor()
+            try:
+                future = loop.run_in_executor(executor, _render, chart_type, *args)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        def on_done(done_future) -> None:
+            # Как и в submit(), слот освобождается только по завершении задания
+            self._slots.release()
+            if done_future.cancelled():
+                return
+            if isinstance(done_future.exception(), BrokenExecutor):
+                self._reset_executor(executor)
+
+        future.add_done_callback(on_done)
+        try:
+            # shield: по таймауту ожидание прекращается, а задание продолжает занимать слот
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Рендеринг графика занял больше {self.timeout} сек.") from None
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> ChartRenderer:
+    """Возвращает общий для процесса пул рендеринга, создавая его при первом обращении."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = ChartRenderer()
+    return _renderer
+
+
+def render_chart(chart_type: str, *args, on_result, on_error) -> None:
+    """Ставит построение графика в общий пул рендеринга (см. ChartRenderer.submit)."""
+    get_renderer().submit(chart_type, *args, on_result=on_result, on_error=on_error)
+
+
+async def render_chart_async(chart_type: str, *args):
+    """Строит график в общем пуле рендеринга из асинхронного кода (см. ChartRenderer.render_async)."""
+    return await get_renderer().render_async(chart_type, *args)
+
+
+def prewarm_charts_in_background() -> None:
+    """
+    Прогревает пул рендеринга в фоновом потоке: вызывается после старта бота,
+    чтобы загрузка Matplotlib не задерживала начало обработки сообщений.
+    """
+    def job():
+        try:
+            get_renderer().warm_up()
+        except Exception as e:
+            print(f'[!] Ошибка прогрева пула рендеринга графиков: {e}')
+
+    threading.Thread(target=job, name='chart-prewarm', daemon=True).start()
@@ -1,18 +1,16 @@
-import matplotlib
-
-matplotlib.use('Agg') # Установка бэкенда Matplotlib перед импортом pyplot
-import os
-import tempfile
+import io
 from math import ceil
 
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter
 
+from charts.output import figure_to_buffer
+
 
-def generate_expense_charts(data: dict, save_dir: str = 'temp_charts') -> list[str]:
+def generate_expense_charts(data: dict, save_dir: str | None = None) -> list[io.BytesIO]:
     """
     Генерирует столбчатые диаграммы расходов по категориям, разбивая их на несколько графиков,
-    если категорий слишком много. Диаграммы сохраняются во временные файлы.
+    если категорий слишком много. Диаграммы сохраняются в PNG-буферы в памяти.
 
     Args:
         data (dict): Словарь с данными для построения графика. Ожидаемый формат:
@@ -24,20 +22,12 @@ def generate_expense_charts(data: dict, save_dir: str = 'temp_charts') -> list[s
                          ],
                          'total_expenses': 1500.0
                      }
-        save_dir (str): Директория для сохранения временных файлов графиков. По умолчанию 'temp_charts'.
+        save_dir (str | None): Отладочный режим: директория, куда дополнительно сохраняются
+                               копии PNG-файлов. По умолчанию графики на диск не пишутся.
 
     Returns:
-        list[str]: Список путей к сгенерированным PNG-файлам диаграмм.
+        list[io.BytesIO]: Список буферов с PNG-изображениями диаграмм.
     """
-    # Настройка шрифтов для Matplotlib, чтобы обеспечить корректное отображение кириллицы
-    plt.rcParams['font.family'] = 'DejaVu Sans'
-    plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'DejaVu Sans']
-    # Отключение использования минуса в Unicode, чтобы избежать проблем с отображением
-    plt.rcParams['axes.unicode_minus'] = False
-
-    # Создание директории для сохранения графиков, если она еще не существует
-    os.makedirs(save_dir, exist_ok=True)
-
     category_items = []
     # Подготовка данных для построения графика
     for item in data['expenses_by_category']:
@@ -74,7 +64,7 @@ def generate_expense_charts(data: dict, save_dir: str = 'temp_charts') -> list[s
     # Расчет размера "куска" (количество категорий) для каждого графика
     chunk_size = ceil(total / num_charts)
     dark_bg = '#1e1f26' # Темный фон для графиков
-    chart_paths = [] # Список для хранения путей к сгенерированным файлам
+    chart_buffers = [] # Список для хранения буферов со сгенерированными графиками
 
     # Цикл по количеству необходимых графиков
     for i in range(num_charts):
@@ -87,7 +77,10 @@ def generate_expense_charts(data: dict, save_dir: str = 'temp_charts') -> list[s
 
         # Настройка размера фигуры в зависимости от количества столбцов
         fig_width = max(8, round(len(cat_part) * 1.2))
-        fig, ax = plt.subplots(figsize=(fig_width, 5))
+        # Используется объектный API (Figure) вместо pyplot: он не хранит глобального
+        # состояния, поэтому графики можно безопасно строить параллельно
+        fig = Figure(figsize=(fig_width, 5))
+        ax = fig.subplots()
         # Установка цвета фона фигуры и осей
         fig.patch.set_facecolor(dark_bg)
         ax.set_facecolor(dark_bg)
@@ -136,14 +129,11 @@ def generate_expense_charts(data: dict, save_dir: str = 'temp_charts') -> list[s
         )
 
         # Установка пределов оси Y
-        plt.ylim(0, max_val + padding * 4)
+        ax.set_ylim(0, max_val + padding * 4)
         # Автоматическая настройка отступов для плотного размещения элементов
-        plt.tight_layout(rect=(0.0, 0.1, 1, 1))  # Увеличен нижний отступ для подписей, если они длинные
+        fig.tight_layout(rect=(0.0, 0.1, 1, 1))  # Увеличен нижний отступ для подписей, если они длинные
 
-        # Сохранение графика во временный файл
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png', prefix=f'chart_{i + 1}_', dir='temp_charts')
-        plt.savefig(temp_file.name, dpi=200, bbox_inches='tight') # Сохранение с высоким разрешением
-        plt.close() # Закрытие фигуры для освобождения памяти
-        chart_paths.append(temp_file.name) # Добавление пути к файлу в список
+        # Сохранение графика в буфер в памяти (с высоким разрешением)
+        chart_buffers.append(figure_to_buffer(fig, f'chart_{i + 1}.png', save_dir))
 
-    return chart_paths
+    return chart_buffers
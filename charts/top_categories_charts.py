@@ -1,14 +1,16 @@
-import tempfile
+import io
 from itertools import cycle, islice
 
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
+from charts.output import figure_to_buffer
 
-def generate_top_categories_pie(data: dict) -> str:
+
+def generate_top_categories_pie(data: dict, save_dir: str | None = None) -> io.BytesIO:
     """
     Генерирует круговую диаграмму (pie chart) для визуализации основных категорий расходов.
     Включает сегмент 'Остальное', если сумма мелких трат не равна нулю.
-    График сохраняется в PNG файл.
+    График сохраняется в PNG-буфер в памяти.
 
     Args:
         data (dict): Словарь с данными для построения круговой диаграммы. Ожидаемый формат:
@@ -20,9 +22,11 @@ def generate_top_categories_pie(data: dict) -> str:
                          ],
                          'other_sum': 3000.0
                      }
+        save_dir (str | None): Отладочный режим: директория, куда дополнительно сохраняется
+                               копия PNG-файла. По умолчанию график на диск не пишется.
 
     Returns:
-        str: Путь к сгенерированному PNG-файлу круговой диаграммы.
+        io.BytesIO: Буфер с PNG-изображением круговой диаграммы.
     """
     # Извлечение названий категорий и их сумм из входных данных
     categories = [item['name'] for item in data['top_categories']]
@@ -41,13 +45,10 @@ def generate_top_categories_pie(data: dict) -> str:
     colors = list(islice(cycle(base_colors), len(categories)))
     dark_bg = '#1e1f26'  # Цвет фона для графика (темный, для лучшего контраста с белым текстом)
 
-    # Настройка стиля Matplotlib для корректного отображения шрифтов (особенно кириллицы)
-    plt.rcParams['font.family'] = 'DejaVu Sans'
-    # Отключение обработки символа минуса в Unicode, чтобы избежать проблем с отображением
-    plt.rcParams['axes.unicode_minus'] = False
-
-    # Создание фигуры (окна графика) и осей (области рисования)
-    fig, ax = plt.subplots(figsize=(8, 6))
+    # Создание фигуры (окна графика) и осей (области рисования).
+    # Объектный API (Figure) не использует глобальное состояние pyplot и безопасен при параллельном рендеринге
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
     # Установка цвета фона для всей фигуры и для области рисования осей
     fig.patch.set_facecolor(dark_bg)
     ax.set_facecolor(dark_bg)
@@ -94,15 +95,8 @@ def generate_top_categories_pie(data: dict) -> str:
     )
 
     # Автоматическая корректировка отступов, чтобы все элементы поместились на фигуре
-    plt.tight_layout()
-
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    chart_path = tmp_file.name
-    tmp_file.close()  # Закрываем, чтобы Matplotlib мог записать файл по пути
-
-    # Сохранение фигуры в PNG файл с высоким разрешением и без лишних полей
-    plt.savefig(chart_path, dpi=200, bbox_inches='tight')
-    # Закрытие фигуры для освобождения памяти, это важно, особенно при генерации множества графиков
-    plt.close(fig)
+    fig.tight_layout()
 
-    return chart_path
+    # Сохранение фигуры в PNG-буфер с высоким разрешением и без лишних полей.
+    # Фигура не регистрируется в pyplot, поэтому закрывать её не нужно: память освободит сборщик мусора
+    return figure_to_buffer(fig, 'top_categories.png', save_dir)
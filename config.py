@@ -6,19 +6,56 @@ load_dotenv()
 
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 
+# Отладка графиков: если задана директория, копии отправляемых графиков сохраняются в неё
+CHARTS_DEBUG_DIR = os.getenv('CHARTS_DEBUG_DIR')
+
+# Режим получения обновлений: 'polling' (по умолчанию) или 'webhook'
+BOT_MODE = os.getenv('BOT_MODE', 'polling')
+# Публичный адрес сервиса (https://example.com); путь вебхука добавляется к нему.
+# Если не задан, вебхук у Telegram не регистрируется (локальная проверка через POST)
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+# Секрет для заголовка X-Telegram-Bot-Api-Secret-Token (1-256 символов: A-Z, a-z, 0-9, _ и -)
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
+# Секретный путь маршрута вебхука
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', 8))
+WEBHOOK_MAX_PENDING = int(os.getenv('WEBHOOK_MAX_PENDING', 100))  # выполняемые + ожидающие обновления
+# Сбрасывать накопленные в Telegram обновления при регистрации вебхука (по умолчанию нет:
+# при перезапуске реплик обновления из очереди доставляются после старта)
+WEBHOOK_DROP_PENDING = os.getenv('WEBHOOK_DROP_PENDING', '0') == '1'
+
+# Расписания фоновых задач в формате cron (локальное время сервера, см. scheduler.py)
+CLEANUP_SCHEDULE = os.getenv('CLEANUP_SCHEDULE', '0 3 * * *')  # очистка удалённых категорий и состояний
+STATS_SCHEDULE = os.getenv('STATS_SCHEDULE', '0 * * * *')  # вывод метрик пула, кэшей и задач
+RECURRING_SCHEDULE = os.getenv('RECURRING_SCHEDULE', '5 0 * * *')  # запись регулярных расходов
+# Максимальная случайная задержка запуска задач в секундах
+SCHEDULER_JITTER = float(os.getenv('SCHEDULER_JITTER', 300))
+
 key_board_buttons = {
     'create_category': '💲 Создать категорию',
     'expenses': '✍️ Записать расходы',
     'delete_category': '🗑️ Удалить категорию',
     'rename_category': '✏️ Переименовать категорию',
     'basic_expenses': '📉 Основные траты',
-    'statistics': '📊 Статистика'
+    'statistics': '📊 Статистика',
+    'forecast': '📈 Прогноз'
 }
 
-kb_for_statistics = {
-    'week': 'За 1 неделю',
-    'month': 'За 1 месяц'
-}
+# Кнопки выбора периода статистики: ключ периода (см. time_interval.resolve_interval) -> текст.
+# Кнопки одной строки клавиатуры заданы отдельными словарями
+kb_for_statistics = [
+    {'week': 'За 1 неделю', 'month': 'За 1 месяц'},
+    {'calendar_month': 'Этот месяц', 'calendar_quarter': 'Этот квартал', 'calendar_year': 'Этот год'},
+    {'calendar_month:ly': 'Этот месяц год назад', 'calendar_year:ly': 'Прошлый год'},
+    {'custom': '📅 Свой период'},
+]
+
+# Кнопки сравнения (только для "📊 Статистика"): 'compare:<ключ периода>' -> текст.
+# Без суффикса период сравнивается с предыдущим, с суффиксом ':ly' — с тем же периодом год назад
+kb_for_comparison = [
+    {'compare:calendar_week': '⚖️ Неделя к прошлой', 'compare:calendar_month': '⚖️ Месяц к прошлому'},
+    {'compare:calendar_month:ly': '⚖️ Месяц к году назад', 'compare:calendar_year:ly': '⚖️ Год к прошлому'},
+]
 
 kb_for_delete_confirmation = {
     'del': '✅ Удалить',
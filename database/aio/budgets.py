@@ -0,0 +1,128 @@
+import psycopg
+
+from cache import MISSING
+from database.aio.connection import async_db_connection
+from database.budgets import (DELETE_BUDGET_SQL, MARK_BUDGET_ALERT_SQL,
+                              SELECT_BUDGETS_SQL, SELECT_MONTH_SPEND_SQL,
+                              UPSERT_BUDGET_SQL, MonthlyBudgets, budgets_cache,
+                              budgets_from_rows, invalidate_user_budgets,
+                              month_start)
+
+# Асинхронные версии функций database/budgets.py.
+# Запросы и кэш бюджетов (budgets_cache) общие с синхронной реализацией.
+
+
+async def get_monthly_budgets(user_id: int) -> MonthlyBudgets | None:
+    """
+    Возвращает бюджеты пользователя и траты текущего месяца (см. database.budgets.get_monthly_budgets).
+
+    Returns:
+        MonthlyBudgets | None: Бюджеты или None в случае ошибки БД.
+    """
+    month = month_start()
+    cached = budgets_cache.get(user_id)
+    if cached is not MISSING and cached.month == month:
+        return cached
+
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_BUDGETS_SQL, (user_id,))
+            budget_rows = await cur.fetchall()
+            spend_rows = []
+            if budget_rows:
+                await cur.execute(SELECT_MONTH_SPEND_SQL, (user_id, month, month))
+                spend_rows = await cur.fetchall()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при загрузке бюджетов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при загрузке бюджетов: {e}")
+        return None
+
+    budgets = budgets_from_rows(month, budget_rows, spend_rows)
+    budgets_cache.set(user_id, budgets)
+    return budgets
+
+
+async def track_expenses(user_id: int, expenses: list[tuple[int, float]]) -> list[dict]:
+    """
+    Учитывает записанные траты в бюджетах месяца и возвращает предупреждения о порогах
+    (см. database.budgets.track_expenses).
+
+    Returns:
+        list[dict]: Предупреждения {'category_id', 'level', 'spent', 'limit'}. Пустой список при ошибке.
+    """
+    budgets = budgets_cache.get(user_id)
+    if budgets is not MISSING and budgets.month == month_start():
+        if not budgets.add(expenses):
+            return []
+        invalidate_user_budgets(user_id)
+    budgets = await get_monthly_budgets(user_id)
+    if budgets is None:
+        return []
+    keys = budgets.pending()
+    if not keys:
+        return []
+
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            alerts = []
+            for key in keys:
+                level = budgets.level(key)
+                await cur.execute(MARK_BUDGET_ALERT_SQL, (budgets.month, level, user_id, key, budgets.month, level))
+                if cur.rowcount:
+                    alerts.append(budgets.alert(key))
+                budgets.alerted[key] = level
+            await conn.commit()
+            return alerts
+    except psycopg.Error as e:
+        print(f"Ошибка БД при отметке предупреждений о бюджете: {e}")
+        return []
+    except Exception as e:
+        print(f"Неизвестная ошибка при отметке предупреждений о бюджете: {e}")
+        return []
+
+
+async def set_budget(user_id: int, category_id: int | None, amount: float) -> bool:
+    """
+    Создаёт или изменяет месячный бюджет (см. database.budgets.set_budget).
+
+    Returns:
+        bool: True, если бюджет сохранён, False в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(UPSERT_BUDGET_SQL, (user_id, category_id, amount))
+            await conn.commit()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при сохранении бюджета: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при сохранении бюджета: {e}")
+        return False
+
+    invalidate_user_budgets(user_id)
+    return True
+
+
+async def delete_budget(user_id: int, category_id: int | None) -> bool | None:
+    """
+    Удаляет месячный бюджет (см. database.budgets.delete_budget).
+
+    Returns:
+        bool | None: True, если бюджет удалён, False, если его не было, None в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(DELETE_BUDGET_SQL, (user_id, category_id))
+            deleted = cur.rowcount > 0
+            await conn.commit()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при удалении бюджета: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при удалении бюджета: {e}")
+        return None
+
+    invalidate_user_budgets(user_id)
+    return deleted
@@ -0,0 +1,98 @@
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.category import (INSERT_CATEGORY_SQL, RENAME_CATEGORY_SQL,
+                               SELECT_CATEGORY_NAME_SQL,
+                               SOFT_DELETE_CATEGORY_SQL)
+from database.user_data import invalidate_user_categories
+
+# Асинхронные версии функций database/category.py (запросы общие с синхронной реализацией)
+
+
+async def get_category_name_by_id(category_id: int) -> str | None:
+    """
+    Получает название категории по её ID (см. database.category.get_category_name_by_id).
+
+    Returns:
+        str | None: Название категории, если найдено, иначе None (также при ошибке БД).
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_CATEGORY_NAME_SQL, (category_id,))
+            result = await cur.fetchone()
+            return result[0] if result else None
+    except psycopg.Error as e:
+        print(f"Ошибка БД при получении названия категории: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при получении названия категории: {e}")
+        return None
+
+
+async def create_category(user_id: int, category_name: str) -> bool:
+    """
+    Создает новую категорию (см. database.category.create_category).
+
+    Returns:
+        bool: True, если категория успешно создана, False в противном случае.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(INSERT_CATEGORY_SQL, (user_id, category_name))
+            await conn.commit()
+        invalidate_user_categories(user_id)  # Сбрасываем кэш списка категорий пользователя
+        return True
+    except psycopg.Error as e:
+        print(f"Ошибка БД при создании категории: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при создании категории: {e}")
+        return False
+
+
+async def rename_category_in_db(category_id: int, new_name: str) -> bool:
+    """
+    Переименовывает категорию (см. database.category.rename_category_in_db).
+
+    Returns:
+        bool: True, если категория успешно переименована, False в противном случае.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(RENAME_CATEGORY_SQL, (new_name, category_id))
+            row = await cur.fetchone()
+            await conn.commit()
+
+        if row:
+            invalidate_user_categories(row[0])
+        return True
+    except psycopg.Error as e:
+        print(f"Ошибка БД при переименовании категории: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при переименовании категории: {e}")
+        return False
+
+
+async def delete_category_func(category_id: int) -> bool:
+    """
+    "Мягко" удаляет категорию (см. database.category.delete_category_func).
+
+    Returns:
+        bool: True, если категория успешно помечена как удалённая, False в противном случае.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SOFT_DELETE_CATEGORY_SQL, (category_id,))
+            row = await cur.fetchone()
+            await conn.commit()
+
+        if row:
+            invalidate_user_categories(row[0])
+        return True
+    except psycopg.Error as e:
+        print(f"Ошибка БД при мягком удалении категории: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при мягком удалении категории: {e}")
+        return False
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.clean_old_categories import (CLEANUP_BATCH_SIZE,
+                                           CLEANUP_CATEGORY_GROUP_SIZE,
+                                           CLEANUP_LOCK_TIMEOUT,
+                                           CLEANUP_RETENTION_DAYS,
+                                           DELETE_CATEGORIES_SQL,
+                                           DELETE_EXPENSES_CHUNK_SQL,
+                                           SELECT_EXPIRED_CATEGORIES_SQL,
+                                           SET_LOCK_TIMEOUT_SQL, budget_delay,
+                                           cleanup_report)
+
+
+async def delete_old_deleted_categories() -> dict | None:
+    """
+    Асинхронная версия database.clean_old_categories.delete_old_deleted_categories:
+    пакетное удаление старых "мягко" удалённых категорий и их расходов.
+
+    Returns:
+        dict | None: Итоги запуска (см. cleanup_report) или None в случае ошибки.
+    """
+    started = time.monotonic()
+    expenses_deleted = categories_deleted = chunks = 0
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_EXPIRED_CATEGORIES_SQL, (CLEANUP_RETENTION_DAYS,))
+            category_ids = [row[0] for row in await cur.fetchall()]
+            await conn.commit()
+
+            for i in range(0, len(category_ids), CLEANUP_CATEGORY_GROUP_SIZE):
+                group = category_ids[i:i + CLEANUP_CATEGORY_GROUP_SIZE]
+
+                while True:
+                    await cur.execute(SET_LOCK_TIMEOUT_SQL, (CLEANUP_LOCK_TIMEOUT,))
+                    await cur.execute(DELETE_EXPENSES_CHUNK_SQL, (group, CLEANUP_BATCH_SIZE))
+                    deleted = cur.rowcount
+                    await conn.commit()
+                    chunks += 1
+                    expenses_deleted += deleted
+                    if deleted < CLEANUP_BATCH_SIZE:
+                        break
+                    await asyncio.sleep(budget_delay(expenses_deleted + categories_deleted, started))
+
+                await cur.execute(SET_LOCK_TIMEOUT_SQL, (CLEANUP_LOCK_TIMEOUT,))
+                await cur.execute(DELETE_CATEGORIES_SQL, (group,))
+                categories_deleted += cur.rowcount
+                await conn.commit()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при очистке (удалено расходов: {expenses_deleted}, категорий: {categories_deleted}): {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при очистке: {e}")
+        return None
+
+    return cleanup_report(expenses_deleted, categories_deleted, chunks, started)
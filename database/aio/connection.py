@@ -0,0 +1,68 @@
+import os
+from contextlib import asynccontextmanager
+
+from psycopg_pool import AsyncConnectionPool
+
+from database.connection import (DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE,
+                                 DB_POOL_TIMEOUT)
+
+# Асинхронный пул соединений (psycopg 3) для асинхронного режима бота (async_main.py).
+# Размеры и таймаут ожидания берутся из тех же переменных окружения, что и у синхронного пула.
+
+_pool = None
+
+
+def get_async_pool() -> AsyncConnectionPool:
+    """
+    Возвращает общий для процесса асинхронный пул соединений, создавая его при первом обращении.
+    Пул создаётся закрытым: его открывает open_async_pool() при старте бота.
+    """
+    global _pool
+    if _pool is None:
+        database_url = os.getenv("DB_URL")
+        if not database_url:
+            raise ValueError("DB_URL environment variable is not set.")
+        _pool = AsyncConnectionPool(
+            database_url,
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            timeout=DB_POOL_TIMEOUT,
+            open=False
+        )
+    return _pool
+
+
+async def open_async_pool() -> None:
+    """Открывает пул и дожидается установки min_size соединений."""
+    await get_async_pool().open(wait=True)
+
+
+async def close_async_pool() -> None:
+    """Закрывает пул: вызывается при остановке бота."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def get_async_pool_stats() -> dict:
+    """Возвращает метрики асинхронного пула (см. psycopg_pool.AsyncConnectionPool.get_stats)."""
+    return get_async_pool().get_stats()
+
+
+@asynccontextmanager
+async def async_db_connection():
+    """
+    Асинхронный контекстный менеджер для работы с соединением из пула.
+
+    По выходе из блока соединение возвращается в пул. Если внутри блока возникло
+    исключение, транзакция откатывается, а оборванное соединение пул заменяет новым.
+    Если свободное соединение не появилось за DB_POOL_TIMEOUT секунд,
+    выбрасывается psycopg_pool.PoolTimeout.
+
+    Пример:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute("SELECT 1")
+    """
+    async with get_async_pool().connection() as conn:
+        yield conn
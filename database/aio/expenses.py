@@ -0,0 +1,73 @@
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.expenses import (INSERT_EXPENSE_SQL, INSERT_EXPENSES_BULK_SQL,
+                               TOP_CATEGORIES_SQL, top_categories_from_rows)
+
+# Асинхронные версии функций database/expenses.py (запросы общие с синхронной реализацией)
+
+
+async def write_down_expense(user_id: int, category_id: int, amount: float) -> bool:
+    """
+    Записывает новый расход (см. database.expenses.write_down_expense).
+
+    Returns:
+        bool: True, если расход успешно записан, False в противном случае.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(INSERT_EXPENSE_SQL, (user_id, category_id, amount))
+            await conn.commit()
+            return True
+    except psycopg.Error as e:
+        print(f"Ошибка БД при записи расходов: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при записи расходов: {e}")
+        return False
+
+
+async def write_down_expenses(user_id: int, expenses: list[tuple[int, float]]) -> list[tuple[int, float]] | None:
+    """
+    Записывает несколько расходов одним запросом (см. database.expenses.write_down_expenses).
+
+    Returns:
+        list[tuple[int, float]] | None: Пары (ID категории, сумма) записанных расходов
+                                        или None в случае ошибки.
+    """
+    if not expenses:
+        return []
+    category_ids, amounts = zip(*expenses)
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(INSERT_EXPENSES_BULK_SQL, (list(category_ids), list(amounts), user_id))
+            written = [(category_id, float(amount)) for category_id, amount in await cur.fetchall()]
+            await conn.commit()
+            return written
+    except psycopg.Error as e:
+        print(f"Ошибка БД при пакетной записи расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при пакетной записи расходов: {e}")
+        return None
+
+
+async def get_top_categories_and_other_sum(user_id: int, start_date, end_date) -> dict:
+    """
+    Получает топ-3 категории и сумму остальных расходов за период
+    (см. database.expenses.get_top_categories_and_other_sum).
+
+    Returns:
+        dict: Словарь с ключами 'top_categories' и 'other_sum'.
+              Возвращает {'top_categories': [], 'other_sum': 0.0} в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(TOP_CATEGORIES_SQL, (user_id, start_date, end_date))
+            return top_categories_from_rows(await cur.fetchall())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при получении топ категорий: {e}")
+        return {'top_categories': [], 'other_sum': 0.0}
+    except Exception as e:
+        print(f"Неизвестная ошибка при получении топ категорий: {e}")
+        return {'top_categories': [], 'other_sum': 0.0}
@@ -0,0 +1,35 @@
+import csv
+
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.export import (EXPORT_BATCH_SIZE, EXPORT_COLUMNS,
+                             EXPORT_EXPENSES_SQL)
+
+
+async def export_expenses_csv(user_id: int, stream) -> int | None:
+    """
+    Записывает историю расходов пользователя в CSV-поток серверным курсором
+    (см. database.export.export_expenses_csv).
+
+    Returns:
+        int | None: Количество выгруженных расходов или None в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn:
+            async with conn.cursor(name='export_expenses') as cur:
+                await cur.execute(EXPORT_EXPENSES_SQL, (user_id,))
+                writer = csv.writer(stream)
+                writer.writerow(EXPORT_COLUMNS)
+                count = 0
+                while rows := await cur.fetchmany(EXPORT_BATCH_SIZE):
+                    writer.writerows(rows)
+                    count += len(rows)
+            await conn.commit()
+            return count
+    except psycopg.Error as e:
+        print(f"Ошибка БД при выгрузке расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при выгрузке расходов: {e}")
+        return None
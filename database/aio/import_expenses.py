@@ -0,0 +1,46 @@
+import time
+from datetime import datetime
+
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.import_expenses import (ANALYZE_STAGING_SQL, COPY_STAGING_SQL,
+                                      CREATE_MISSING_CATEGORIES_SQL,
+                                      CREATE_STAGING_SQL, MERGE_EXPENSES_SQL,
+                                      import_report, staging_csv)
+from database.budgets import invalidate_user_budgets
+from database.user_data import invalidate_user_categories
+
+
+async def import_expenses(user_id: int, rows: list[tuple[int, datetime, str, float]]) -> dict | None:
+    """
+    Импортирует проверенные строки расходов одной транзакцией через COPY
+    (см. database.import_expenses.import_expenses).
+
+    Returns:
+        dict | None: Итоги импорта или None в случае ошибки.
+    """
+    started = time.monotonic()
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(CREATE_STAGING_SQL)
+            async with cur.copy(COPY_STAGING_SQL) as copy:
+                await copy.write(staging_csv(rows))
+            await cur.execute(ANALYZE_STAGING_SQL)
+            await cur.execute(CREATE_MISSING_CATEGORIES_SQL, (user_id, user_id))
+            categories_created = cur.rowcount
+            await cur.execute(MERGE_EXPENSES_SQL, (user_id, user_id, user_id))
+            imported = cur.rowcount
+            await conn.commit()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при импорте расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при импорте расходов: {e}")
+        return None
+
+    if categories_created:
+        invalidate_user_categories(user_id)
+    if imported:
+        invalidate_user_budgets(user_id)
+    return import_report(len(rows), imported, categories_created, started)
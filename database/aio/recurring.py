@@ -0,0 +1,124 @@
+import time
+from datetime import date
+
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.budgets import invalidate_user_budgets
+from database.recurring import (ADVANCE_RULES_SQL, DELETE_RULE_SQL,
+                                INSERT_RECURRING_EXPENSES_SQL,
+                                INSERT_RULE_SQL, RECURRING_BATCH_SIZE,
+                                SELECT_DUE_RULES_SQL, SELECT_USER_RULES_SQL,
+                                first_occurrence, materialization_batch,
+                                recurring_report, rules_from_rows)
+
+# Асинхронные версии функций database/recurring.py (запросы общие с синхронной реализацией)
+
+
+async def materialize_recurring_expenses(today: date | None = None, user_id: int | None = None) -> dict | None:
+    """
+    Записывает расходы по регулярным правилам пачками
+    (см. database.recurring.materialize_recurring_expenses).
+
+    Returns:
+        dict | None: Итоги запуска (см. recurring_report) или None в случае ошибки.
+    """
+    today = today or date.today()
+    started = time.monotonic()
+    rules = expenses = chunks = 0
+    users = set()
+    last_id = 0
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            while True:
+                await cur.execute(SELECT_DUE_RULES_SQL, (today, last_id, user_id, user_id, RECURRING_BATCH_SIZE))
+                due_rules = await cur.fetchall()
+                if not due_rules:
+                    break
+                rule_ids, periods, advance_ids, next_dates = materialization_batch(due_rules, today)
+                await cur.execute(INSERT_RECURRING_EXPENSES_SQL, (rule_ids, periods))
+                written = await cur.fetchall()
+                await cur.execute(ADVANCE_RULES_SQL, (advance_ids, next_dates))
+                await conn.commit()
+
+                chunks += 1
+                rules += len(due_rules)
+                expenses += len(written)
+                users.update(row[0] for row in written)
+                last_id = due_rules[-1][0]
+                if len(due_rules) < RECURRING_BATCH_SIZE:
+                    break
+    except psycopg.Error as e:
+        print(f"Ошибка БД при записи регулярных расходов (записано: {expenses}): {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при записи регулярных расходов: {e}")
+        return None
+    finally:
+        for user in users:
+            invalidate_user_budgets(user)
+
+    return recurring_report(rules, expenses, chunks, started)
+
+
+async def create_recurring_expense(user_id: int, category_id: int, amount: float, frequency: str,
+                                   day: int | None, start: date | None = None) -> int | None:
+    """
+    Создаёт правило регулярного расхода (см. database.recurring.create_recurring_expense).
+
+    Returns:
+        int | None: ID правила или None в случае ошибки.
+    """
+    next_date = first_occurrence(frequency, day, start or date.today())
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(INSERT_RULE_SQL, (amount, frequency, day, next_date, category_id, user_id))
+            row = await cur.fetchone()
+            await conn.commit()
+            return row[0] if row else None
+    except psycopg.Error as e:
+        print(f"Ошибка БД при создании регулярного расхода: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при создании регулярного расхода: {e}")
+        return None
+
+
+async def get_recurring_expenses(user_id: int) -> list[dict] | None:
+    """
+    Возвращает правила регулярных расходов пользователя (см. database.recurring.get_recurring_expenses).
+
+    Returns:
+        list[dict] | None: Правила или None в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_USER_RULES_SQL, (user_id,))
+            return rules_from_rows(await cur.fetchall())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при получении регулярных расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при получении регулярных расходов: {e}")
+        return None
+
+
+async def delete_recurring_expense(user_id: int, rule_id: int) -> bool | None:
+    """
+    Удаляет правило регулярного расхода (см. database.recurring.delete_recurring_expense).
+
+    Returns:
+        bool | None: True, если правило удалено, False, если его нет, None в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(DELETE_RULE_SQL, (rule_id, user_id))
+            deleted = cur.rowcount > 0
+            await conn.commit()
+            return deleted
+    except psycopg.Error as e:
+        print(f"Ошибка БД при удалении регулярного расхода: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при удалении регулярного расхода: {e}")
+        return None
@@ -0,0 +1,73 @@
+import psycopg
+
+from cache import MISSING
+from database.aio.connection import async_db_connection
+from database.states import (DELETE_STATE_SQL, PURGE_IDLE_STATES_SQL,
+                             SELECT_STATE_SQL, UPSERT_STATE_SQL, dump_data,
+                             entry_from_row)
+
+# Асинхронные версии функций database/states.py (запросы общие с синхронной реализацией)
+
+
+async def load_state(chat_id: int, user_id: int):
+    """
+    Загружает запись состояния чата (см. database.states.load_state).
+
+    Returns:
+        tuple | None: Пара (state, data), None, если записи нет, или MISSING в случае ошибки БД.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_STATE_SQL, (chat_id, user_id))
+            return entry_from_row(await cur.fetchone())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при чтении состояния чата: {e}")
+        return MISSING
+    except Exception as e:
+        print(f"Неизвестная ошибка при чтении состояния чата: {e}")
+        return MISSING
+
+
+async def save_state(chat_id: int, user_id: int, state: str | None, data: dict | None) -> bool:
+    """Сохраняет запись состояния чата (см. database.states.save_state)."""
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(UPSERT_STATE_SQL, (chat_id, user_id, state, dump_data(data)))
+            await conn.commit()
+            return True
+    except psycopg.Error as e:
+        print(f"Ошибка БД при сохранении состояния чата: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при сохранении состояния чата: {e}")
+        return False
+
+
+async def delete_state(chat_id: int, user_id: int) -> bool:
+    """Удаляет запись состояния чата (см. database.states.delete_state)."""
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(DELETE_STATE_SQL, (chat_id, user_id))
+            await conn.commit()
+            return True
+    except psycopg.Error as e:
+        print(f"Ошибка БД при удалении состояния чата: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при удалении состояния чата: {e}")
+        return False
+
+
+async def purge_idle_states(idle_seconds: float) -> int:
+    """Удаляет давно не менявшиеся состояния чатов (см. database.states.purge_idle_states)."""
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(PURGE_IDLE_STATES_SQL, (idle_seconds,))
+            await conn.commit()
+            return cur.rowcount
+    except psycopg.Error as e:
+        print(f"Ошибка БД при очистке состояний чатов: {e}")
+        return 0
+    except Exception as e:
+        print(f"Неизвестная ошибка при очистке состояний чатов: {e}")
+        return 0
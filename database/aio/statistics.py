@@ -0,0 +1,107 @@
+import psycopg
+
+from database.aio.connection import async_db_connection
+from database.statistics import (COMPARISON_STATISTICS_SQL, DAILY_TOTALS_SQL,
+                                 EXPENSES_BY_CATEGORY_SQL, FULL_STATISTICS_SQL,
+                                 TOTAL_EXPENSES_SQL, category_amount_from_row,
+                                 comparison_from_rows, comparison_params,
+                                 daily_totals_from_rows, daily_totals_params,
+                                 full_statistics_from_rows, total_from_row)
+
+# Асинхронные версии функций database/statistics.py (запросы и разбор результатов общие)
+
+
+async def statistics_for_week_or_month(user_id: int, start_date, end_date) -> float:
+    """
+    Вычисляет общую сумму расходов за период (см. database.statistics.statistics_for_week_or_month).
+
+    Returns:
+        float: Общая сумма расходов. 0.0 при отсутствии расходов или ошибке.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(TOTAL_EXPENSES_SQL, (user_id, start_date, end_date))
+            return total_from_row(await cur.fetchone())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при подсчёте общей статистики: {e}")
+        return 0.0
+    except Exception as e:
+        print(f"Неизвестная ошибка при подсчёте общей статистики: {e}")
+        return 0.0
+
+
+async def statistics_by_category(user_id: int, start_date, end_date) -> list[dict]:
+    """
+    Получает суммы расходов по категориям за период (см. database.statistics.statistics_by_category).
+
+    Returns:
+        list[dict]: Список словарей {'name', 'amount', 'is_deleted'}. Пустой список при ошибке.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(EXPENSES_BY_CATEGORY_SQL, (user_id, start_date, end_date))
+            return [category_amount_from_row(*row) for row in await cur.fetchall()]
+    except psycopg.Error as e:
+        print(f"Ошибка БД при подсчёте статистики по категориям: {e}")
+        return []
+    except Exception as e:
+        print(f"Неизвестная ошибка при подсчёте статистики по категориям: {e}")
+        return []
+
+
+async def full_statistics(user_id: int, start_date, end_date) -> dict:
+    """
+    Собирает полную статистику расходов за период одним запросом (см. database.statistics.full_statistics).
+
+    Returns:
+        dict: Словарь с ключами 'total_expenses' и 'expenses_by_category'.
+              Возвращает {'total_expenses': 0.0, 'expenses_by_category': []} в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(FULL_STATISTICS_SQL, (user_id, start_date, end_date))
+            return full_statistics_from_rows(await cur.fetchall())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при подсчёте полной статистики: {e}")
+        return {'total_expenses': 0.0, 'expenses_by_category': []}
+    except Exception as e:
+        print(f"Неизвестная ошибка при подсчёте полной статистики: {e}")
+        return {'total_expenses': 0.0, 'expenses_by_category': []}
+
+
+async def comparison_statistics(user_id: int, current: dict, previous: dict) -> dict:
+    """
+    Сравнивает расходы за два периода одним запросом (см. database.statistics.comparison_statistics).
+
+    Returns:
+        dict: Словарь со сравнением (см. database.statistics.comparison_from_rows).
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(COMPARISON_STATISTICS_SQL, comparison_params(user_id, current, previous))
+            return comparison_from_rows(await cur.fetchall())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при сравнении периодов: {e}")
+        return comparison_from_rows([])
+    except Exception as e:
+        print(f"Неизвестная ошибка при сравнении периодов: {e}")
+        return comparison_from_rows([])
+
+
+async def daily_totals(user_id: int, interval: dict) -> dict:
+    """
+    Загружает дневные итоги пользователя за период для прогноза (см. database.statistics.daily_totals).
+
+    Returns:
+        dict: Словарь для forecast.build_forecast. Данные без категорий в случае ошибки.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(DAILY_TOTALS_SQL, daily_totals_params(user_id, interval))
+            return daily_totals_from_rows(interval, await cur.fetchall())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при загрузке дневных итогов: {e}")
+        return daily_totals_from_rows(interval, [])
+    except Exception as e:
+        print(f"Неизвестная ошибка при загрузке дневных итогов: {e}")
+        return daily_totals_from_rows(interval, [])
@@ -0,0 +1,90 @@
+import psycopg
+
+from cache import MISSING
+from database.aio.connection import async_db_connection
+from database.user_data import (SELECT_USER_CATEGORIES_SQL,
+                                SELECT_USER_ID_SQL, UPSERT_USER_SQL,
+                                categories_cache, categories_from_rows,
+                                remember_user_id, user_id_cache)
+
+# Асинхронные версии функций database/user_data.py.
+# Запросы и кэши (user_id_cache, categories_cache) общие с синхронной реализацией.
+
+
+async def add_or_update_user(telegram_id: int, username: str | None, first_name: str | None,
+                             last_name: str | None) -> int | None:
+    """
+    Добавляет нового пользователя или обновляет существующего (см. database.user_data.add_or_update_user).
+
+    Returns:
+        int | None: Внутренний ID пользователя или None в случае ошибки БД.
+    """
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(UPSERT_USER_SQL, (telegram_id, username, first_name, last_name))
+            user_id = (await cur.fetchone())[0]
+            await conn.commit()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при добавлении/обновлении пользователя: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при добавлении/обновлении пользователя: {e}")
+        return None
+
+    user_id_cache.set(telegram_id, user_id)
+    return user_id
+
+
+async def find_user_id_by_telegram_id(telegram_id: int) -> int | None:
+    """
+    Находит внутренний ID пользователя по его Telegram ID, сначала проверяя кэш
+    (см. database.user_data.find_user_id_by_telegram_id).
+
+    Returns:
+        int | None: Внутренний ID пользователя, если найден, иначе None.
+    """
+    cached = user_id_cache.get(telegram_id)
+    if cached is not MISSING:
+        return cached
+
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_USER_ID_SQL, (telegram_id,))
+            result = await cur.fetchone()
+    except psycopg.Error as e:
+        print(f"Ошибка БД при поиске пользователя по telegram_id: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при поиске пользователя по telegram_id: {e}")
+        return None
+
+    user_id = result[0] if result else None
+    remember_user_id(telegram_id, user_id)
+    return user_id
+
+
+async def get_user_categories_names_and_ids(user_id: int) -> list[dict]:
+    """
+    Получает список активных категорий пользователя (см. database.user_data.get_user_categories_names_and_ids).
+    Возвращаемый список закэширован, его нельзя изменять.
+
+    Returns:
+        list[dict]: Список словарей с ключами 'id' и 'name'. Пустой список в случае ошибки.
+    """
+    cached = categories_cache.get(user_id)
+    if cached is not MISSING:
+        return cached
+
+    try:
+        async with async_db_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SELECT_USER_CATEGORIES_SQL, (user_id,))
+            categories_list = categories_from_rows(await cur.fetchall())
+    except psycopg.Error as e:
+        print(f"Ошибка БД при поиске категорий пользователя: {e}")
+        return []
+    except Exception as e:
+        print(f"Неизвестная ошибка при поиске категорий пользователя: {e}")
+        return []
+
+    categories_cache.set(user_id, categories_list)
+    return categories_list
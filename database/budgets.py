@@ -0,0 +1,294 @@
+import threading
+from datetime import date
+
+import psycopg2
+
+from cache import MISSING, TTLCache
+from database.connection import db_connection
+
+# Пороги предупреждений, в процентах бюджета
+BUDGET_ALERT_LEVELS = (80, 100)
+
+# Кэш бюджетов и трат текущего месяца (user_id -> MonthlyBudgets). После каждой записи
+# траты прибавляются к счётчикам в памяти, так что проверка порогов не пересчитывает месяц.
+# Запись загружается из БД при промахе, при смене месяца и после изменения бюджетов;
+# TTL ограничивает расхождение с БД, если траты записала другая реплика или импорт.
+BUDGETS_CACHE_SIZE = 10_000
+BUDGETS_CACHE_TTL = 10 * 60
+
+budgets_cache = TTLCache(maxsize=BUDGETS_CACHE_SIZE, ttl=BUDGETS_CACHE_TTL)
+
+# SQL-запросы модуля общие с асинхронной реализацией (database/aio/budgets.py).
+
+# Бюджеты удалённых категорий не учитываются (category_id IS NULL — общий бюджет)
+SELECT_BUDGETS_SQL = """
+    SELECT b.category_id, b.amount, b.alert_month, b.alert_level
+    FROM budgets AS b
+    LEFT JOIN categories AS c ON c.id = b.category_id
+    WHERE b.user_id = %s AND (b.category_id IS NULL OR c.is_deleted = FALSE)
+"""
+
+# Траты месяца по категориям читаются из дневных итогов: не больше 31 строки
+# на категорию, сколько бы трат ни было записано
+SELECT_MONTH_SPEND_SQL = """
+    SELECT category_id, SUM(total) FROM daily_category_totals
+    WHERE user_id = %s AND day >= %s::date AND day < %s::date + INTERVAL '1 month'
+    GROUP BY category_id
+"""
+
+# Новый лимит сбрасывает отправленные в этом месяце предупреждения
+UPSERT_BUDGET_SQL = """
+    INSERT INTO budgets (user_id, category_id, amount)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (user_id, (COALESCE(category_id, 0))) DO UPDATE
+    SET amount = EXCLUDED.amount, alert_month = NULL, alert_level = 0
+"""
+
+DELETE_BUDGET_SQL = """
+    DELETE FROM budgets
+    WHERE user_id = %s AND category_id IS NOT DISTINCT FROM %s
+"""
+
+# Предупреждение отмечается, только если этот порог в этом месяце ещё не отправлялся:
+# из нескольких реплик, одновременно заметивших превышение, отправит одна
+MARK_BUDGET_ALERT_SQL = """
+    UPDATE budgets
+    SET alert_month = %s, alert_level = %s
+    WHERE user_id = %s AND category_id IS NOT DISTINCT FROM %s
+      AND (alert_month IS DISTINCT FROM %s OR alert_level < %s)
+"""
+
+
+def month_start(today: date | None = None) -> date:
+    """Возвращает первый день текущего месяца."""
+    return (today or date.today()).replace(day=1)
+
+
+class MonthlyBudgets:
+    """
+    Бюджеты пользователя и его траты за месяц.
+
+    Ключ бюджета — ID категории или None для общего бюджета. Пока бюджетов нет,
+    траты не отслеживаются и не загружаются.
+
+    Args:
+        month (date): Первый день месяца.
+        limits (dict): Ключ бюджета -> лимит.
+        alerted (dict): Ключ бюджета -> порог, о котором уже предупредили в этом месяце.
+        spent (dict): ID категории -> траты месяца.
+    """
+
+    def __init__(self, month: date, limits: dict, alerted: dict, spent: dict):
+        self.month = month
+        self.limits = limits
+        self.alerted = alerted
+        self.spent = spent
+        self.total = sum(spent.values())
+        self._lock = threading.Lock()
+
+    def spent_for(self, key) -> float:
+        """Траты месяца по бюджету (все траты для общего бюджета)."""
+        return self.total if key is None else self.spent.get(key, 0.0)
+
+    def level(self, key) -> int:
+        """Наибольший достигнутый порог бюджета из BUDGET_ALERT_LEVELS (0, если ни одного)."""
+        percent = self.spent_for(key) / self.limits[key] * 100
+        return max((level for level in BUDGET_ALERT_LEVELS if percent >= level), default=0)
+
+    def pending(self, keys=None) -> list:
+        """Ключи бюджетов, достигших порога, о котором ещё не предупреждали."""
+        keys = self.limits if keys is None else [key for key in keys if key in self.limits]
+        return [key for key in keys if self.level(key) > self.alerted.get(key, 0)]
+
+    def add(self, expenses: list[tuple[int, float]]) -> list:
+        """
+        Прибавляет записанные траты к счётчикам месяца — O(число трат), без обращения к БД.
+
+        Args:
+            expenses (list[tuple[int, float]]): Пары (ID категории, сумма).
+
+        Returns:
+            list: Ключи бюджетов, достигших нового порога (см. pending).
+        """
+        if not self.limits:
+            return []
+        with self._lock:
+            for category_id, amount in expenses:
+                self.spent[category_id] = self.spent.get(category_id, 0.0) + amount
+                self.total += amount
+            return self.pending([None, *{category_id for category_id, _ in expenses}])
+
+    def alert(self, key) -> dict:
+        """Описание предупреждения: {'category_id', 'level', 'spent', 'limit'}."""
+        return {'category_id': key, 'level': self.level(key), 'spent': self.spent_for(key), 'limit': self.limits[key]}
+
+    def report(self) -> list[dict]:
+        """
+        Состояние всех бюджетов: общий бюджет первым, затем бюджеты категорий по убыванию доли трат.
+
+        Returns:
+            list[dict]: Словари {'category_id', 'spent', 'limit', 'percent'}.
+        """
+        rows = [
+            {'category_id': key, 'spent': self.spent_for(key), 'limit': limit,
+             'percent': round(self.spent_for(key) / limit * 100)}
+            for key, limit in self.limits.items()
+        ]
+        return sorted(rows, key=lambda row: (row['category_id'] is not None, -row['percent']))
+
+
+def budgets_from_rows(month: date, budget_rows, spend_rows) -> MonthlyBudgets:
+    """Собирает MonthlyBudgets из строк SELECT_BUDGETS_SQL и SELECT_MONTH_SPEND_SQL."""
+    limits, alerted = {}, {}
+    for category_id, amount, alert_month, alert_level in budget_rows:
+        limits[category_id] = float(amount)
+        if alert_month == month:
+            alerted[category_id] = alert_level
+    spent = {category_id: float(total) for category_id, total in spend_rows}
+    return MonthlyBudgets(month, limits, alerted, spent)
+
+
+def invalidate_user_budgets(user_id: int) -> None:
+    """
+    Сбрасывает закэшированные бюджеты и траты месяца пользователя.
+    Вызывается после изменения бюджетов и записи трат в обход track_expenses (импорт).
+    """
+    budgets_cache.pop(user_id)
+
+
+def get_monthly_budgets(user_id: int) -> MonthlyBudgets | None:
+    """
+    Возвращает бюджеты пользователя и траты текущего месяца: из кэша или из БД.
+
+    Args:
+        user_id (int): ID пользователя.
+
+    Returns:
+        MonthlyBudgets | None: Бюджеты или None в случае ошибки БД.
+    """
+    month = month_start()
+    cached = budgets_cache.get(user_id)
+    if cached is not MISSING and cached.month == month:
+        return cached
+
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(SELECT_BUDGETS_SQL, (user_id,))
+            budget_rows = cur.fetchall()
+            spend_rows = []
+            if budget_rows:
+                cur.execute(SELECT_MONTH_SPEND_SQL, (user_id, month, month))
+                spend_rows = cur.fetchall()
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при загрузке бюджетов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при загрузке бюджетов: {e}")
+        return None
+
+    budgets = budgets_from_rows(month, budget_rows, spend_rows)
+    budgets_cache.set(user_id, budgets)
+    return budgets
+
+
+def track_expenses(user_id: int, expenses: list[tuple[int, float]]) -> list[dict]:
+    """
+    Учитывает только что записанные траты в бюджетах месяца и возвращает предупреждения
+    о достигнутых порогах (80% и 100%).
+
+    Обычно траты прибавляются к счётчикам в памяти, и проверка не обращается к БД.
+    Только когда порог достигнут, траты месяца перечитываются из дневных итогов
+    (счётчик мог разойтись с БД) и предупреждение отмечается в таблице budgets.
+
+    Args:
+        user_id (int): ID пользователя.
+        expenses (list[tuple[int, float]]): Записанные траты — пары (ID категории, сумма).
+
+    Returns:
+        list[dict]: Предупреждения {'category_id', 'level', 'spent', 'limit'}
+                    (category_id None — общий бюджет). Пустой список при ошибке.
+    """
+    budgets = budgets_cache.get(user_id)
+    if budgets is not MISSING and budgets.month == month_start():
+        if not budgets.add(expenses):
+            return []
+        invalidate_user_budgets(user_id)
+    # Загруженные из БД траты уже включают только что записанные
+    budgets = get_monthly_budgets(user_id)
+    if budgets is None:
+        return []
+    keys = budgets.pending()
+    if not keys:
+        return []
+
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            alerts = []
+            for key in keys:
+                level = budgets.level(key)
+                cur.execute(MARK_BUDGET_ALERT_SQL, (budgets.month, level, user_id, key, budgets.month, level))
+                if cur.rowcount:
+                    alerts.append(budgets.alert(key))
+                budgets.alerted[key] = level
+            conn.commit()
+            return alerts
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при отметке предупреждений о бюджете: {e}")
+        return []
+    except Exception as e:
+        print(f"Неизвестная ошибка при отметке предупреждений о бюджете: {e}")
+        return []
+
+
+def set_budget(user_id: int, category_id: int | None, amount: float) -> bool:
+    """
+    Создаёт или изменяет месячный бюджет.
+
+    Args:
+        user_id (int): ID пользователя.
+        category_id (int | None): ID категории или None для общего бюджета.
+        amount (float): Лимит на месяц.
+
+    Returns:
+        bool: True, если бюджет сохранён, False в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(UPSERT_BUDGET_SQL, (user_id, category_id, amount))
+            conn.commit()
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при сохранении бюджета: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при сохранении бюджета: {e}")
+        return False
+
+    invalidate_user_budgets(user_id)
+    return True
+
+
+def delete_budget(user_id: int, category_id: int | None) -> bool | None:
+    """
+    Удаляет месячный бюджет.
+
+    Args:
+        user_id (int): ID пользователя.
+        category_id (int | None): ID категории или None для общего бюджета.
+
+    Returns:
+        bool | None: True, если бюджет удалён, False, если его не было, None в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(DELETE_BUDGET_SQL, (user_id, category_id))
+            deleted = cur.rowcount > 0
+            conn.commit()
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при удалении бюджета: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при удалении бюджета: {e}")
+        return None
+
+    invalidate_user_budgets(user_id)
+    return deleted
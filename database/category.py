@@ -1,6 +1,33 @@
 import psycopg2
 
-from database.connection import connect_db
+from database.connection import db_connection
+from database.user_data import invalidate_user_categories
+
+# SQL-запросы модуля общие с асинхронной реализацией (database/aio/category.py)
+SELECT_CATEGORY_NAME_SQL = """
+    SELECT name FROM categories
+    WHERE id = %s
+"""
+
+INSERT_CATEGORY_SQL = """
+    INSERT INTO categories (user_id, name)
+    VALUES (%s, %s)
+"""
+
+RENAME_CATEGORY_SQL = """
+    UPDATE categories
+    SET name = %s
+    WHERE id = %s
+    RETURNING user_id;
+"""
+
+# "Мягкое" удаление: установка флага is_deleted в TRUE и заполнение поля deleted_at текущим временем
+SOFT_DELETE_CATEGORY_SQL = """
+    UPDATE categories
+    SET is_deleted = TRUE, deleted_at = NOW()
+    WHERE id = %s
+    RETURNING user_id
+"""
 
 
 def is_valid_category_name(name: str) -> bool:
@@ -18,18 +45,10 @@ def get_category_name_by_id(category_id: int) -> str | None:
         str | None: Название категории, если найдено, иначе None.
                     Возвращает None также в случае ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return None
-
     try:
-        with conn.cursor() as cur:
+        with db_connection() as conn, conn.cursor() as cur:
             # Выполнение SQL-запроса для выбора названия категории по ID
-            cur.execute("""
-                SELECT name FROM categories
-                WHERE id = %s
-            """, (category_id,))
+            cur.execute(SELECT_CATEGORY_NAME_SQL, (category_id,))
             result = cur.fetchone()
             return result[0] if result else None  # Возвращаем название или None, если категория не найдена
     except psycopg2.Error as e:  # Ловим специфическое исключение
@@ -38,8 +57,6 @@ def get_category_name_by_id(category_id: int) -> str | None:
     except Exception as e:  # Ловим любые другие неожиданные исключения
         print(f"Неизвестная ошибка при получении названия категории: {e}")
         return None
-    finally:
-        conn.close()
 
 
 def create_category(user_id: int, category_name: str):
@@ -54,30 +71,19 @@ def create_category(user_id: int, category_name: str):
         bool: True, если категория успешно создана, False в противном случае.
               Возвращает False также в случае ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return False
-
     try:
-        with conn.cursor() as cur:
+        with db_connection() as conn, conn.cursor() as cur:
             # Выполнение SQL-запроса для вставки новой категории
-            cur.execute("""
-                INSERT INTO categories (user_id, name)
-                VALUES (%s, %s)
-            """, (user_id, category_name))
+            cur.execute(INSERT_CATEGORY_SQL, (user_id, category_name))
             conn.commit()  # Фиксация изменений в базе данных
-            return True
+        invalidate_user_categories(user_id)  # Сбрасываем кэш списка категорий пользователя
+        return True
     except psycopg2.Error as e:
         print(f"Ошибка БД при создании категории: {e}")
-        conn.rollback()  # Откат транзакции в случае ошибки
         return False
     except Exception as e:
         print(f"Неизвестная ошибка при создании категории: {e}")
-        conn.rollback()
         return False
-    finally:
-        conn.close()
 
 
 def rename_category_in_db(category_id: int, new_name: str):
@@ -92,32 +98,23 @@ def rename_category_in_db(category_id: int, new_name: str):
         bool: True, если категория успешно переименована, False в противном случае.
               Возвращает False также в случае ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return False
-
     try:
-        with conn.cursor() as cur:
+        with db_connection() as conn, conn.cursor() as cur:
             # Выполнение SQL-запроса для обновления названия категории по ID
-            cur.execute("""
-                UPDATE categories
-                SET name = %s
-                WHERE id = %s;
-            """, (new_name, category_id))
+            cur.execute(RENAME_CATEGORY_SQL, (new_name, category_id))
+            row = cur.fetchone()
             conn.commit()  # Фиксация изменений
 
-            return True
+        # Сбрасываем кэш категорий владельца, чтобы клавиатуры показали новое название
+        if row:
+            invalidate_user_categories(row[0])
+        return True
     except psycopg2.Error as e:
         print(f"Ошибка БД при переименовании категории: {e}")
-        conn.rollback()
         return False
     except Exception as e:
         print(f"Неизвестная ошибка при переименовании категории: {e}")
-        conn.rollback()
         return False
-    finally:
-        conn.close()
 
 
 def delete_category_func(category_id: int):
@@ -132,30 +129,21 @@ def delete_category_func(category_id: int):
         bool: True, если категория успешно помечена как удалённая, False в противном случае.
               Возвращает False также в случае ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return False
-
     try:
-        with conn.cursor() as cur:
-            # Обновление записи категории: установка флага is_deleted в TRUE
-            # и заполнение поля deleted_at текущим временем.
-            cur.execute("""
-                UPDATE categories
-                SET is_deleted = TRUE, deleted_at = NOW()
-                WHERE id = %s
-            """, (category_id,))
+        with db_connection() as conn, conn.cursor() as cur:
+            # Обновление записи категории: пометка удалённой с временем удаления
+            cur.execute(SOFT_DELETE_CATEGORY_SQL, (category_id,))
+            row = cur.fetchone()
             conn.commit()  # Фиксация изменений
-            return True
+
+        # Удалённая категория не должна больше появляться в клавиатурах
+        if row:
+            invalidate_user_categories(row[0])
+        return True
 
     except psycopg2.Error as e:
         print(f"Ошибка БД при мягком удалении категории: {e}")
-        conn.rollback()
         return False
     except Exception as e:
         print(f"Неизвестная ошибка при мягком удалении категории: {e}")
-        conn.rollback()
         return False
-    finally:
-        conn.close()
@@ -1,58 +1,136 @@
+import os
+import time
 from datetime import datetime
 
 import psycopg2
 
-from database.connection import connect_db
+from database.connection import db_connection
 
+# Параметры очистки (можно переопределить через переменные окружения)
+CLEANUP_RETENTION_DAYS = int(os.getenv('CLEANUP_RETENTION_DAYS', 30))  # срок хранения "мягко" удалённых категорий
+CLEANUP_BATCH_SIZE = int(os.getenv('CLEANUP_BATCH_SIZE', 5000))  # строк расходов за одну транзакцию
+CLEANUP_MAX_ROWS_PER_SEC = float(os.getenv('CLEANUP_MAX_ROWS_PER_SEC', 20_000))  # бюджет удаления; 0 — без ограничения
+CLEANUP_CATEGORY_GROUP_SIZE = 500  # категорий, расходы которых удаляются одной серией пачек
+CLEANUP_LOCK_TIMEOUT = '2s'  # пачка не ждёт блокировок дольше: она будет повторена при следующем запуске
 
-def delete_old_deleted_categories():
+# Очистка выполняется пачками, каждая в своей короткой транзакции: блокировки держатся
+# недолго, а WAL пишется равномерно. Состояние между запусками не хранится: условие
+# отбора само служит контрольной точкой — после сбоя следующий запуск продолжит
+# с оставшихся строк. SQL-запросы общие с database/aio/clean_old_categories.py.
+
+# Категория считается старой, если она была помечена как удаленная более CLEANUP_RETENTION_DAYS дней назад
+SELECT_EXPIRED_CATEGORIES_SQL = """
+    SELECT id FROM categories
+    WHERE is_deleted = TRUE
+      AND deleted_at IS NOT NULL
+      AND deleted_at < NOW() - make_interval(days => %s)
+    ORDER BY id
+"""
+
+# Аналог SET LOCAL lock_timeout: set_config принимает параметр запроса в обоих драйверах
+SET_LOCK_TIMEOUT_SQL = "SELECT set_config('lock_timeout', %s, true)"
+
+# Пачка расходов по первичному ключу (индекс expenses_category_idx)
+DELETE_EXPENSES_CHUNK_SQL = """
+    DELETE FROM expenses
+    WHERE id IN (
+        SELECT id FROM expenses
+        WHERE category_id = ANY(%s)
+        LIMIT %s
+    )
+"""
+
+# Категория удаляется, только если у неё не осталось расходов (например, записанных
+# со старой клавиатуры после начала очистки) — иначе она дождётся следующего запуска
+DELETE_CATEGORIES_SQL = """
+    DELETE FROM categories AS c
+    WHERE c.id = ANY(%s)
+      AND c.is_deleted = TRUE
+      AND NOT EXISTS (SELECT 1 FROM expenses AS e WHERE e.category_id = c.id)
+"""
+
+
+def budget_delay(rows_deleted: int, started: float) -> float:
     """
-    Выполняет физическое удаление старых "мягко" удаленных категорий
-    и связанных с ними расходов из базы данных.
-    Категория считается старой, если она была помечена как удаленная более 30 дней назад.
+    Возвращает паузу (в секундах), после которой скорость удаления
+    не превысит CLEANUP_MAX_ROWS_PER_SEC.
 
-    Эта функция предназначена для запуска по расписанию (например, в отдельном потоке).
+    Args:
+        rows_deleted (int): Сколько строк удалено с начала запуска.
+        started (float): Момент начала запуска (time.monotonic()).
+    """
+    if CLEANUP_MAX_ROWS_PER_SEC <= 0:
+        return 0.0
+    return max(0.0, rows_deleted / CLEANUP_MAX_ROWS_PER_SEC - (time.monotonic() - started))
+
+
+def cleanup_report(expenses: int, categories: int, chunks: int, started: float) -> dict:
+    """
+    Формирует и печатает итоги запуска очистки.
+
+    Returns:
+        dict: Словарь с ключами 'expenses', 'categories', 'chunks', 'seconds' и 'rows_per_sec'.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Нет соединения с БД для очистки.")
-        return
+    seconds = time.monotonic() - started
+    report = {
+        'expenses': expenses,
+        'categories': categories,
+        'chunks': chunks,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round((expenses + categories) / seconds, 1) if seconds > 0 else 0.0,
+    }
+    print(f"[{datetime.now()}] Очистка старых удалённых категорий: {report}")
+    return report
 
+
+def delete_old_deleted_categories() -> dict | None:
+    """
+    Физически удаляет старые "мягко" удаленные категории и связанные с ними расходы.
+
+    Расходы удаляются пачками по CLEANUP_BATCH_SIZE строк с фиксацией после каждой
+    пачки и паузами, ограничивающими скорость CLEANUP_MAX_ROWS_PER_SEC строк в секунду;
+    затем удаляются категории, у которых не осталось расходов.
+
+    Эта функция предназначена для запуска по расписанию (например, в отдельном потоке).
+
+    Returns:
+        dict | None: Итоги запуска (см. cleanup_report) или None в случае ошибки.
+                     Уже удалённые пачки при ошибке не откатываются.
+    """
+    started = time.monotonic()
+    expenses_deleted = categories_deleted = chunks = 0
     try:
-        with conn.cursor() as cur:
-            # 1. Удаление всех записей о расходах (expenses),
-            # которые связаны с категориями, помеченными как удаленные
-            # более 30 дней назад.
-            print("Поиск и удаление старых расходов, связанных с удаленными категориями...")
-            cur.execute("""
-                DELETE FROM expenses
-                WHERE category_id IN (
-                    SELECT id FROM categories
-                    WHERE is_deleted = TRUE
-                      AND deleted_at IS NOT NULL
-                      AND deleted_at < NOW() - INTERVAL '30 days'
-                );
-            """)
-            print(f"Удалено расходов: {cur.rowcount}") # Логирование количества удаленных строк
-
-            # 2. Физическое удаление самих категорий, которые были "мягко" удалены
-            # более 30 дней назад.
-            print("Поиск и удаление старых удаленных категорий...")
-            cur.execute("""
-                DELETE FROM categories
-                WHERE is_deleted = TRUE
-                  AND deleted_at IS NOT NULL
-                  AND deleted_at < NOW() - INTERVAL '30 days';
-            """)
-            print(f"Удалено категорий: {cur.rowcount}") # Логирование количества удаленных строк
-
-        conn.commit() # Фиксация всех изменений в базе данных
-        print(f"[{datetime.now()}] Ежемесячная очистка старых удалённых категорий и их расходов завершена успешно.")
+        with db_connection() as conn, conn.cursor() as cur:
+            # Набор категорий фиксируется в начале запуска
+            cur.execute(SELECT_EXPIRED_CATEGORIES_SQL, (CLEANUP_RETENTION_DAYS,))
+            category_ids = [row[0] for row in cur.fetchall()]
+            conn.commit()
+
+            for i in range(0, len(category_ids), CLEANUP_CATEGORY_GROUP_SIZE):
+                group = category_ids[i:i + CLEANUP_CATEGORY_GROUP_SIZE]
+
+                # 1. Расходы категорий группы — пачками, каждая в отдельной транзакции
+                while True:
+                    cur.execute(SET_LOCK_TIMEOUT_SQL, (CLEANUP_LOCK_TIMEOUT,))
+                    cur.execute(DELETE_EXPENSES_CHUNK_SQL, (group, CLEANUP_BATCH_SIZE))
+                    deleted = cur.rowcount
+                    conn.commit()
+                    chunks += 1
+                    expenses_deleted += deleted
+                    if deleted < CLEANUP_BATCH_SIZE:
+                        break
+                    time.sleep(budget_delay(expenses_deleted + categories_deleted, started))
+
+                # 2. Сами категории группы
+                cur.execute(SET_LOCK_TIMEOUT_SQL, (CLEANUP_LOCK_TIMEOUT,))
+                cur.execute(DELETE_CATEGORIES_SQL, (group,))
+                categories_deleted += cur.rowcount
+                conn.commit()
     except psycopg2.Error as e:
-        print(f"Ошибка БД при очистке: {e}")
-        conn.rollback() # Откат транзакции, если произошла ошибка
+        print(f"Ошибка БД при очистке (удалено расходов: {expenses_deleted}, категорий: {categories_deleted}): {e}")
+        return None
     except Exception as e:
         print(f"Неизвестная ошибка при очистке: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+        return None
+
+    return cleanup_report(expenses_deleted, categories_deleted, chunks, started)
@@ -1,11 +1,22 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 
 import psycopg2
 from dotenv import load_dotenv
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
 
 # Загружаем переменные окружения из файла .env
 load_dotenv()
 
+# Параметры пула соединений (можно переопределить через переменные окружения)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # сек. ожидания свободного соединения
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", 30))  # сек. простоя до пинга
+
 
 def connect_db():
     database_url = os.getenv("DB_URL")
@@ -15,3 +26,250 @@ def connect_db():
 
     conn = psycopg2.connect(database_url)
     return conn
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул соединений с PostgreSQL.
+
+    Держит от `min_size` до `max_size` открытых соединений. При выдаче соединения
+    проверяет его состояние (и пингует, если оно долго простаивало), а сломанные
+    соединения заменяет новыми. Если все соединения заняты, ожидает освобождения
+    не дольше `timeout` секунд, после чего выбрасывает psycopg2.pool.PoolError.
+
+    Собирает метрики для подбора размера пула: число выдач, время ожидания,
+    количество переподключений и насыщение (сколько раз пришлось ждать).
+    """
+
+    def __init__(self, min_size: int = DB_POOL_MIN_SIZE, max_size: int = DB_POOL_MAX_SIZE,
+                 timeout: float = DB_POOL_TIMEOUT,
+                 health_check_interval: float = DB_POOL_HEALTH_CHECK_INTERVAL,
+                 connect=connect_db):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Некорректные размеры пула соединений.")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connect = connect
+
+        self._cond = threading.Condition()
+        self._idle = []  # Свободные соединения: список пар (conn, время возврата в пул)
+        self._size = 0  # Общее число открытых соединений (свободные + выданные)
+        self._closed = False
+
+        # Метрики пула
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._reconnects = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._peak_in_use = 0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    @property
+    def in_use(self) -> int:
+        return self._size - len(self._idle)
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        """
+        Проверяет, пригодно ли соединение для повторного использования.
+        Дешёвая локальная проверка выполняется всегда, а `SELECT 1` —
+        только если соединение простаивало дольше health_check_interval.
+        """
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _discard(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def getconn(self):
+        """
+        Выдаёт соединение из пула, при необходимости открывая новое.
+
+        Returns:
+            connection: Открытое соединение psycopg2.
+
+        Raises:
+            psycopg2.pool.PoolError: Если пул закрыт или свободное соединение
+                                     не появилось за `timeout` секунд.
+        """
+        started = time.monotonic()
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("Пул соединений закрыт.")
+                if self._idle or self._size < self.max_size:
+                    break
+                waited = True
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolError("Нет свободных соединений в пуле.")
+                self._cond.wait(remaining)
+
+            if self._idle:
+                conn, idle_since = self._idle.pop()
+            else:
+                conn, idle_since = None, 0.0
+            # Резервируем место под соединение заранее, чтобы не превысить max_size
+            if conn is None:
+                self._size += 1
+
+        # Проверка и открытие соединений выполняются вне блокировки
+        try:
+            if conn is not None and not self._is_healthy(conn, idle_since):
+                self._discard(conn)
+                conn = None
+                with self._cond:
+                    self._reconnects += 1
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        wait_time = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+            if waited:
+                self._waits += 1
+            self._peak_in_use = max(self._peak_in_use, self.in_use)
+        return conn
+
+    def putconn(self, conn, broken: bool = False) -> None:
+        """
+        Возвращает соединение в пул. Незавершённая транзакция откатывается.
+        Сломанные соединения, а также соединения, возвращённые в закрытый пул, закрываются.
+
+        Args:
+            conn: Соединение, ранее выданное getconn().
+            broken (bool): True, если соединение нельзя использовать повторно.
+        """
+        if not broken and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+
+        with self._cond:
+            if broken or conn.closed or self._closed:
+                self._size -= 1
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        """Закрывает все свободные соединения; выданные будут закрыты при возврате."""
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._discard(conn)
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики пула.
+
+        Returns:
+            dict: Словарь с ключами 'size', 'idle', 'in_use', 'max_size', 'saturation',
+                  'peak_in_use', 'checkouts', 'waits', 'timeouts', 'reconnects',
+                  'wait_time_avg' и 'wait_time_max' (в секундах).
+        """
+        with self._cond:
+            in_use = self.in_use
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'max_size': self.max_size,
+                'saturation': in_use / self.max_size,
+                'peak_in_use': self._peak_in_use,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'reconnects': self._reconnects,
+                'wait_time_avg': self._wait_time_total / self._checkouts if self._checkouts else 0.0,
+                'wait_time_max': self._wait_time_max,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Возвращает общий для процесса пул соединений, создавая его при первом обращении."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """Возвращает метрики общего пула соединений (см. ConnectionPool.stats)."""
+    return get_pool().stats()
+
+
+@contextmanager
+def db_connection():
+    """
+    Контекстный менеджер для работы с соединением из пула.
+
+    Выдаёт соединение и по выходе из блока возвращает его в пул. Если внутри блока
+    возникло исключение, транзакция откатывается, а соединение с признаками обрыва
+    (OperationalError / InterfaceError) закрывается и будет заменено новым.
+
+    Пример:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    except BaseException:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        raise
+    finally:
+        pool.putconn(conn, broken=broken)
@@ -1,6 +1,85 @@
 import psycopg2
 
-from database.connection import connect_db
+from database.connection import db_connection
+
+# SQL-запросы модуля общие с асинхронной реализацией (database/aio/expenses.py).
+# Поле date в таблице expenses имеет DEFAULT NOW(), а дневные итоги
+# daily_category_totals обновляются триггером в той же транзакции
+INSERT_EXPENSE_SQL = """
+    INSERT INTO expenses (user_id, category_id, amount)
+    VALUES (%s, %s, %s)
+"""
+
+# Пакетная запись: все траты сообщения вставляются одним запросом из массивов (unnest),
+# поэтому число обращений к БД и срабатываний триггера итогов не зависит от числа строк.
+# Соединение с categories отбрасывает чужие и удалённые к этому моменту категории;
+# RETURNING сообщает, какие траты записаны
+INSERT_EXPENSES_BULK_SQL = """
+    INSERT INTO expenses (user_id, category_id, amount)
+    SELECT c.user_id, c.id, v.amount
+    FROM unnest(%s::int[], %s::numeric[]) AS v (category_id, amount)
+    JOIN categories AS c ON c.id = v.category_id
+    WHERE c.user_id = %s AND c.is_deleted = FALSE
+    RETURNING category_id, amount
+"""
+
+# Запрос топ-категорий использует Common Table Expressions (CTE) для сложной выборки:
+# 1. UserCategorySums: Суммирует дневные итоги (daily_category_totals) по категориям
+#    для данного пользователя в заданном диапазоне дат, исключая удаленные категории.
+# 2. UserExpensesWithNames: Присоединяет названия категорий к их суммам.
+# 3. RankedExpenses: Ранжирует категории по убыванию суммы расходов.
+# Финальная выборка UNION ALL объединяет топ-3 категории с суммой остальных.
+TOP_CATEGORIES_SQL = """
+    WITH UserCategorySums AS (
+        SELECT
+            d.category_id,
+            SUM(d.total) AS total_amount
+        FROM
+            daily_category_totals AS d
+        JOIN
+            categories AS c ON d.category_id = c.id
+        WHERE
+            d.user_id = %s
+            AND d.day BETWEEN %s::date AND %s::date
+            AND c.is_deleted = FALSE -- Учитываем только активные (неудаленные) категории
+        GROUP BY
+            d.category_id
+    ),
+    UserExpensesWithNames AS (
+        SELECT
+            c.name AS category_name,
+            ucs.total_amount
+        FROM
+            UserCategorySums AS ucs
+        JOIN
+            categories AS c ON ucs.category_id = c.id
+    ),
+    RankedExpenses AS (
+        SELECT
+            category_name,
+            total_amount,
+            ROW_NUMBER() OVER (ORDER BY total_amount DESC) as rn -- Ранжируем категории по сумме
+        FROM
+            UserExpensesWithNames
+    )
+    SELECT
+        category_name,
+        total_amount
+    FROM
+        RankedExpenses
+    WHERE
+        rn <= 3 -- Выбираем топ-3 категории
+
+    UNION ALL -- Объединяем с результатами для "Остального"
+
+    SELECT
+        'Остальное' AS category_name,
+        SUM(total_amount) AS total_amount
+    FROM
+        RankedExpenses
+    WHERE
+        rn > 3; -- Суммируем все остальные категории
+"""
 
 
 def write_down_expense(user_id: int, category_id: int, amount: float):
@@ -16,34 +95,48 @@ def write_down_expense(user_id: int, category_id: int, amount: float):
         bool: True, если расход успешно записан, False в противном случае.
               Возвращает False также в случае ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return False
-
     try:
-        with conn.cursor() as cur:
+        with db_connection() as conn, conn.cursor() as cur:
             # SQL-запрос для вставки новой записи о расходе
-            # Предполагается, что поле date в таблице expenses имеет DEFAULT NOW()
-            cur.execute("""
-            INSERT INTO expenses (user_id, category_id, amount)
-            VALUES (%s, %s, %s)
-            """, (user_id, category_id, amount))
+            cur.execute(INSERT_EXPENSE_SQL, (user_id, category_id, amount))
             conn.commit() # Фиксация изменений в базе данных
             return True
     except psycopg2.Error as e:
         print(f"Ошибка БД при записи расходов: {e}")
-        if conn:
-            conn.rollback() # Откат транзакции в случае ошибки
         return False
     except Exception as e:
         print(f"Неизвестная ошибка при записи расходов: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        if conn:
-            conn.close()
+
+
+def write_down_expenses(user_id: int, expenses: list[tuple[int, float]]) -> list[tuple[int, float]] | None:
+    """
+    Записывает несколько расходов одним запросом в одной транзакции.
+
+    Args:
+        user_id (int): ID пользователя, совершившего расходы.
+        expenses (list[tuple[int, float]]): Пары (ID категории, сумма).
+
+    Returns:
+        list[tuple[int, float]] | None: Пары (ID категории, сумма) записанных расходов (расходы
+                                        в удалённые или чужие категории пропускаются)
+                                        или None в случае ошибки.
+    """
+    if not expenses:
+        return []
+    category_ids, amounts = zip(*expenses)
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(INSERT_EXPENSES_BULK_SQL, (list(category_ids), list(amounts), user_id))
+            written = [(category_id, float(amount)) for category_id, amount in cur.fetchall()]
+            conn.commit()
+            return written
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при пакетной записи расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при пакетной записи расходов: {e}")
+        return None
 
 
 def get_top_categories_and_other_sum(user_id: int, start_date: str, end_date: str):
@@ -64,87 +157,10 @@ def get_top_categories_and_other_sum(user_id: int, start_date: str, end_date: st
               Возвращает {'top_categories': [], 'other_sum': 0.0} в случае ошибки
               или отсутствия данных.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return {'top_categories': [], 'other_sum': 0.0}
-
     try:
-        with conn.cursor() as cur:
-            # SQL-запрос использует Common Table Expressions (CTE) для сложной выборки:
-            # 1. UserCategorySums: Суммирует расходы по категориям для данного пользователя в заданном диапазоне дат,
-            #    исключая удаленные категории.
-            # 2. UserExpensesWithNames: Присоединяет названия категорий к их суммам.
-            # 3. RankedExpenses: Ранжирует категории по убыванию суммы расходов.
-            # Финальная выборка UNION ALL объединяет топ-3 категории с суммой остальных.
-            cur.execute("""
-                WITH UserCategorySums AS (
-                    SELECT
-                        e.category_id,
-                        SUM(e.amount) AS total_amount
-                    FROM
-                        expenses AS e
-                    JOIN
-                        categories AS c ON e.category_id = c.id
-                    WHERE
-                        e.user_id = %s
-                        AND e.date BETWEEN %s AND %s
-                        AND c.is_deleted = FALSE -- Учитываем только активные (неудаленные) категории
-                    GROUP BY
-                        e.category_id
-                ),
-                UserExpensesWithNames AS (
-                    SELECT
-                        c.name AS category_name,
-                        ucs.total_amount
-                    FROM
-                        UserCategorySums AS ucs
-                    JOIN
-                        categories AS c ON ucs.category_id = c.id
-                ),
-                RankedExpenses AS (
-                    SELECT
-                        category_name,
-                        total_amount,
-                        ROW_NUMBER() OVER (ORDER BY total_amount DESC) as rn -- Ранжируем категории по сумме
-                    FROM
-                        UserExpensesWithNames
-                )
-                SELECT
-                    category_name,
-                    total_amount
-                FROM
-                    RankedExpenses
-                WHERE
-                    rn <= 3 -- Выбираем топ-3 категории
-
-                UNION ALL -- Объединяем с результатами для "Остального"
-
-                SELECT
-                    'Остальное' AS category_name,
-                    SUM(total_amount) AS total_amount
-                FROM
-                    RankedExpenses
-                WHERE
-                    rn > 3; -- Суммируем все остальные категории
-            """, (user_id, start_date, end_date))
-
-            results = cur.fetchall()
-
-            top_categories = []
-            other_sum = 0.0
-
-            # Разбор результатов запроса
-            for category_name, amount in results:
-                if category_name == 'Остальное':
-                    other_sum = float(amount) if amount is not None else 0.0
-                else:
-                    top_categories.append({'name': category_name, 'amount': float(amount or 0.0)})
-
-            # Сортировка топ-категорий по убыванию суммы (на случай, если UNION ALL нарушил порядок)
-            top_categories.sort(key=lambda x: x['amount'], reverse=True)
-
-            return {'top_categories': top_categories, 'other_sum': other_sum}
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(TOP_CATEGORIES_SQL, (user_id, start_date, end_date))
+            return top_categories_from_rows(cur.fetchall())
 
     except psycopg2.Error as e:
         print(f"Ошибка БД при получении топ категорий: {e}")
@@ -152,6 +168,27 @@ def get_top_categories_and_other_sum(user_id: int, start_date: str, end_date: st
     except Exception as e:
         print(f"Неизвестная ошибка при получении топ категорий: {e}")
         return {'top_categories': [], 'other_sum': 0.0}
-    finally:
-        if conn:
-            conn.close()
+
+
+def top_categories_from_rows(rows) -> dict:
+    """
+    Разбирает строки (category_name, amount) запроса TOP_CATEGORIES_SQL.
+
+    Returns:
+        dict: Словарь с ключами 'top_categories' и 'other_sum'
+              (см. get_top_categories_and_other_sum).
+    """
+    top_categories = []
+    other_sum = 0.0
+
+    # Разбор результатов запроса
+    for category_name, amount in rows:
+        if category_name == 'Остальное':
+            other_sum = float(amount) if amount is not None else 0.0
+        else:
+            top_categories.append({'name': category_name, 'amount': float(amount or 0.0)})
+
+    # Сортировка топ-категорий по убыванию суммы (на случай, если UNION ALL нарушил порядок)
+    top_categories.sort(key=lambda x: x['amount'], reverse=True)
+
+    return {'top_categories': top_categories, 'other_sum': other_sum}
@@ -0,0 +1,58 @@
+import csv
+import os
+
+import psycopg2
+
+from database.connection import db_connection
+
+# Строк, которые серверный курсор передаёт за одно обращение к БД
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 2000))
+
+# Заголовок выгрузки (его же понимает импорт трат из CSV)
+EXPORT_COLUMNS = ('date', 'category', 'amount')
+
+# Все расходы пользователя, включая расходы в удалённых категориях (они остаются в статистике).
+# Значения форматируются в PostgreSQL, чтобы строки сразу записывались в CSV без преобразований;
+# порядок по дате поддерживается индексом expenses_user_date_idx
+EXPORT_EXPENSES_SQL = """
+    SELECT to_char(e.date, 'YYYY-MM-DD HH24:MI:SS'), COALESCE(c.name, ''), e.amount::text
+    FROM expenses AS e
+    LEFT JOIN categories AS c ON c.id = e.category_id
+    WHERE e.user_id = %s
+    ORDER BY e.date, e.id
+"""
+
+
+def export_expenses_csv(user_id: int, stream) -> int | None:
+    """
+    Записывает историю расходов пользователя в CSV-поток.
+
+    Строки читаются серверным (именованным) курсором пачками по EXPORT_BATCH_SIZE
+    и сразу записываются в поток, поэтому расход памяти не зависит от размера истории.
+
+    Args:
+        user_id (int): ID пользователя.
+        stream: Текстовый поток для записи (открытый с newline='').
+
+    Returns:
+        int | None: Количество выгруженных расходов или None в случае ошибки.
+    """
+    try:
+        with db_connection() as conn:
+            with conn.cursor(name='export_expenses') as cur:
+                cur.execute(EXPORT_EXPENSES_SQL, (user_id,))
+                writer = csv.writer(stream)
+                writer.writerow(EXPORT_COLUMNS)
+                count = 0
+                # В памяти одновременно находится не больше одной пачки строк
+                while rows := cur.fetchmany(EXPORT_BATCH_SIZE):
+                    writer.writerows(rows)
+                    count += len(rows)
+            conn.commit()  # Завершаем транзакцию серверного курсора
+            return count
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при выгрузке расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при выгрузке расходов: {e}")
+        return None
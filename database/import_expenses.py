@@ -0,0 +1,140 @@
+import csv
+import io
+import time
+from datetime import datetime
+
+import psycopg2
+
+from database.budgets import invalidate_user_budgets
+from database.connection import db_connection
+from database.user_data import invalidate_user_categories
+
+# Импорт выполняется в одной транзакции: строки загружаются командой COPY во временную
+# таблицу, затем недостающие категории создаются, а расходы переносятся в expenses
+# двумя запросами. При любой ошибке откатывается всё, включая временную таблицу.
+# SQL-запросы общие с database/aio/import_expenses.py.
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE import_staging (
+        line     INTEGER NOT NULL,
+        date     TIMESTAMP NOT NULL,
+        category TEXT NOT NULL,
+        amount   NUMERIC(12, 2) NOT NULL
+    ) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = "COPY import_staging (line, date, category, amount) FROM STDIN WITH (FORMAT csv)"
+
+# Автоочистка не обрабатывает временные таблицы: без статистики планировщик считает
+# таблицу маленькой и проверяет дубликаты вложенным циклом по всем расходам пользователя
+ANALYZE_STAGING_SQL = "ANALYZE import_staging"
+
+# Категории сопоставляются без учёта регистра; для отсутствующих создаётся категория
+# с написанием из первой строки файла, где она встретилась
+CREATE_MISSING_CATEGORIES_SQL = """
+    INSERT INTO categories (user_id, name)
+    SELECT %s, name
+    FROM (
+        SELECT DISTINCT ON (lower(s.category)) s.category AS name, s.line
+        FROM import_staging AS s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM categories AS c
+            WHERE c.user_id = %s AND c.is_deleted = FALSE AND lower(c.name) = lower(s.category)
+        )
+        ORDER BY lower(s.category), s.line
+    ) AS missing
+    ORDER BY line
+"""
+
+# Расходы, уже записанные с той же категорией, датой и суммой (например, при повторной
+# загрузке файла /export), пропускаются — импорт можно безопасно повторить
+MERGE_EXPENSES_SQL = """
+    WITH active AS (
+        SELECT DISTINCT ON (lower(name)) id, lower(name) AS key
+        FROM categories
+        WHERE user_id = %s AND is_deleted = FALSE
+        ORDER BY lower(name), id
+    )
+    INSERT INTO expenses (user_id, category_id, amount, date)
+    SELECT %s, a.id, s.amount, s.date
+    FROM import_staging AS s
+    JOIN active AS a ON a.key = lower(s.category)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM expenses AS e
+        WHERE e.user_id = %s AND e.category_id = a.id AND e.date = s.date AND e.amount = s.amount
+    )
+    ORDER BY s.line
+"""
+
+
+def staging_csv(rows: list[tuple[int, datetime, str, float]]) -> str:
+    """
+    Формирует данные для COPY_STAGING_SQL.
+
+    Args:
+        rows (list[tuple[int, datetime, str, float]]): Проверенные строки (номер строки, дата, категория, сумма).
+
+    Returns:
+        str: CSV без заголовка.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows((line, date.isoformat(sep=' '), category, amount)
+                                 for line, date, category, amount in rows)
+    return buffer.getvalue()
+
+
+def import_report(rows: int, imported: int, categories_created: int, started: float) -> dict:
+    """
+    Формирует и печатает итоги импорта.
+
+    Returns:
+        dict: Словарь с ключами 'rows', 'imported', 'duplicates', 'categories_created',
+              'seconds' и 'rows_per_sec'.
+    """
+    seconds = time.monotonic() - started
+    report = {
+        'rows': rows,
+        'imported': imported,
+        'duplicates': rows - imported,
+        'categories_created': categories_created,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else 0.0,
+    }
+    print(f"[{datetime.now()}] Импорт расходов: {report}")
+    return report
+
+
+def import_expenses(user_id: int, rows: list[tuple[int, datetime, str, float]]) -> dict | None:
+    """
+    Импортирует проверенные строки расходов одной транзакцией через COPY.
+
+    Args:
+        user_id (int): ID пользователя.
+        rows (list[tuple[int, datetime, str, float]]): Строки (номер строки, дата, категория, сумма).
+
+    Returns:
+        dict | None: Итоги импорта (см. import_report) или None в случае ошибки
+                     (в этом случае ничего не записано).
+    """
+    started = time.monotonic()
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(CREATE_STAGING_SQL)
+            cur.copy_expert(COPY_STAGING_SQL, io.StringIO(staging_csv(rows)))
+            cur.execute(ANALYZE_STAGING_SQL)
+            cur.execute(CREATE_MISSING_CATEGORIES_SQL, (user_id, user_id))
+            categories_created = cur.rowcount
+            cur.execute(MERGE_EXPENSES_SQL, (user_id, user_id, user_id))
+            imported = cur.rowcount
+            conn.commit()
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при импорте расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при импорте расходов: {e}")
+        return None
+
+    if categories_created:
+        invalidate_user_categories(user_id)  # Сбрасываем кэш списка категорий, как при create_category
+    if imported:
+        invalidate_user_budgets(user_id)  # Траты месяца будут перечитаны из дневных итогов
+    return import_report(len(rows), imported, categories_created, started)
@@ -0,0 +1,319 @@
+"""
+Версионированные миграции схемы базы данных.
+
+Применяются при старте бота (см. main.py) или вручную:
+    python -m database.migrations           # применить недостающие миграции
+    python -m database.migrations --status  # показать применённые версии
+
+Каждая миграция выполняется в отдельной транзакции и записывается в таблицу
+schema_migrations. Одновременный запуск на нескольких репликах сериализуется
+advisory-блокировкой PostgreSQL.
+"""
+import argparse
+
+import psycopg2
+
+from database.connection import db_connection
+
+# Ключ advisory-блокировки, под которой применяются миграции
+MIGRATIONS_LOCK_KEY = 7_480_001
+
+# Список миграций: (версия, описание, SQL). Версии только растут, применённые миграции не изменяются.
+# Первая миграция идемпотентна (IF NOT EXISTS), чтобы её можно было применить к уже существующей базе.
+MIGRATIONS = [
+    (1, 'Базовая схема: пользователи, категории, расходы', """
+        CREATE TABLE IF NOT EXISTS users (
+            id          SERIAL PRIMARY KEY,
+            telegram_id BIGINT NOT NULL UNIQUE,
+            username    TEXT,
+            first_name  TEXT,
+            last_name   TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS categories (
+            id         SERIAL PRIMARY KEY,
+            user_id    INTEGER NOT NULL REFERENCES users (id),
+            name       VARCHAR(50) NOT NULL,
+            is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+            deleted_at TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS expenses (
+            id          SERIAL PRIMARY KEY,
+            user_id     INTEGER NOT NULL REFERENCES users (id),
+            category_id INTEGER REFERENCES categories (id),
+            amount      NUMERIC(12, 2) NOT NULL,
+            date        TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """),
+    (2, 'Индексы под запросы статистики, клавиатур и очистки', """
+        -- Статистика: фильтр по пользователю и диапазону дат; INCLUDE позволяет
+        -- отвечать index-only сканом без чтения строк таблицы
+        CREATE INDEX IF NOT EXISTS expenses_user_date_idx
+            ON expenses (user_id, date) INCLUDE (category_id, amount);
+
+        -- Очистка удалённых категорий удаляет расходы по category_id
+        CREATE INDEX IF NOT EXISTS expenses_category_idx
+            ON expenses (category_id);
+
+        -- Список активных категорий для инлайн-клавиатур
+        CREATE INDEX IF NOT EXISTS categories_user_active_idx
+            ON categories (user_id) INCLUDE (name)
+            WHERE is_deleted = FALSE;
+
+        -- Поиск "мягко" удалённых категорий с истёкшим сроком хранения
+        CREATE INDEX IF NOT EXISTS categories_deleted_at_idx
+            ON categories (deleted_at)
+            WHERE is_deleted = TRUE;
+    """),
+    (3, 'Дневные итоги расходов по категориям (daily_category_totals)', """
+        -- Предагрегированные суммы: статистика читает дни x категории вместо сырых расходов
+        CREATE TABLE IF NOT EXISTS daily_category_totals (
+            user_id     INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            day         DATE NOT NULL,
+            total       NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            count       INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day, category_id)
+        );
+
+        -- Итоги поддерживаются триггерами уровня оператора: изменённые строки берутся
+        -- из переходных таблиц, поэтому пакетные вставки и удаления обновляют итоги
+        -- одним запросом на оператор, а не на каждую строку
+        CREATE OR REPLACE FUNCTION expenses_update_daily_totals() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE daily_category_totals AS t
+                SET total = t.total - d.total,
+                    count = t.count - d.count
+                FROM (
+                    SELECT user_id, category_id, date::date AS day,
+                           SUM(amount) AS total, COUNT(*) AS count
+                    FROM old_rows
+                    WHERE category_id IS NOT NULL
+                    GROUP BY user_id, category_id, date::date
+                ) AS d
+                WHERE t.user_id = d.user_id AND t.day = d.day AND t.category_id = d.category_id;
+
+                DELETE FROM daily_category_totals AS t
+                USING (SELECT DISTINCT user_id, category_id, date::date AS day FROM old_rows) AS d
+                WHERE t.user_id = d.user_id AND t.day = d.day AND t.category_id = d.category_id
+                  AND t.count <= 0;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO daily_category_totals AS t (user_id, category_id, day, total, count)
+                SELECT user_id, category_id, date::date, SUM(amount), COUNT(*)
+                FROM new_rows
+                WHERE category_id IS NOT NULL
+                GROUP BY user_id, category_id, date::date
+                ON CONFLICT (user_id, day, category_id) DO UPDATE
+                SET total = t.total + EXCLUDED.total,
+                    count = t.count + EXCLUDED.count;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS expenses_daily_totals_insert ON expenses;
+        CREATE TRIGGER expenses_daily_totals_insert
+            AFTER INSERT ON expenses
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION expenses_update_daily_totals();
+
+        DROP TRIGGER IF EXISTS expenses_daily_totals_update ON expenses;
+        CREATE TRIGGER expenses_daily_totals_update
+            AFTER UPDATE ON expenses
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION expenses_update_daily_totals();
+
+        DROP TRIGGER IF EXISTS expenses_daily_totals_delete ON expenses;
+        CREATE TRIGGER expenses_daily_totals_delete
+            AFTER DELETE ON expenses
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION expenses_update_daily_totals();
+
+        -- Заполнение итогов по уже существующим расходам. Создание триггеров выше
+        -- блокирует запись в expenses до конца транзакции, так что итоги согласованы
+        TRUNCATE daily_category_totals;
+        INSERT INTO daily_category_totals (user_id, category_id, day, total, count)
+        SELECT user_id, category_id, date::date, SUM(amount), COUNT(*)
+        FROM expenses
+        WHERE category_id IS NOT NULL
+        GROUP BY user_id, category_id, date::date;
+    """),
+    (4, 'Состояния FSM чатов (bot_states)', """
+        -- Хранилище состояний FSM (см. state_storage.py): переживает перезапуск бота.
+        -- Строки чатов в состоянии по умолчанию удаляются, а простаивающие чаты
+        -- очищаются по updated_at
+        CREATE TABLE IF NOT EXISTS bot_states (
+            chat_id    BIGINT NOT NULL,
+            user_id    BIGINT NOT NULL,
+            state      TEXT,
+            data       JSONB,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (chat_id, user_id)
+        );
+
+        CREATE INDEX IF NOT EXISTS bot_states_updated_at_idx
+            ON bot_states (updated_at);
+    """),
+    (5, 'История запусков фоновых задач (scheduler_jobs)', """
+        -- Последний запуск каждой задачи планировщика (см. scheduler.py): по нему реплики
+        -- понимают, что очередной запуск уже выполнен, а после перезапуска — что он пропущен
+        CREATE TABLE IF NOT EXISTS scheduler_jobs (
+            name             TEXT PRIMARY KEY,
+            last_started_at  TIMESTAMP NOT NULL,
+            last_finished_at TIMESTAMP NOT NULL,
+            last_duration    DOUBLE PRECISION NOT NULL,
+            last_status      TEXT NOT NULL,
+            runs             INTEGER NOT NULL DEFAULT 0,
+            failures         INTEGER NOT NULL DEFAULT 0
+        );
+    """),
+    (6, 'Месячные бюджеты (budgets)', """
+        -- Месячные бюджеты: по категории или общий (category_id IS NULL). Траты месяца
+        -- берутся из daily_category_totals, а alert_month/alert_level хранят последнее
+        -- отправленное предупреждение (80 или 100 процентов), чтобы оно не повторялось
+        -- после перезапуска и не дублировалось репликами. Бюджет удаляется вместе с
+        -- категорией при очистке (см. database/clean_old_categories.py)
+        CREATE TABLE IF NOT EXISTS budgets (
+            id          SERIAL PRIMARY KEY,
+            user_id     INTEGER NOT NULL REFERENCES users (id),
+            category_id INTEGER REFERENCES categories (id) ON DELETE CASCADE,
+            amount      NUMERIC(12, 2) NOT NULL CHECK (amount > 0),
+            alert_month DATE,
+            alert_level SMALLINT NOT NULL DEFAULT 0
+        );
+
+        -- Один бюджет на категорию и один общий на пользователя
+        CREATE UNIQUE INDEX IF NOT EXISTS budgets_user_category_idx
+            ON budgets (user_id, COALESCE(category_id, 0));
+    """),
+    (7, 'Регулярные расходы (recurring_expenses)', """
+        -- Правила регулярных расходов: ежедневно, еженедельно (day — день недели ISO, 1 = понедельник)
+        -- или ежемесячно (day — число месяца; в коротких месяцах — последний день).
+        -- next_date — ближайшая ещё не записанная дата, по ней выбираются правила к запуску
+        CREATE TABLE IF NOT EXISTS recurring_expenses (
+            id          SERIAL PRIMARY KEY,
+            user_id     INTEGER NOT NULL REFERENCES users (id),
+            category_id INTEGER NOT NULL REFERENCES categories (id) ON DELETE CASCADE,
+            amount      NUMERIC(12, 2) NOT NULL CHECK (amount > 0),
+            frequency   TEXT NOT NULL CHECK (frequency IN ('daily', 'weekly', 'monthly')),
+            day         SMALLINT CHECK (
+                (frequency = 'daily' AND day IS NULL)
+                OR (frequency = 'weekly' AND day BETWEEN 1 AND 7)
+                OR (frequency = 'monthly' AND day BETWEEN 1 AND 31)
+            ),
+            next_date   DATE NOT NULL,
+            created_at  TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS recurring_expenses_next_date_idx
+            ON recurring_expenses (next_date);
+
+        CREATE INDEX IF NOT EXISTS recurring_expenses_user_idx
+            ON recurring_expenses (user_id);
+
+        -- Расход, созданный по правилу, помечается правилом и датой, за которую он записан.
+        -- Уникальный ключ делает запись идемпотентной: повторный запуск или другая реплика
+        -- не запишут тот же расход дважды. Удаление правила оставляет записанные расходы
+        ALTER TABLE expenses
+            ADD COLUMN IF NOT EXISTS recurring_id INTEGER REFERENCES recurring_expenses (id) ON DELETE SET NULL,
+            ADD COLUMN IF NOT EXISTS recurring_period DATE;
+
+        CREATE UNIQUE INDEX IF NOT EXISTS expenses_recurring_period_idx
+            ON expenses (recurring_id, recurring_period)
+            WHERE recurring_id IS NOT NULL;
+    """),
+]
+
+
+def _ensure_migrations_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version     INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at  TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def get_applied_versions() -> list[int]:
+    """
+    Возвращает список применённых версий миграций.
+
+    Returns:
+        list[int]: Отсортированный список версий. Пустой список, если миграции ещё не применялись.
+    """
+    with db_connection() as conn, conn.cursor() as cur:
+        _ensure_migrations_table(cur)
+        cur.execute("SELECT version FROM schema_migrations ORDER BY version")
+        versions = [row[0] for row in cur.fetchall()]
+        conn.commit()
+    return versions
+
+
+def apply_migrations() -> bool:
+    """
+    Применяет все ещё не применённые миграции по порядку версий.
+
+    Returns:
+        bool: True, если схема в актуальном состоянии, False в случае ошибки
+              (ошибочная миграция откатывается, последующие не применяются).
+    """
+    try:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                # Блокировка уровня сессии: другие реплики дождутся окончания миграций
+                cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATIONS_LOCK_KEY,))
+                try:
+                    _ensure_migrations_table(cur)
+                    cur.execute("SELECT version FROM schema_migrations")
+                    applied = {row[0] for row in cur.fetchall()}
+                    conn.commit()
+
+                    for version, description, sql in sorted(MIGRATIONS):
+                        if version in applied:
+                            continue
+                        print(f"Применение миграции {version}: {description}")
+                        cur.execute(sql)
+                        cur.execute("""
+                            INSERT INTO schema_migrations (version, description)
+                            VALUES (%s, %s)
+                        """, (version, description))
+                        conn.commit()  # Каждая миграция фиксируется отдельно
+                finally:
+                    conn.rollback()
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATIONS_LOCK_KEY,))
+                    conn.commit()
+        return True
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при применении миграций: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при применении миграций: {e}")
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Миграции схемы базы данных.")
+    parser.add_argument('--status', action='store_true', help='показать применённые и ожидающие миграции')
+    args = parser.parse_args()
+
+    if args.status:
+        applied = set(get_applied_versions())
+        for version, description, _ in sorted(MIGRATIONS):
+            mark = 'x' if version in applied else ' '
+            print(f"[{mark}] {version}: {description}")
+        return
+
+    if not apply_migrations():
+        raise SystemExit(1)
+    print("Схема базы данных актуальна.")
+
+
+if __name__ == '__main__':
+    main()
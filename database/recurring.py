@@ -0,0 +1,291 @@
+import calendar
+import os
+import time
+from datetime import date, datetime, timedelta
+
+import psycopg2
+
+from database.budgets import invalidate_user_budgets
+from database.connection import db_connection
+
+RECURRING_FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+# Параметры записи регулярных расходов (можно переопределить через переменные окружения)
+RECURRING_BATCH_SIZE = int(os.getenv('RECURRING_BATCH_SIZE', 1000))  # правил за одну транзакцию
+RECURRING_MAX_PERIODS = 400  # дат одного правила за запуск (ежедневное правило, пропущенное больше года)
+
+# Расходы по правилам записываются пачками правил: каждая пачка — один INSERT из массивов
+# (unnest) и один UPDATE next_date в одной транзакции, сколько бы пользователей и дат в ней ни было.
+# Уникальный ключ (recurring_id, recurring_period) делает запись идемпотентной: повторный
+# запуск, запуск на другой реплике или сбой между пачками не приводят к двойной записи.
+# SQL-запросы общие с database/aio/recurring.py.
+
+INSERT_RULE_SQL = """
+    INSERT INTO recurring_expenses (user_id, category_id, amount, frequency, day, next_date)
+    SELECT c.user_id, c.id, %s, %s, %s, %s
+    FROM categories AS c
+    WHERE c.id = %s AND c.user_id = %s AND c.is_deleted = FALSE
+    RETURNING id
+"""
+
+SELECT_USER_RULES_SQL = """
+    SELECT r.id, c.name, r.amount, r.frequency, r.day, r.next_date
+    FROM recurring_expenses AS r
+    JOIN categories AS c ON c.id = r.category_id
+    WHERE r.user_id = %s AND c.is_deleted = FALSE
+    ORDER BY r.id
+"""
+
+DELETE_RULE_SQL = """
+    DELETE FROM recurring_expenses
+    WHERE id = %s AND user_id = %s
+"""
+
+# Правила, которым пора записать расход (next_date наступила); правила удалённых
+# категорий пропускаются. Пачки выбираются по возрастанию id (keyset), фильтр по
+# пользователю нужен для записи сразу после создания правила
+SELECT_DUE_RULES_SQL = """
+    SELECT r.id, r.frequency, r.day, r.next_date
+    FROM recurring_expenses AS r
+    JOIN categories AS c ON c.id = r.category_id
+    WHERE r.next_date <= %s AND r.id > %s
+      AND (%s::int IS NULL OR r.user_id = %s)
+      AND c.is_deleted = FALSE
+    ORDER BY r.id
+    LIMIT %s
+"""
+
+# Расходы пачки: пары (правило, дата) из массивов. Уже записанные пары пропускаются
+INSERT_RECURRING_EXPENSES_SQL = """
+    INSERT INTO expenses (user_id, category_id, amount, date, recurring_id, recurring_period)
+    SELECT r.user_id, r.category_id, r.amount, v.period, r.id, v.period
+    FROM unnest(%s::int[], %s::date[]) AS v (rule_id, period)
+    JOIN recurring_expenses AS r ON r.id = v.rule_id
+    ON CONFLICT (recurring_id, recurring_period) WHERE recurring_id IS NOT NULL DO NOTHING
+    RETURNING user_id
+"""
+
+# next_date только растёт, поэтому запоздавший параллельный запуск не вернёт её назад
+ADVANCE_RULES_SQL = """
+    UPDATE recurring_expenses AS r
+    SET next_date = v.next_date
+    FROM unnest(%s::int[], %s::date[]) AS v (id, next_date)
+    WHERE r.id = v.id AND r.next_date < v.next_date
+"""
+
+
+def _monthly_date(year: int, month: int, day: int) -> date:
+    """Число месяца day, а в коротких месяцах — последний день месяца."""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def first_occurrence(frequency: str, day: int | None, start: date) -> date:
+    """
+    Возвращает первую дату правила, не раньше start.
+
+    Args:
+        frequency (str): 'daily', 'weekly' или 'monthly'.
+        day (int | None): День недели ISO (1 — понедельник) или число месяца; None для ежедневных.
+        start (date): Дата, с которой действует правило.
+    """
+    if frequency == 'daily':
+        return start
+    if frequency == 'weekly':
+        return start + timedelta(days=(day - start.isoweekday()) % 7)
+    candidate = _monthly_date(start.year, start.month, day)
+    return candidate if candidate >= start else next_occurrence(frequency, day, candidate)
+
+
+def next_occurrence(frequency: str, day: int | None, current: date) -> date:
+    """Возвращает дату правила, следующую за current (параметры см. first_occurrence)."""
+    if frequency == 'daily':
+        return current + timedelta(days=1)
+    if frequency == 'weekly':
+        return current + timedelta(weeks=1)
+    year, month = divmod(current.month, 12)
+    return _monthly_date(current.year + year, month + 1, day)
+
+
+def materialization_batch(due_rules: list, today: date) -> tuple[list, list, list, list]:
+    """
+    Вычисляет даты расходов для пачки правил: от next_date до today включительно
+    (не больше RECURRING_MAX_PERIODS на правило) и новые next_date.
+
+    Args:
+        due_rules (list): Строки SELECT_DUE_RULES_SQL (id, frequency, day, next_date).
+        today (date): Дата запуска.
+
+    Returns:
+        tuple[list, list, list, list]: Массивы для INSERT_RECURRING_EXPENSES_SQL (ID правил и даты)
+                                       и для ADVANCE_RULES_SQL (ID правил и новые next_date).
+    """
+    rule_ids, periods, next_dates = [], [], []
+    for rule_id, frequency, day, period in due_rules:
+        for _ in range(RECURRING_MAX_PERIODS):
+            if period > today:
+                break
+            rule_ids.append(rule_id)
+            periods.append(period)
+            period = next_occurrence(frequency, day, period)
+        next_dates.append(period)
+    return rule_ids, periods, [row[0] for row in due_rules], next_dates
+
+
+def recurring_report(rules: int, expenses: int, chunks: int, started: float) -> dict:
+    """
+    Формирует и печатает итоги запуска записи регулярных расходов.
+
+    Returns:
+        dict: Словарь с ключами 'rules', 'expenses', 'chunks' и 'seconds'.
+    """
+    report = {
+        'rules': rules,
+        'expenses': expenses,
+        'chunks': chunks,
+        'seconds': round(time.monotonic() - started, 3),
+    }
+    print(f"[{datetime.now()}] Запись регулярных расходов: {report}")
+    return report
+
+
+def materialize_recurring_expenses(today: date | None = None, user_id: int | None = None) -> dict | None:
+    """
+    Записывает расходы по регулярным правилам, дата которых наступила (включая пропущенные даты).
+
+    Правила обрабатываются пачками по RECURRING_BATCH_SIZE, каждая пачка фиксируется
+    отдельно: после сбоя следующий запуск продолжит с правил, у которых next_date не сдвинулась.
+
+    Эта функция предназначена для запуска по расписанию (см. main.py).
+
+    Args:
+        today (date | None): Дата, по которую записываются расходы (по умолчанию — сегодня).
+        user_id (int | None): Только правила этого пользователя (по умолчанию — все).
+
+    Returns:
+        dict | None: Итоги запуска (см. recurring_report) или None в случае ошибки.
+                     Уже записанные пачки при ошибке не откатываются.
+    """
+    today = today or date.today()
+    started = time.monotonic()
+    rules = expenses = chunks = 0
+    users = set()
+    last_id = 0
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            while True:
+                cur.execute(SELECT_DUE_RULES_SQL, (today, last_id, user_id, user_id, RECURRING_BATCH_SIZE))
+                due_rules = cur.fetchall()
+                if not due_rules:
+                    break
+                rule_ids, periods, advance_ids, next_dates = materialization_batch(due_rules, today)
+                cur.execute(INSERT_RECURRING_EXPENSES_SQL, (rule_ids, periods))
+                written = cur.fetchall()
+                cur.execute(ADVANCE_RULES_SQL, (advance_ids, next_dates))
+                conn.commit()
+
+                chunks += 1
+                rules += len(due_rules)
+                expenses += len(written)
+                users.update(row[0] for row in written)
+                last_id = due_rules[-1][0]
+                if len(due_rules) < RECURRING_BATCH_SIZE:
+                    break
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при записи регулярных расходов (записано: {expenses}): {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при записи регулярных расходов: {e}")
+        return None
+    finally:
+        for user in users:
+            invalidate_user_budgets(user)  # Траты месяца будут перечитаны из дневных итогов
+
+    return recurring_report(rules, expenses, chunks, started)
+
+
+def create_recurring_expense(user_id: int, category_id: int, amount: float, frequency: str,
+                             day: int | None, start: date | None = None) -> int | None:
+    """
+    Создаёт правило регулярного расхода.
+
+    Args:
+        user_id (int): ID пользователя.
+        category_id (int): ID категории (должна принадлежать пользователю и не быть удалённой).
+        amount (float): Сумма расхода.
+        frequency (str): 'daily', 'weekly' или 'monthly'.
+        day (int | None): День недели ISO или число месяца; None для ежедневных.
+        start (date | None): Дата, с которой действует правило (по умолчанию — сегодня).
+
+    Returns:
+        int | None: ID правила или None в случае ошибки (в том числе если категория недоступна).
+    """
+    next_date = first_occurrence(frequency, day, start or date.today())
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(INSERT_RULE_SQL, (amount, frequency, day, next_date, category_id, user_id))
+            row = cur.fetchone()
+            conn.commit()
+            return row[0] if row else None
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при создании регулярного расхода: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при создании регулярного расхода: {e}")
+        return None
+
+
+def rules_from_rows(rows) -> list[dict]:
+    """Преобразует строки SELECT_USER_RULES_SQL в словари."""
+    return [
+        {'id': rule_id, 'category': name, 'amount': float(amount),
+         'frequency': frequency, 'day': day, 'next_date': next_date}
+        for rule_id, name, amount, frequency, day, next_date in rows
+    ]
+
+
+def get_recurring_expenses(user_id: int) -> list[dict] | None:
+    """
+    Возвращает правила регулярных расходов пользователя.
+
+    Args:
+        user_id (int): ID пользователя.
+
+    Returns:
+        list[dict] | None: Словари {'id', 'category', 'amount', 'frequency', 'day', 'next_date'}
+                           или None в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(SELECT_USER_RULES_SQL, (user_id,))
+            return rules_from_rows(cur.fetchall())
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при получении регулярных расходов: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при получении регулярных расходов: {e}")
+        return None
+
+
+def delete_recurring_expense(user_id: int, rule_id: int) -> bool | None:
+    """
+    Удаляет правило регулярного расхода; уже записанные по нему расходы остаются.
+
+    Args:
+        user_id (int): ID пользователя.
+        rule_id (int): ID правила.
+
+    Returns:
+        bool | None: True, если правило удалено, False, если его нет, None в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(DELETE_RULE_SQL, (rule_id, user_id))
+            deleted = cur.rowcount > 0
+            conn.commit()
+            return deleted
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при удалении регулярного расхода: {e}")
+        return None
+    except Exception as e:
+        print(f"Неизвестная ошибка при удалении регулярного расхода: {e}")
+        return None
@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+import psycopg2
+
+from cache import MISSING
+from database.connection import db_connection
+
+# Класс advisory-блокировок задач планировщика: ключ блокировки — (класс, hashtext(имя задачи))
+SCHEDULER_LOCK_CLASS = 7_480_002
+
+SELECT_LAST_RUN_SQL = """
+    SELECT last_started_at FROM scheduler_jobs
+    WHERE name = %s
+"""
+
+RECORD_RUN_SQL = """
+    INSERT INTO scheduler_jobs AS j
+        (name, last_started_at, last_finished_at, last_duration, last_status, runs, failures)
+    VALUES (%s, %s, NOW(), %s, %s, 1, %s)
+    ON CONFLICT (name) DO UPDATE
+    SET last_started_at = EXCLUDED.last_started_at,
+        last_finished_at = EXCLUDED.last_finished_at,
+        last_duration = EXCLUDED.last_duration,
+        last_status = EXCLUDED.last_status,
+        runs = j.runs + 1,
+        failures = j.failures + EXCLUDED.failures
+"""
+
+
+@contextmanager
+def job_lock(name: str):
+    """
+    Пытается захватить advisory-блокировку задачи, не дожидаясь её освобождения.
+    Блокировка уровня сессии удерживается на выделенном соединении до выхода из блока,
+    поэтому задачу выполняет только одна реплика. Если соединение оборвётся,
+    PostgreSQL снимет блокировку сам.
+
+    Пример:
+        with job_lock('cleanup') as acquired:
+            if acquired:
+                ...
+
+    Raises:
+        psycopg2.Error: Если соединиться с БД не удалось.
+    """
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_lock(%s, hashtext(%s))", (SCHEDULER_LOCK_CLASS, name))
+            acquired = cur.fetchone()[0]
+        conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_unlock(%s, hashtext(%s))", (SCHEDULER_LOCK_CLASS, name))
+                conn.commit()
+
+
+def get_last_run(name: str):
+    """
+    Возвращает время начала последнего запуска задачи.
+
+    Args:
+        name (str): Имя задачи.
+
+    Returns:
+        datetime | None: Время начала или None, если задача ещё не запускалась.
+                         MISSING в случае ошибки БД.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(SELECT_LAST_RUN_SQL, (name,))
+            row = cur.fetchone()
+            return row[0] if row else None
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при чтении истории задачи {name}: {e}")
+        return MISSING
+    except Exception as e:
+        print(f"Неизвестная ошибка при чтении истории задачи {name}: {e}")
+        return MISSING
+
+
+def record_run(name: str, started_at: datetime, duration: float, succeeded: bool) -> bool:
+    """
+    Сохраняет итоги запуска задачи.
+
+    Args:
+        name (str): Имя задачи.
+        started_at (datetime): Время начала запуска.
+        duration (float): Длительность в секундах.
+        succeeded (bool): Завершилась ли задача без исключения.
+
+    Returns:
+        bool: True, если запись сохранена, False в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(RECORD_RUN_SQL, (name, started_at, duration,
+                                         'ok' if succeeded else 'error', 0 if succeeded else 1))
+            conn.commit()
+            return True
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при сохранении истории задачи {name}: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при сохранении истории задачи {name}: {e}")
+        return False
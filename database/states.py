@@ -0,0 +1,135 @@
+import json
+import sys
+
+import psycopg2
+
+from cache import MISSING
+from database.connection import db_connection
+
+# Хранение состояний FSM в таблице bot_states (бэкенд для state_storage.CompactStateStorage).
+# Запись — пара (state, data): имя состояния и словарь данных сценария (или None).
+# SQL-запросы общие с асинхронной реализацией (database/aio/states.py).
+
+SELECT_STATE_SQL = """
+    SELECT state, data FROM bot_states
+    WHERE chat_id = %s AND user_id = %s
+"""
+
+# Данные передаются JSON-строкой с приведением к JSONB: так запрос одинаково
+# работает с psycopg2 и psycopg 3, а при чтении оба драйвера возвращают dict
+UPSERT_STATE_SQL = """
+    INSERT INTO bot_states (chat_id, user_id, state, data, updated_at)
+    VALUES (%s, %s, %s, %s::jsonb, NOW())
+    ON CONFLICT (chat_id, user_id) DO UPDATE
+    SET state = EXCLUDED.state,
+        data = EXCLUDED.data,
+        updated_at = NOW()
+"""
+
+DELETE_STATE_SQL = """
+    DELETE FROM bot_states
+    WHERE chat_id = %s AND user_id = %s
+"""
+
+PURGE_IDLE_STATES_SQL = """
+    DELETE FROM bot_states
+    WHERE updated_at < NOW() - make_interval(secs => %s)
+"""
+
+
+def entry_from_row(row) -> tuple | None:
+    """Преобразует строку (state, data) таблицы bot_states в запись хранилища."""
+    if row is None:
+        return None
+    state, data = row
+    # Имён состояний немного: интернирование не даёт хранить копию строки на каждый чат
+    return (sys.intern(state) if state is not None else None), (data or None)
+
+
+def dump_data(data: dict | None) -> str | None:
+    """Сериализует данные сценария для UPSERT_STATE_SQL."""
+    return json.dumps(data) if data else None
+
+
+def load_state(chat_id: int, user_id: int):
+    """
+    Загружает запись состояния чата.
+
+    Args:
+        chat_id (int): ID чата.
+        user_id (int): ID пользователя.
+
+    Returns:
+        tuple | None: Пара (state, data) или None, если записи нет.
+                      MISSING в случае ошибки БД (результат не должен кэшироваться).
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(SELECT_STATE_SQL, (chat_id, user_id))
+            return entry_from_row(cur.fetchone())
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при чтении состояния чата: {e}")
+        return MISSING
+    except Exception as e:
+        print(f"Неизвестная ошибка при чтении состояния чата: {e}")
+        return MISSING
+
+
+def save_state(chat_id: int, user_id: int, state: str | None, data: dict | None) -> bool:
+    """
+    Сохраняет (вставляет или обновляет) запись состояния чата.
+
+    Returns:
+        bool: True, если запись сохранена, False в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(UPSERT_STATE_SQL, (chat_id, user_id, state, dump_data(data)))
+            conn.commit()
+            return True
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при сохранении состояния чата: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при сохранении состояния чата: {e}")
+        return False
+
+
+def delete_state(chat_id: int, user_id: int) -> bool:
+    """
+    Удаляет запись состояния чата.
+
+    Returns:
+        bool: True, если запрос выполнен, False в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(DELETE_STATE_SQL, (chat_id, user_id))
+            conn.commit()
+            return True
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при удалении состояния чата: {e}")
+        return False
+    except Exception as e:
+        print(f"Неизвестная ошибка при удалении состояния чата: {e}")
+        return False
+
+
+def purge_idle_states(idle_seconds: float) -> int:
+    """
+    Удаляет состояния чатов, не менявшиеся дольше `idle_seconds` секунд.
+
+    Returns:
+        int: Количество удалённых записей (0 в случае ошибки).
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(PURGE_IDLE_STATES_SQL, (idle_seconds,))
+            conn.commit()
+            return cur.rowcount
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при очистке состояний чатов: {e}")
+        return 0
+    except Exception as e:
+        print(f"Неизвестная ошибка при очистке состояний чатов: {e}")
+        return 0
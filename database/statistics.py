@@ -1,6 +1,71 @@
 import psycopg2
 
-from database.connection import connect_db
+from database.connection import db_connection
+
+# Запросы статистики читают дневные итоги daily_category_totals (см. database/migrations.py),
+# поэтому их стоимость зависит от числа дней и категорий, а не от числа расходов.
+# Границы периода учитываются с точностью до дня: оба дня входят в период.
+# SQL-запросы и разбор их результатов общие с асинхронной реализацией (database/aio/statistics.py).
+
+TOTAL_EXPENSES_SQL = """
+    SELECT SUM(total) FROM daily_category_totals
+    WHERE user_id = %s AND day >= %s::date AND day <= %s::date
+"""
+
+# JOIN связывает итоги с информацией о категориях (имя, статус удаления).
+# Группировка по имени и статусу is_deleted позволяет получить суммы для каждой уникальной
+# комбинации категории и ее статуса.
+EXPENSES_BY_CATEGORY_SQL = """
+    SELECT c.name, SUM(d.total), c.is_deleted
+    FROM daily_category_totals d
+    JOIN categories c ON d.category_id = c.id
+    WHERE d.user_id = %s AND d.day >= %s::date AND d.day <= %s::date
+    GROUP BY c.name, c.is_deleted
+    ORDER BY SUM(d.total) DESC; -- Сортировка по убыванию суммы
+"""
+
+# GROUPING SETS ((c.name, c.is_deleted), ()) возвращает суммы по категориям
+# и одну итоговую строку (is_total = 1) за один проход по дневным итогам.
+FULL_STATISTICS_SQL = """
+    SELECT c.name, SUM(d.total), c.is_deleted,
+           GROUPING(c.name, c.is_deleted) AS is_total
+    FROM daily_category_totals d
+    JOIN categories c ON d.category_id = c.id
+    WHERE d.user_id = %s AND d.day >= %s::date AND d.day <= %s::date
+    GROUP BY GROUPING SETS ((c.name, c.is_deleted), ())
+    ORDER BY is_total, SUM(d.total) DESC; -- Сортировка по убыванию суммы
+"""
+
+# Сравнение двух периодов (например, этот месяц и прошлый) одним проходом по дневным итогам:
+# строки обоих периодов читаются одним запросом, а суммы каждого периода считаются
+# условной агрегацией (FILTER). GROUPING SETS добавляет итоговую строку (is_total = 1).
+# Параметры — см. comparison_params.
+COMPARISON_STATISTICS_SQL = """
+    SELECT c.name, c.is_deleted,
+           SUM(d.total) FILTER (WHERE d.day >= %s::date AND d.day <= %s::date) AS current_total,
+           SUM(d.total) FILTER (WHERE d.day >= %s::date AND d.day <= %s::date) AS previous_total,
+           GROUPING(c.name, c.is_deleted) AS is_total
+    FROM daily_category_totals d
+    JOIN categories c ON d.category_id = c.id
+    WHERE d.user_id = %s
+      AND ((d.day >= %s::date AND d.day <= %s::date) OR (d.day >= %s::date AND d.day <= %s::date))
+    GROUP BY GROUPING SETS ((c.name, c.is_deleted), ())
+    ORDER BY is_total, current_total DESC NULLS LAST, previous_total DESC;
+"""
+
+# Дневные итоги периода для прогноза: по строке на категорию с номерами дней (от начала
+# периода) и суммами, упакованными в bytea (int4/float8 в сетевом порядке байт).
+# Драйвер не создаёт объект Python на каждый день, а NumPy читает буферы без копирования
+# (np.frombuffer в forecast.daily_matrix)
+DAILY_TOTALS_SQL = """
+    SELECT c.name, c.is_deleted,
+           string_agg(int4send(d.day - %s::date), ''::bytea ORDER BY d.day),
+           string_agg(float8send(d.total::float8), ''::bytea ORDER BY d.day)
+    FROM daily_category_totals d
+    JOIN categories c ON d.category_id = c.id
+    WHERE d.user_id = %s AND d.day >= %s::date AND d.day <= %s::date
+    GROUP BY c.id, c.name, c.is_deleted
+"""
 
 
 def statistics_for_week_or_month(user_id: int, start_date: str, end_date: str):
@@ -16,22 +81,11 @@ def statistics_for_week_or_month(user_id: int, start_date: str, end_date: str):
         float: Общая сумма расходов за период. Возвращает 0.0 в случае отсутствия расходов,
                ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return 0.0
-
     try:
-        with conn.cursor() as cur:
-            # SQL-запрос для суммирования расходов пользователя за период
-            cur.execute("""
-                SELECT SUM(amount) FROM expenses
-                WHERE user_id = %s AND date >= %s AND date < %s
-            """, (user_id, start_date, end_date))
-            res = cur.fetchone()
-            if res and res[0] is not None:
-                return float(res[0])
-            return 0.0
+        with db_connection() as conn, conn.cursor() as cur:
+            # SQL-запрос для суммирования дневных итогов пользователя за период
+            cur.execute(TOTAL_EXPENSES_SQL, (user_id, start_date, end_date))
+            return total_from_row(cur.fetchone())
 
     except psycopg2.Error as e:
         print(f"Ошибка БД при подсчёте общей статистики: {e}")
@@ -39,9 +93,6 @@ def statistics_for_week_or_month(user_id: int, start_date: str, end_date: str):
     except Exception as e:
         print(f"Неизвестная ошибка при подсчёте общей статистики: {e}")
         return 0.0
-    finally:
-        if conn:
-            conn.close()
 
 
 def statistics_by_category(user_id: int, start_date: str, end_date: str):
@@ -60,37 +111,11 @@ def statistics_by_category(user_id: int, start_date: str, end_date: str):
                     Пример: [{'name': 'Еда', 'amount': 150.0, 'is_deleted': False}].
                     Возвращает пустой список в случае ошибки или отсутствия данных.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return []
-
     try:
-        with conn.cursor() as cur:
-            # SQL-запрос для получения сумм расходов по категориям.
-            # Используется JOIN для связывания расходов с информацией о категориях (имя, статус удаления).
-            # Группировка по имени и статусу is_deleted позволяет получить суммы для каждой уникальной
-            # комбинации категории и ее статуса.
-            cur.execute("""
-                SELECT c.name, SUM(e.amount), c.is_deleted
-                FROM expenses e
-                JOIN categories c ON e.category_id = c.id
-                WHERE e.user_id = %s AND e.date >= %s AND e.date < %s
-                GROUP BY c.name, c.is_deleted
-                ORDER BY SUM(e.amount) DESC; -- Сортировка по убыванию суммы
-            """, (user_id, start_date, end_date))
-            res = cur.fetchall()
-
-            category_and_amount = []
-            for row in res:
-                category_name, total_amount, is_deleted = row
-                category_and_amount.append({
-                    'name': category_name,
-                    'amount': total_amount if total_amount is not None else 0.0,
-                    'is_deleted': is_deleted
-                })
-
-        return category_and_amount
+        with db_connection() as conn, conn.cursor() as cur:
+            # SQL-запрос для получения сумм расходов по категориям из дневных итогов
+            cur.execute(EXPENSES_BY_CATEGORY_SQL, (user_id, start_date, end_date))
+            return [category_amount_from_row(*row) for row in cur.fetchall()]
 
     except psycopg2.Error as e:
         print(f"Ошибка БД при подсчёте статистики по категориям: {e}")
@@ -98,9 +123,6 @@ def statistics_by_category(user_id: int, start_date: str, end_date: str):
     except Exception as e:
         print(f"Неизвестная ошибка при подсчёте статистики по категориям: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
 
 def full_statistics(user_id: int, start_date: str, end_date: str) -> dict:
@@ -108,6 +130,11 @@ def full_statistics(user_id: int, start_date: str, end_date: str) -> dict:
     Собирает полную статистику расходов пользователя за указанный период,
     включая общую сумму и разбиение по категориям.
 
+    Выполняет один запрос на одном соединении: суммы по категориям берутся из
+    группировки, а общая сумма — из итоговой строки GROUPING SETS, так что дневные
+    итоги периода читаются один раз. Результат совпадает с последовательным вызовом
+    statistics_for_week_or_month и statistics_by_category.
+
     Args:
         user_id (int): ID пользователя.
         start_date (str): Начальная дата периода в формате 'YYYY-MM-DD'.
@@ -117,11 +144,176 @@ def full_statistics(user_id: int, start_date: str, end_date: str) -> dict:
         dict: Словарь с полной статистикой:
               - 'total_expenses' (float): Общая сумма расходов.
               - 'expenses_by_category' (list[dict]): Список расходов по категориям.
+              Возвращает {'total_expenses': 0.0, 'expenses_by_category': []} в случае ошибки.
     """
-    total_expenses = statistics_for_week_or_month(user_id, start_date, end_date)
-    expenses_by_category = statistics_by_category(user_id, start_date, end_date)
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(FULL_STATISTICS_SQL, (user_id, start_date, end_date))
+            return full_statistics_from_rows(cur.fetchall())
+
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при подсчёте полной статистики: {e}")
+        return {'total_expenses': 0.0, 'expenses_by_category': []}
+    except Exception as e:
+        print(f"Неизвестная ошибка при подсчёте полной статистики: {e}")
+        return {'total_expenses': 0.0, 'expenses_by_category': []}
+
+
+def comparison_statistics(user_id: int, current: dict, previous: dict) -> dict:
+    """
+    Сравнивает расходы пользователя за два периода: суммы по категориям,
+    изменения в рублях и процентах. Оба периода считаются одним запросом.
+
+    Args:
+        user_id (int): ID пользователя.
+        current (dict): Текущий период {'start_date', 'end_date'} (см. time_interval).
+        previous (dict): Период, с которым сравнивается текущий.
+
+    Returns:
+        dict: Словарь со сравнением (см. comparison_from_rows).
+              Возвращает сравнение без категорий с нулевыми суммами в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(COMPARISON_STATISTICS_SQL, comparison_params(user_id, current, previous))
+            return comparison_from_rows(cur.fetchall())
+
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при сравнении периодов: {e}")
+        return comparison_from_rows([])
+    except Exception as e:
+        print(f"Неизвестная ошибка при сравнении периодов: {e}")
+        return comparison_from_rows([])
+
+
+def daily_totals(user_id: int, interval: dict) -> dict:
+    """
+    Загружает дневные итоги пользователя за период для прогноза трат.
+
+    Args:
+        user_id (int): ID пользователя.
+        interval (dict): Период {'start_date', 'end_date'} (см. time_interval.forecast_interval).
+
+    Returns:
+        dict: Словарь для forecast.build_forecast (см. daily_totals_from_rows).
+              Возвращает данные без категорий в случае ошибки.
+    """
+    try:
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(DAILY_TOTALS_SQL, daily_totals_params(user_id, interval))
+            return daily_totals_from_rows(interval, cur.fetchall())
+
+    except psycopg2.Error as e:
+        print(f"Ошибка БД при загрузке дневных итогов: {e}")
+        return daily_totals_from_rows(interval, [])
+    except Exception as e:
+        print(f"Неизвестная ошибка при загрузке дневных итогов: {e}")
+        return daily_totals_from_rows(interval, [])
+
+
+def total_from_row(row) -> float:
+    """Преобразует строку запроса TOTAL_EXPENSES_SQL в сумму (0.0, если расходов нет)."""
+    if row and row[0] is not None:
+        return float(row[0])
+    return 0.0
+
+
+def category_amount_from_row(category_name: str, total_amount, is_deleted: bool) -> dict:
+    """Преобразует строку суммы по категории в словарь {'name', 'amount', 'is_deleted'}."""
+    return {
+        'name': category_name,
+        'amount': total_amount if total_amount is not None else 0.0,
+        'is_deleted': is_deleted
+    }
+
+
+def full_statistics_from_rows(rows) -> dict:
+    """
+    Разбирает строки запроса FULL_STATISTICS_SQL: итоговая строка (is_total = 1)
+    даёт общую сумму, остальные — суммы по категориям.
+
+    Returns:
+        dict: Словарь с ключами 'total_expenses' и 'expenses_by_category' (см. full_statistics).
+    """
+    total_expenses = 0.0
+    expenses_by_category = []
+    for category_name, total_amount, is_deleted, is_total in rows:
+        if is_total:
+            total_expenses = total_from_row((total_amount,))
+        else:
+            expenses_by_category.append(category_amount_from_row(category_name, total_amount, is_deleted))
 
     return {
         'total_expenses': total_expenses,
         'expenses_by_category': expenses_by_category
     }
+
+
+def comparison_params(user_id: int, current: dict, previous: dict) -> tuple:
+    """Возвращает параметры запроса COMPARISON_STATISTICS_SQL."""
+    current_range = (current['start_date'], current['end_date'])
+    previous_range = (previous['start_date'], previous['end_date'])
+    return (*current_range, *previous_range, user_id, *current_range, *previous_range)
+
+
+def percent_change(current: float, previous: float) -> float | None:
+    """Изменение в процентах относительно предыдущего периода (None, если тогда расходов не было)."""
+    if previous == 0:
+        return None
+    return round((current - previous) / previous * 100, 1)
+
+
+def comparison_from_rows(rows) -> dict:
+    """
+    Разбирает строки запроса COMPARISON_STATISTICS_SQL.
+
+    Returns:
+        dict: Словарь со сравнением:
+              - 'current_total', 'previous_total' (float): Общие суммы периодов.
+              - 'change' (float | None): Изменение общей суммы в процентах.
+              - 'categories' (list[dict]): Категории {'name', 'is_deleted', 'current', 'previous',
+                'delta', 'change'}, отсортированные по убыванию суммы текущего периода.
+    """
+    comparison = {'current_total': 0.0, 'previous_total': 0.0, 'change': None, 'categories': []}
+    for category_name, is_deleted, current_total, previous_total, is_total in rows:
+        current, previous = total_from_row((current_total,)), total_from_row((previous_total,))
+        if is_total:
+            comparison.update(current_total=current, previous_total=previous,
+                              change=percent_change(current, previous))
+        else:
+            comparison['categories'].append({
+                'name': category_name,
+                'is_deleted': is_deleted,
+                'current': current,
+                'previous': previous,
+                'delta': round(current - previous, 2),
+                'change': percent_change(current, previous),
+            })
+    return comparison
+
+
+def daily_totals_params(user_id: int, interval: dict) -> tuple:
+    """Возвращает параметры запроса DAILY_TOTALS_SQL."""
+    return interval['start_date'], user_id, interval['start_date'], interval['end_date']
+
+
+def daily_totals_from_rows(interval: dict, rows) -> dict:
+    """
+    Разбирает строки запроса DAILY_TOTALS_SQL.
+
+    Returns:
+        dict: Словарь с ключами:
+              - 'start_date', 'end_date' (date): Первый и последний день периода.
+              - 'categories' (list[dict]): Категории {'name', 'is_deleted', 'days', 'totals'}, где
+                'days' — номера дней от начала периода (bytes, int4 big-endian), 'totals' — суммы
+                за эти дни (bytes, float8 big-endian).
+    """
+    # psycopg2 возвращает bytea как memoryview, который нельзя передать в процесс рендеринга
+    return {
+        'start_date': interval['start_date'].date(),
+        'end_date': interval['end_date'].date(),
+        'categories': [
+            {'name': name, 'is_deleted': is_deleted, 'days': bytes(days), 'totals': bytes(totals)}
+            for name, is_deleted, days, totals in rows
+        ],
+    }
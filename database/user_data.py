@@ -1,55 +1,90 @@
 import psycopg2
 
-from database.connection import connect_db
-
-
-def add_or_update_user(telegram_id: int, username: str | None, first_name: str | None, last_name: str | None) -> None:
+from cache import MISSING, TTLCache
+from database.connection import db_connection
+
+# Кэш соответствия telegram_id -> внутренний ID пользователя.
+# Соответствие не меняется после создания пользователя, поэтому TTL большой.
+# Отсутствующие пользователи кэшируются как None на короткое время, чтобы
+# повторные сообщения до /start не ходили в БД; /start перезаписывает запись.
+USER_ID_CACHE_SIZE = 50_000
+USER_ID_CACHE_TTL = 6 * 60 * 60
+USER_ID_NEGATIVE_CACHE_TTL = 60
+
+user_id_cache = TTLCache(maxsize=USER_ID_CACHE_SIZE, ttl=USER_ID_CACHE_TTL)
+
+# Кэш списков активных категорий пользователей (user_id -> list[dict]).
+# Сбрасывается функциями из database/category.py при создании, переименовании
+# и удалении категорий; TTL ограничивает устаревание при нескольких репликах.
+CATEGORIES_CACHE_SIZE = 10_000
+CATEGORIES_CACHE_TTL = 10 * 60
+
+categories_cache = TTLCache(maxsize=CATEGORIES_CACHE_SIZE, ttl=CATEGORIES_CACHE_TTL)
+
+# SQL-запросы модуля общие для синхронной и асинхронной (database/aio) реализаций:
+# оба драйвера (psycopg2 и psycopg 3) используют плейсхолдеры %s.
+
+# ON CONFLICT (telegram_id) DO UPDATE SET ...:
+# Если запись с таким telegram_id уже существует, она будет обновлена
+# значениями из EXCLUDED (новыми значениями, которые пытались вставить).
+UPSERT_USER_SQL = """
+    INSERT INTO users (telegram_id, username, first_name, last_name)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (telegram_id) DO UPDATE
+    SET username = EXCLUDED.username,
+        first_name = EXCLUDED.first_name,
+        last_name = EXCLUDED.last_name
+    RETURNING id;
+"""
+
+SELECT_USER_ID_SQL = """
+    SELECT id FROM users
+    WHERE telegram_id = %s
+"""
+
+SELECT_USER_CATEGORIES_SQL = """
+    SELECT id, name FROM categories
+    WHERE user_id = %s AND is_deleted = FALSE
+"""
+
+
+def add_or_update_user(telegram_id: int, username: str | None, first_name: str | None,
+                       last_name: str | None) -> int | None:
     """
     Добавляет нового пользователя в базу данных или обновляет существующего,
-    если пользователь с таким telegram_id уже есть.
+    если пользователь с таким telegram_id уже есть. Заносит внутренний ID пользователя в кэш.
 
     Args:
         telegram_id (int): Уникальный Telegram ID пользователя.
         username (str | None): Юзернейм пользователя в Telegram. Может быть None.
         first_name (str | None): Имя пользователя в Telegram. Может быть None.
         last_name (str | None): Фамилия пользователя в Telegram. Может быть None.
-    """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return
 
+    Returns:
+        int | None: Внутренний ID пользователя или None в случае ошибки БД.
+    """
     try:
-        with conn.cursor() as cur:
-            # SQL-запрос для вставки или обновления пользователя.
-            # ON CONFLICT (telegram_id) DO UPDATE SET ...:
-            # Если запись с таким telegram_id уже существует, она будет обновлена
-            # значениями из EXCLUDED (новыми значениями, которые пытались вставить).
-            cur.execute("""
-            INSERT INTO users (telegram_id, username, first_name, last_name)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (telegram_id) DO UPDATE
-            SET username = EXCLUDED.username,
-                first_name = EXCLUDED.first_name,
-                last_name = EXCLUDED.last_name;
-            """, (telegram_id, username, first_name, last_name))
+        with db_connection() as conn, conn.cursor() as cur:
+            # SQL-запрос для вставки или обновления пользователя
+            cur.execute(UPSERT_USER_SQL, (telegram_id, username, first_name, last_name))
+            user_id = cur.fetchone()[0]
             conn.commit()  # Фиксация изменений в базе данных
+    # При ошибке транзакция откатывается контекстным менеджером db_connection
     except psycopg2.Error as e:
         print(f"Ошибка БД при добавлении/обновлении пользователя: {e}")
-        if conn:
-            conn.rollback()  # Откат транзакции
+        return None
     except Exception as e:
         print(f"Неизвестная ошибка при добавлении/обновлении пользователя: {e}")
-        if conn:
-            conn.rollback()
-    finally:
-        if conn:
-            conn.close()
+        return None
+
+    user_id_cache.set(telegram_id, user_id)
+    return user_id
 
 
 def find_user_id_by_telegram_id(telegram_id: int) -> int | None:
     """
-    Находит внутренний ID пользователя в базе данных по его Telegram ID.
+    Находит внутренний ID пользователя по его Telegram ID.
+    Сначала ищет в кэше user_id_cache и обращается к БД только при промахе.
 
     Args:
         telegram_id (int): Telegram ID пользователя.
@@ -58,18 +93,14 @@ def find_user_id_by_telegram_id(telegram_id: int) -> int | None:
         int | None: Внутренний ID пользователя, если найден, иначе None.
                     Возвращает None также в случае ошибки подключения к БД или выполнения запроса.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return None
+    cached = user_id_cache.get(telegram_id)
+    if cached is not MISSING:
+        return cached
 
     user_id = None
     try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id FROM users
-                WHERE telegram_id = %s
-            """, (telegram_id,))
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(SELECT_USER_ID_SQL, (telegram_id,))
 
             result = cur.fetchone()
             if result:
@@ -80,16 +111,42 @@ def find_user_id_by_telegram_id(telegram_id: int) -> int | None:
     except Exception as e:
         print(f"Неизвестная ошибка при поиске пользователя по telegram_id: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+    remember_user_id(telegram_id, user_id)
     return user_id
 
 
+def remember_user_id(telegram_id: int, user_id: int | None) -> None:
+    """
+    Заносит результат поиска пользователя в кэш user_id_cache.
+    Ошибки БД не кэшируются, а отсутствие пользователя кэшируется ненадолго.
+
+    Args:
+        telegram_id (int): Telegram ID пользователя.
+        user_id (int | None): Найденный внутренний ID или None, если пользователя нет.
+    """
+    if user_id is None:
+        user_id_cache.set(telegram_id, None, ttl=USER_ID_NEGATIVE_CACHE_TTL)
+    else:
+        user_id_cache.set(telegram_id, user_id)
+
+
+def invalidate_user_categories(user_id: int) -> None:
+    """
+    Сбрасывает закэшированный список категорий пользователя.
+    Вызывается после любого изменения набора или названий его категорий.
+
+    Args:
+        user_id (int): ID пользователя.
+    """
+    categories_cache.pop(user_id)
+
+
 def get_user_categories_names_and_ids(user_id: int):
     """
     Получает список всех активных категорий (ID и название) для заданного пользователя.
-    Используется для генерации инлайн-кнопок.
+    Используется для генерации инлайн-кнопок. Результат кэшируется до изменения категорий,
+    поэтому возвращаемый список нельзя изменять.
 
     Args:
         user_id (int): ID пользователя, чьи категории нужно получить.
@@ -99,24 +156,15 @@ def get_user_categories_names_and_ids(user_id: int):
                     Пример: [{'id': 1, 'name': 'Еда'}, {'id': 2, 'name': 'Транспорт'}].
                     Возвращает пустой список в случае ошибки или отсутствия категорий.
     """
-    conn = connect_db()
-    if conn is None:
-        print("Ошибка: Не удалось подключиться к базе данных.")
-        return []
+    cached = categories_cache.get(user_id)
+    if cached is not MISSING:
+        return cached
 
     try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, name FROM categories
-                WHERE user_id = %s AND is_deleted = FALSE
-            """, (user_id,))
-            res = cur.fetchall()
-
-            categories_list = []
-            for row in res:
-                category_id, category_name = row
-                categories_list.append({'id': category_id, 'name': category_name})
-
+        with db_connection() as conn, conn.cursor() as cur:
+            cur.execute(SELECT_USER_CATEGORIES_SQL, (user_id,))
+            categories_list = categories_from_rows(cur.fetchall())
+            categories_cache.set(user_id, categories_list)
             return categories_list
     except psycopg2.Error as e:
         print(f"Ошибка БД при поиске категорий пользователя: {e}")
@@ -124,6 +172,16 @@ def get_user_categories_names_and_ids(user_id: int):
     except Exception as e:
         print(f"Неизвестная ошибка при поиске категорий пользователя: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
+
+
+def categories_from_rows(rows) -> list[dict]:
+    """
+    Преобразует строки (id, name) запроса SELECT_USER_CATEGORIES_SQL в список словарей.
+
+    Returns:
+        list[dict]: Список словарей с ключами 'id' и 'name'.
+    """
+    categories_list = []
+    for category_id, category_name in rows:
+        categories_list.append({'id': category_id, 'name': category_name})
+    return categories_list
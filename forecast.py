@@ -0,0 +1,125 @@
+"""
+Прогноз трат по дневным итогам: скользящие средние, прогноз суммы на конец месяца
+и тренды категорий.
+
+Вычисления векторные: дневные итоги раскладываются в матрицу категории x дни,
+а суммы, средние и наклоны трендов считаются операциями над ней целиком, без циклов
+по дням. Модуль импортирует NumPy и pandas, поэтому используется только в процессе
+рендеринга графиков (charts/forecast_charts.py) и в бенчмарке, а не при старте бота.
+"""
+import calendar
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOWS = (7, 30)  # окна скользящих средних, дней
+FORECAST_RATE_DAYS = 30  # полных дней перед сегодняшним, по которым считается дневной темп трат
+FORECAST_TREND_DAYS = 90  # дней, по которым считается тренд категории
+FORECAST_MIN_TREND_DAYS = 14  # при более короткой истории тренды не считаются
+FORECAST_TRENDS_SHOWN = 5
+
+
+def daily_matrix(data: dict) -> np.ndarray:
+    """
+    Раскладывает дневные итоги в матрицу категории x дни периода (дни без трат — нули).
+    Буферы дней и сумм каждой категории читаются без копирования и разбора (np.frombuffer).
+
+    Args:
+        data (dict): Результат database.statistics.daily_totals.
+
+    Returns:
+        np.ndarray: Матрица размера (число категорий, число дней периода).
+    """
+    categories = data['categories']
+    matrix = np.zeros((len(categories), (data['end_date'] - data['start_date']).days + 1))
+    for row, category in zip(matrix, categories):
+        row[np.frombuffer(category['days'], dtype='>i4')] = np.frombuffer(category['totals'], dtype='>f8')
+    return matrix
+
+
+def trend_slopes(window: np.ndarray) -> np.ndarray:
+    """
+    Наклоны линейных трендов строк матрицы методом наименьших квадратов — одним матричным умножением.
+
+    Returns:
+        np.ndarray: Изменение дневных трат за день для каждой строки.
+    """
+    x = np.arange(window.shape[1], dtype=float)
+    x -= x.mean()
+    return window @ x / (x @ x)
+
+
+def build_forecast(data: dict) -> dict:
+    """
+    Считает прогноз трат по дневным итогам.
+
+    Сегодняшний день ещё не закончился, поэтому темп трат и тренды считаются
+    по предыдущим полным дням (начиная с первого дня с тратами), а сегодняшние траты
+    входят только в уже потраченную за месяц сумму.
+
+    Args:
+        data (dict): Результат database.statistics.daily_totals; последний день периода — сегодня.
+
+    Returns:
+        dict: Словарь с ключами:
+              - 'daily' (pd.Series): Траты по дням периода.
+              - 'rolling' (dict[int, pd.Series]): Скользящие средние по окнам ROLLING_WINDOWS.
+              - 'today' (date), 'month_days' (int): Сегодняшняя дата и число дней в месяце.
+              - 'month_cumulative' (np.ndarray): Траты месяца нарастающим итогом по сегодняшний день.
+              - 'projection' (np.ndarray): Прогноз нарастающего итога на оставшиеся дни месяца.
+              - 'month_spent', 'projected_total', 'daily_rate' (float): Потрачено за месяц,
+                прогноз на конец месяца и средние траты в день.
+              - 'trends' (list[dict]): До FORECAST_TRENDS_SHOWN категорий с самым заметным трендом
+                {'name', 'change', 'monthly_delta'}: изменение трат в процентах и в рублях за месяц.
+    """
+    matrix = daily_matrix(data)
+    daily_values = matrix.sum(axis=0)
+    daily = pd.Series(daily_values, index=pd.date_range(data['start_date'], periods=daily_values.size, freq='D'))
+    rolling = {window: daily.rolling(window, min_periods=1).mean() for window in ROLLING_WINDOWS}
+
+    today = data['end_date']
+    month_days = calendar.monthrange(today.year, today.month)[1]
+    month_offset = max(0, (date(today.year, today.month, 1) - data['start_date']).days)
+    month_cumulative = daily_values[month_offset:].cumsum()
+    month_spent = float(month_cumulative[-1]) if month_cumulative.size else 0.0
+
+    # Полные дни с первого дня с тратами по вчерашний
+    spending_days = np.flatnonzero(daily_values)
+    first_day = int(spending_days[0]) if spending_days.size else daily_values.size - 1
+    last_day = daily_values.size - 1
+    rate_window = daily_values[max(first_day, last_day - FORECAST_RATE_DAYS):last_day]
+    daily_rate = float(rate_window.mean()) if rate_window.size else 0.0
+    projection = month_spent + daily_rate * np.arange(1, month_days - today.day + 1)
+
+    trends = []
+    trend_window = matrix[:, max(first_day, last_day - FORECAST_TREND_DAYS):last_day]
+    if trend_window.shape[1] >= FORECAST_MIN_TREND_DAYS:
+        means = trend_window.mean(axis=1)
+        slopes = trend_slopes(trend_window)
+        active = np.array([not category['is_deleted'] for category in data['categories']], dtype=bool)
+        active &= means > 0
+        # Изменение дневных трат за 30 дней относительно среднего за окно
+        change = np.divide(slopes * 30, means, out=np.zeros_like(means), where=means > 0) * 100
+        order = np.argsort(-np.abs(np.where(active, change, 0.0)))
+        for index in order[:FORECAST_TRENDS_SHOWN]:
+            if not active[index]:
+                break
+            trends.append({
+                'name': data['categories'][index]['name'],
+                'change': round(float(change[index]), 1),
+                'monthly_delta': round(float(slopes[index] * 30 * 30), 2),
+            })
+
+    return {
+        'daily': daily,
+        'rolling': rolling,
+        'today': today,
+        'month_days': month_days,
+        'month_cumulative': month_cumulative,
+        'projection': projection,
+        'month_spent': month_spent,
+        'projected_total': float(projection[-1]) if projection.size else month_spent,
+        'daily_rate': daily_rate,
+        'trends': trends,
+    }
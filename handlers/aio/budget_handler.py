@@ -0,0 +1,59 @@
+from telebot import types, util
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.budgets import (delete_budget, get_monthly_budgets,
+                                  set_budget, track_expenses)
+from database.aio.user_data import (find_user_id_by_telegram_id,
+                                    get_user_categories_names_and_ids)
+from handlers.budget_handler import (budget_alert_text, budget_name,
+                                     budgets_report_text, category_names,
+                                     parse_budget_args)
+from messages import (budget_bad_args, budget_deleted, budget_error,
+                      budget_load_error, budget_not_found, budget_saved,
+                      error_user_not_found)
+
+
+async def handle_budget_command(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает команду '/budget' (см. handlers.budget_handler.handle_budget_command).
+    """
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    categories = await get_user_categories_names_and_ids(db_user_id)
+    args = util.extract_arguments(message.text or '')
+    if not args:
+        budgets = await get_monthly_budgets(db_user_id)
+        text = budget_load_error if budgets is None else budgets_report_text(budgets, category_names(categories))
+        await bot.send_message(chat_id=message.chat.id, text=text)
+        return
+
+    parsed = parse_budget_args(args, categories)
+    if parsed is None:
+        await bot.send_message(chat_id=message.chat.id, text=budget_bad_args)
+        return
+
+    category_id, amount = parsed
+    name = budget_name(category_id, category_names(categories))
+    if amount:
+        saved = await set_budget(db_user_id, category_id, amount)
+        text = budget_saved.format(name=name, limit=amount) if saved else budget_error
+    else:
+        deleted = await delete_budget(db_user_id, category_id)
+        text = budget_error if deleted is None else (budget_deleted if deleted else budget_not_found).format(name=name)
+    await bot.send_message(chat_id=message.chat.id, text=text)
+
+
+async def send_budget_alerts(bot: AsyncTeleBot, chat_id: int, user_id: int, expenses: list[tuple[int, float]]):
+    """
+    Учитывает записанные траты в бюджетах месяца и отправляет предупреждения
+    (см. handlers.budget_handler.send_budget_alerts).
+    """
+    alerts = await track_expenses(user_id, expenses)
+    if not alerts:
+        return
+    names = category_names(await get_user_categories_names_and_ids(user_id))
+    for alert in alerts:
+        await bot.send_message(chat_id=chat_id, text=budget_alert_text(alert, names))
@@ -0,0 +1,40 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.category import create_category
+from database.category import is_valid_category_name
+from database.aio.user_data import find_user_id_by_telegram_id
+from messages import (create_category_error, create_category_message,
+                      create_category_success, error_user_not_found,
+                      valid_category_name)
+from states import UserState
+
+
+async def handle_create_category_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "💲 Создать категорию"
+    (см. handlers.create_category_handler.handle_create_category_button).
+    """
+    await bot.set_state(message.chat.id, UserState.WAITING_FOR_CATEGORY_NAME)
+    await bot.send_message(chat_id=message.chat.id, text=create_category_message)
+
+
+async def save_new_category(message: types.Message, bot: AsyncTeleBot):
+    """
+    Создаёт категорию по названию, введённому в состоянии WAITING_FOR_CATEGORY_NAME
+    (см. handlers.create_category_handler.save_new_category).
+    """
+    user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+
+    if user_id is None:
+        text = error_user_not_found
+    elif not is_valid_category_name(message.text):
+        text = valid_category_name
+    elif await create_category(user_id, message.text):
+        text = create_category_success
+    else:
+        text = create_category_error
+
+    await bot.send_message(chat_id=message.chat.id, text=text)
+    # В любом случае, после обработки сбрасываем состояние пользователя на DEFAULT
+    await bot.set_state(message.chat.id, UserState.DEFAULT)
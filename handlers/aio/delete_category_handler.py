@@ -0,0 +1,85 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.category import delete_category_func, get_category_name_by_id
+from inline_keyboard.aio.categories import category_kb
+from inline_keyboard.categories import parse_category_id
+from inline_keyboard.delete_confirmation import delete_category_confirmation
+from messages import (choose_category, choose_category_error,
+                      delete_category_cancel_msg,
+                      delete_category_confirmation_msg,
+                      delete_category_success, delete_msg_error,
+                      error_category_not_found)
+from states import UserState
+
+
+async def handle_delete_category_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "🗑️ Удалить категорию"
+    (см. handlers.delete_category_handler.handle_delete_category_button).
+    """
+    categories_markup = await category_kb(message, 'delete_category:')
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text=choose_category,
+        reply_markup=categories_markup
+    )
+
+
+async def handler_category_selection_for_delete(query: types.CallbackQuery, bot: AsyncTeleBot):
+    """
+    Запрашивает подтверждение удаления выбранной категории
+    (см. handlers.delete_category_handler.handler_category_selection_for_delete).
+    """
+    await bot.answer_callback_query(query.id)
+
+    category_id = parse_category_id(query.data)
+    if category_id is None:
+        print(f"ERROR: Неверный формат callback data в handler_category_selection_for_delete: {query.data}")
+        await bot.send_message(query.message.chat.id, choose_category_error)
+        await bot.set_state(query.message.chat.id, UserState.DEFAULT)
+        return
+
+    category_name = await get_category_name_by_id(category_id)
+    if not category_name:
+        await bot.send_message(query.message.chat.id, error_category_not_found)
+        await bot.set_state(query.message.chat.id, UserState.DEFAULT)
+        return
+
+    await bot.edit_message_text(
+        chat_id=query.message.chat.id,
+        message_id=query.message.message_id,
+        text=delete_category_confirmation_msg.format(category_name=category_name),
+        reply_markup=delete_category_confirmation(category_id),
+        parse_mode='Markdown'
+    )
+
+
+async def delete_category(query: types.CallbackQuery, bot: AsyncTeleBot):
+    """
+    Выполняет или отменяет удаление категории
+    (см. handlers.delete_category_handler.delete_category).
+    """
+    await bot.answer_callback_query(query.id)
+
+    data = query.data
+    category_id = parse_category_id(data)
+    if category_id is None:
+        await bot.send_message(query.message.chat.id, "Ошибка: Неверный формат ID категории в запросе.")
+        await bot.set_state(query.message.chat.id, UserState.DEFAULT)
+        return
+
+    # Удаляем сообщение с вопросом подтверждения, чтобы не загромождать чат (без await:
+    # вместе со следующим ответом очередь отправки выполнит одно редактирование)
+    bot.delete_message(chat_id=query.message.chat.id, message_id=query.message.message_id)
+
+    if data.startswith('confirm_delete:'):
+        deleted = await delete_category_func(category_id)
+        await bot.send_message(
+            chat_id=query.message.chat.id,
+            text=delete_category_success if deleted else delete_msg_error
+        )
+    else:
+        await bot.send_message(chat_id=query.message.chat.id, text=delete_category_cancel_msg)
+
+    await bot.set_state(query.message.chat.id, UserState.DEFAULT)
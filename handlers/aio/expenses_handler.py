@@ -0,0 +1,124 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.expenses import write_down_expense, write_down_expenses
+from database.aio.user_data import (find_user_id_by_telegram_id,
+                                    get_user_categories_names_and_ids)
+from handlers.aio.budget_handler import send_budget_alerts
+from handlers.aio.start import echo_msg
+from handlers.expenses_handler import (BULK_MAX_LINES, bulk_expenses_report,
+                                       has_expense_lines, parse_amount,
+                                       parse_bulk_expenses,
+                                       split_bulk_expenses)
+from inline_keyboard.aio.categories import category_kb
+from inline_keyboard.categories import parse_category_id
+from messages import (bulk_expenses_too_many_lines, enter_amount_error,
+                      error_user_not_found,
+                      write_down_expense_choose_category_msg,
+                      write_down_expense_error, write_down_expense_msg,
+                      write_down_expense_success)
+from states import UserState
+
+
+async def handle_expense_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "✍️ Записать расходы"
+    (см. handlers.expenses_handler.handle_expense_button).
+    """
+    categories_markup = await category_kb(message, 'select_expense_category:')
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text=write_down_expense_choose_category_msg,
+        reply_markup=categories_markup
+    )
+
+
+async def handle_category_selection_for_expense(query: types.CallbackQuery, bot: AsyncTeleBot):
+    """
+    Запоминает выбранную категорию расхода и запрашивает сумму
+    (см. handlers.expenses_handler.handle_category_selection_for_expense).
+    """
+    await bot.answer_callback_query(query.id)
+
+    category_id = parse_category_id(query.data)
+    if category_id is None:
+        print(f"ОШИБКА: Неверный формат callback_data в handle_category_selection_for_expense: {query.data}")
+        await bot.send_message(query.message.chat.id, "Ошибка выбора категории")
+        return
+
+    await bot.set_state(query.message.chat.id, UserState.WAITING_FOR_EXPENSE_AMOUNT)
+    await bot.current_states.set_data(
+        chat_id=query.message.chat.id,
+        user_id=query.from_user.id,
+        key='selected_expense_category_id',
+        value=category_id
+    )
+    await bot.edit_message_text(
+        chat_id=query.message.chat.id,
+        message_id=query.message.message_id,
+        text=write_down_expense_msg
+    )
+
+
+async def write_expenses(message: types.Message, bot: AsyncTeleBot):
+    """
+    Записывает расход с суммой, введённой в состоянии WAITING_FOR_EXPENSE_AMOUNT
+    (см. handlers.expenses_handler.write_expenses).
+    """
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        await bot.set_state(message.chat.id, UserState.DEFAULT)
+        return
+
+    user_data = await bot.current_states.get_data(
+        chat_id=message.chat.id,
+        user_id=message.from_user.id
+    )
+    category_id = user_data.get('selected_expense_category_id')
+    if category_id is None:
+        await bot.send_message(message.chat.id, "Ошибка: Категория не была выбрана. Начните заново.")
+        await bot.set_state(message.chat.id, UserState.DEFAULT)
+        return
+
+    amount = parse_amount(message.text)
+    if amount is None:
+        # Состояние не сбрасываем, чтобы пользователь мог повторно ввести сумму
+        await bot.send_message(chat_id=message.chat.id, text=enter_amount_error)
+        return
+
+    if await write_down_expense(db_user_id, category_id, amount):
+        await bot.send_message(chat_id=message.chat.id, text=write_down_expense_success)
+        await send_budget_alerts(bot, message.chat.id, db_user_id, [(category_id, amount)])
+    else:
+        await bot.send_message(chat_id=message.chat.id, text=write_down_expense_error)
+
+    await bot.set_state(message.chat.id, UserState.DEFAULT)
+
+
+async def write_bulk_expenses(message: types.Message, bot: AsyncTeleBot):
+    """
+    Пакетная запись расходов из текста вне сценариев
+    (см. handlers.expenses_handler.write_bulk_expenses).
+    """
+    lines = split_bulk_expenses(message.text)
+    if not has_expense_lines(lines):
+        await echo_msg(message, bot)
+        return
+    if len(lines) > BULK_MAX_LINES:
+        await bot.send_message(message.chat.id, bulk_expenses_too_many_lines.format(max_lines=BULK_MAX_LINES))
+        return
+
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    entries, errors = parse_bulk_expenses(lines, await get_user_categories_names_and_ids(db_user_id))
+    written = await write_down_expenses(db_user_id, [(category_id, amount) for _, _, category_id, amount in entries])
+    if written is None:
+        await bot.send_message(chat_id=message.chat.id, text=write_down_expense_error)
+        return
+
+    await bot.send_message(chat_id=message.chat.id, text=bulk_expenses_report(entries, errors, written))
+    await send_budget_alerts(bot, message.chat.id, db_user_id, written)
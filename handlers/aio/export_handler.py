@@ -0,0 +1,34 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.export import export_expenses_csv
+from database.aio.user_data import find_user_id_by_telegram_id
+from handlers.export_handler import (export_file_name, finish_export_buffer,
+                                     open_export_buffer)
+from messages import error_user_not_found, export_caption, export_empty, export_error
+
+
+async def handle_export_command(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает команду '/export' (см. handlers.export_handler.handle_export_command).
+    """
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    buffer, stream = open_export_buffer()
+    try:
+        count = await export_expenses_csv(db_user_id, stream)
+        if not count:
+            await bot.send_message(chat_id=message.chat.id, text=export_error if count is None else export_empty)
+            return
+
+        await bot.send_document(
+            chat_id=message.chat.id,
+            document=finish_export_buffer(stream),
+            visible_file_name=export_file_name(),
+            caption=export_caption.format(count=count)
+        )
+    finally:
+        buffer.close()
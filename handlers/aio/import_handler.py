@@ -0,0 +1,47 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.import_expenses import import_expenses
+from database.aio.user_data import find_user_id_by_telegram_id
+from handlers.import_handler import (import_errors_text, is_csv_document,
+                                     parse_import_csv)
+from messages import (error_user_not_found, import_empty, import_error,
+                      import_not_csv, import_prompt, import_success)
+from states import UserState
+
+
+async def handle_import_command(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает команду '/import' (см. handlers.import_handler.handle_import_command).
+    """
+    await bot.set_state(message.chat.id, UserState.WAITING_FOR_IMPORT_FILE)
+    await bot.send_message(chat_id=message.chat.id, text=import_prompt)
+
+
+async def import_expenses_file(message: types.Message, bot: AsyncTeleBot):
+    """
+    Проверяет и импортирует CSV-файл с тратами
+    (см. handlers.import_handler.import_expenses_file).
+    """
+    if not is_csv_document(message.document):
+        await bot.send_message(chat_id=message.chat.id, text=import_not_csv)
+        return
+
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        await bot.set_state(message.chat.id, UserState.DEFAULT)
+        return
+
+    file_info = await bot.get_file(message.document.file_id)
+    rows, errors = parse_import_csv(await bot.download_file(file_info.file_path))
+    if errors:
+        await bot.send_message(chat_id=message.chat.id, text=import_errors_text(errors))
+        return
+    if not rows:
+        await bot.send_message(chat_id=message.chat.id, text=import_empty)
+        return
+
+    report = await import_expenses(db_user_id, rows)
+    await bot.send_message(chat_id=message.chat.id, text=import_success.format(**report) if report else import_error)
+    await bot.set_state(message.chat.id, UserState.DEFAULT)
@@ -0,0 +1,62 @@
+from datetime import date
+
+from telebot import types, util
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.recurring import (create_recurring_expense,
+                                    delete_recurring_expense,
+                                    get_recurring_expenses,
+                                    materialize_recurring_expenses)
+from database.aio.user_data import (find_user_id_by_telegram_id,
+                                    get_user_categories_names_and_ids)
+from database.recurring import first_occurrence
+from handlers.recurring_handler import (parse_recurring_args,
+                                        parse_recurring_delete,
+                                        recurring_list_text, schedule_text)
+from messages import (error_user_not_found, recurring_bad_args,
+                      recurring_deleted, recurring_error, recurring_not_found,
+                      recurring_saved)
+
+
+async def handle_recurring_command(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает команду '/recurring' (см. handlers.recurring_handler.handle_recurring_command).
+    """
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    args = util.extract_arguments(message.text or '').strip().lower()
+    if not args:
+        rules = await get_recurring_expenses(db_user_id)
+        await bot.send_message(chat_id=message.chat.id,
+                               text=recurring_error if rules is None else recurring_list_text(rules))
+        return
+
+    rule_id = parse_recurring_delete(args)
+    if rule_id is not None:
+        deleted = await delete_recurring_expense(db_user_id, rule_id)
+        text = recurring_error if deleted is None else (recurring_deleted if deleted else recurring_not_found)
+        await bot.send_message(chat_id=message.chat.id, text=text.format(id=rule_id))
+        return
+
+    today = date.today()
+    rule = parse_recurring_args(args, await get_user_categories_names_and_ids(db_user_id), today)
+    if rule is None:
+        await bot.send_message(chat_id=message.chat.id, text=recurring_bad_args)
+        return
+
+    rule_id = await create_recurring_expense(db_user_id, rule['category_id'], rule['amount'], rule['frequency'],
+                                             rule['day'], today)
+    if rule_id is None:
+        await bot.send_message(chat_id=message.chat.id, text=recurring_error)
+        return
+
+    first_date = first_occurrence(rule['frequency'], rule['day'], today)
+    if first_date <= today:
+        await materialize_recurring_expenses(today, user_id=db_user_id)
+    await bot.send_message(chat_id=message.chat.id, text=recurring_saved.format(
+        id=rule_id, category=rule['category'], amount=rule['amount'],
+        schedule=schedule_text(rule['frequency'], rule['day']), first_date=first_date
+    ))
@@ -0,0 +1,80 @@
+from telebot.async_telebot import AsyncTeleBot
+
+from config import key_board_buttons
+from handlers.aio.budget_handler import handle_budget_command
+from handlers.aio.create_category_handler import (
+    handle_create_category_button, save_new_category)
+from handlers.aio.delete_category_handler import (
+    delete_category, handle_delete_category_button,
+    handler_category_selection_for_delete)
+from handlers.aio.expenses_handler import (
+    handle_category_selection_for_expense, handle_expense_button,
+    write_bulk_expenses, write_expenses)
+from handlers.aio.export_handler import handle_export_command
+from handlers.aio.import_handler import (handle_import_command,
+                                         import_expenses_file)
+from handlers.aio.recurring_handler import handle_recurring_command
+from handlers.aio.rename_category_handler import (
+    handle_category_selection_for_rename, handle_rename_category_button,
+    rename_category)
+from handlers.aio.start import handle_command_start
+from handlers.aio.statistics_handler import (
+    handle_basic_expenses_button, handle_date_picker_callback,
+    handle_forecast_button, handle_statistics_button,
+    handle_statistics_interval_callback, handle_statistics_period_text)
+from handlers.router import AsyncRouter
+from inline_keyboard.date_picker import DATE_PICKER_PREFIX
+from states import UserState
+
+
+def build_router(bot: AsyncTeleBot, sender=None) -> AsyncRouter:
+    """
+    Создаёт роутер асинхронного режима бота.
+    Таблица маршрутов совпадает с handlers.register.build_router.
+    """
+    router = AsyncRouter(bot, sender)
+
+    # --- Команды ---
+    router.command('start', handle_command_start)
+    router.command('export', handle_export_command)
+    router.command('import', handle_import_command)
+    router.command('budget', handle_budget_command)
+    router.command('recurring', handle_recurring_command)
+
+    # --- Кнопки основной клавиатуры (config.key_board_buttons) ---
+    router.button(key_board_buttons['create_category'], handle_create_category_button)
+    router.button(key_board_buttons['rename_category'], handle_rename_category_button)
+    router.button(key_board_buttons['delete_category'], handle_delete_category_button)
+    router.button(key_board_buttons['expenses'], handle_expense_button)
+    router.button(key_board_buttons['statistics'], handle_statistics_button)
+    router.button(key_board_buttons['basic_expenses'], handle_basic_expenses_button)
+    router.button(key_board_buttons['forecast'], handle_forecast_button)
+
+    # --- Обработчики состояний (ввод текста после нажатия кнопки) ---
+    router.state(UserState.WAITING_FOR_CATEGORY_NAME, save_new_category)
+    router.state(UserState.WAITING_FOR_NEW_CATEGORY_NAME, rename_category)
+    router.state(UserState.WAITING_FOR_EXPENSE_AMOUNT, write_expenses)
+    router.state(UserState.WAITING_FOR_IMPORT_FILE, import_expenses_file, documents=True)
+    router.state(UserState.WAITING_FOR_STATISTICS_PERIOD, handle_statistics_period_text)
+    router.state(UserState.WAITING_FOR_BASIC_EXPENSES_PERIOD, handle_statistics_period_text)
+
+    # --- Обработчики CallbackQuery (инлайн-кнопки), по префиксу callback_data ---
+    router.callback('rename_category:', handle_category_selection_for_rename)
+    router.callback('delete_category:', handler_category_selection_for_delete)
+    router.callback('confirm_delete:', delete_category)
+    router.callback('cancel_delete:', delete_category)
+    router.callback('select_expense_category:', handle_category_selection_for_expense)
+    router.callback('time_interval_', handle_statistics_interval_callback)
+    router.callback(DATE_PICKER_PREFIX, handle_date_picker_callback)
+
+    # Остальные сообщения: пакетная запись трат ("еда 350, такси 420") или "эхо"
+    router.default_message_handler = write_bulk_expenses
+
+    return router
+
+
+def register_all_handlers(bot: AsyncTeleBot, sender=None) -> AsyncRouter:
+    """Регистрирует роутер асинхронного режима в боте (см. handlers.register.register_all_handlers)."""
+    router = build_router(bot, sender)
+    router.attach()
+    return router
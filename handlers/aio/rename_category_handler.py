@@ -0,0 +1,88 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from database.aio.category import rename_category_in_db
+from database.category import is_valid_category_name
+from inline_keyboard.aio.categories import category_kb
+from inline_keyboard.categories import parse_category_id
+from messages import (choose_category, choose_category_error, delete_msg_error,
+                      rename_category_error, rename_category_msg,
+                      rename_category_success, valid_category_name)
+from states import UserState
+
+
+async def handle_rename_category_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "✏️ Переименовать категорию"
+    (см. handlers.rename_category_handler.handle_rename_category_button).
+    """
+    categories_markup = await category_kb(message, 'rename_category:')
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text=choose_category,
+        reply_markup=categories_markup
+    )
+
+
+async def handle_category_selection_for_rename(query: types.CallbackQuery, bot: AsyncTeleBot):
+    """
+    Запоминает выбранную для переименования категорию и запрашивает новое название
+    (см. handlers.rename_category_handler.handle_category_selection_for_rename).
+    """
+    await bot.answer_callback_query(query.id)
+
+    category_id = parse_category_id(query.data)
+    if category_id is None:
+        print(f"ERROR: Неверный формат callback data в handle_category_selection_for_rename: {query.data}")
+        await bot.send_message(query.message.chat.id, choose_category_error)
+        return
+
+    await bot.set_state(query.message.chat.id, UserState.WAITING_FOR_NEW_CATEGORY_NAME)
+    await bot.edit_message_text(
+        chat_id=query.message.chat.id,
+        message_id=query.message.message_id,
+        text=rename_category_msg
+    )
+
+    # ID категории и ID сообщения-запроса (оно удаляется после ввода названия)
+    await bot.current_states.set_data(
+        chat_id=query.message.chat.id,
+        user_id=query.from_user.id,
+        key='selected_rename_category_id',
+        value=category_id
+    )
+    await bot.current_states.set_data(
+        chat_id=query.message.chat.id,
+        user_id=query.from_user.id,
+        key='prompt_message_id',
+        value=query.message.message_id
+    )
+
+
+async def rename_category(message: types.Message, bot: AsyncTeleBot):
+    """
+    Переименовывает категорию по названию, введённому в состоянии WAITING_FOR_NEW_CATEGORY_NAME
+    (см. handlers.rename_category_handler.rename_category).
+    """
+    user_data = await bot.current_states.get_data(
+        chat_id=message.chat.id,
+        user_id=message.from_user.id
+    )
+    category_id = user_data.get('selected_rename_category_id')
+    prompt_msg_id = user_data.get('prompt_message_id')
+
+    if category_id is None:
+        await bot.send_message(message.chat.id, choose_category_error)
+    elif not is_valid_category_name(message.text):
+        await bot.send_message(chat_id=message.chat.id, text=valid_category_name)
+    elif await rename_category_in_db(category_id, message.text):
+        await bot.send_message(chat_id=message.chat.id, text=rename_category_success)
+        if prompt_msg_id:
+            try:
+                await bot.delete_message(chat_id=message.chat.id, message_id=prompt_msg_id)
+            except Exception as e:
+                print(f'{delete_msg_error}: {e}')
+    else:
+        await bot.send_message(chat_id=message.chat.id, text=rename_category_error)
+
+    await bot.set_state(message.chat.id, UserState.DEFAULT)
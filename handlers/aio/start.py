@@ -0,0 +1,36 @@
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+import messages
+from database.aio.user_data import add_or_update_user
+from handlers.start import main_menu_markup
+from states import UserState
+
+
+async def handle_command_start(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает команду '/start' (см. handlers.start.handle_command_start).
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+    user = message.from_user
+    await add_or_update_user(user.id, user.username, user.first_name, user.last_name)
+    await bot.set_state(message.chat.id, UserState.DEFAULT)
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text=messages.start_message,
+        reply_markup=main_menu_markup()
+    )
+
+
+async def echo_msg(message: types.Message, bot: AsyncTeleBot):
+    """
+    Отвечает тем же текстом на сообщение, не обработанное другими обработчиками.
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+    await bot.send_message(chat_id=message.chat.id, text=message.text)
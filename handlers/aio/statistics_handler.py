@@ -0,0 +1,225 @@
+from datetime import date, datetime
+
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+
+from charts.chart_cache import (chart_cache_key, forget_charts,
+                                get_cached_charts, remember_charts)
+from charts.renderer import ChartRendererBusy, render_chart_async
+from config import CHARTS_DEBUG_DIR
+from database.aio.expenses import get_top_categories_and_other_sum
+from database.aio.statistics import (comparison_statistics, daily_totals,
+                                     full_statistics)
+from database.aio.user_data import find_user_id_by_telegram_id
+from handlers.statistics_handler import (PERIOD_STATES, chart_groups,
+                                         chart_media, has_statistics_data,
+                                         parse_statistics_callback,
+                                         period_state, statistics_caption)
+from inline_keyboard.date_picker import (create_date_picker_markup,
+                                         parse_date_picker_callback)
+from inline_keyboard.statistics import create_time_interval_markup
+from messages import (charts_busy, charts_timeout, error_user_not_found,
+                      select_statistics_interval, statistics_custom_period,
+                      statistics_error, statistics_period_end,
+                      statistics_period_error)
+from states import UserState
+from time_interval import (comparison_intervals, date_range_interval,
+                           forecast_interval, interval_label,
+                           parse_date_range, resolve_interval)
+
+
+async def handle_statistics_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "📊 Статистика"
+    (см. handlers.statistics_handler.handle_statistics_button).
+    """
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text=select_statistics_interval,
+        reply_markup=create_time_interval_markup('time_interval_', with_comparison=True)
+    )
+
+
+async def handle_basic_expenses_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "📉 Основные траты"
+    (см. handlers.statistics_handler.handle_basic_expenses_button).
+    """
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text=select_statistics_interval,
+        reply_markup=create_time_interval_markup('time_interval_for_basic_expenses_')
+    )
+
+
+async def handle_forecast_button(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатие кнопки "📈 Прогноз"
+    (см. handlers.statistics_handler.handle_forecast_button).
+    """
+    await send_statistics(bot, message.chat.id, message.from_user.id, 'forecast', forecast_interval())
+
+
+async def handle_statistics_interval_callback(query: types.CallbackQuery, bot: AsyncTeleBot):
+    """
+    Строит и отправляет графики статистики за выбранный интервал
+    (см. handlers.statistics_handler.handle_statistics_interval_callback).
+    """
+    await bot.answer_callback_query(query.id)
+
+    parsed = parse_statistics_callback(query.data)
+    if parsed is None:
+        print(f"Неизвестный callback_data в handle_statistics_interval_callback: {query.data}")
+        return
+    interval_key, chart_type = parsed
+    chat_id = query.message.chat.id
+
+    if interval_key == 'custom':
+        today = date.today()
+        await bot.set_state(chat_id, period_state(chart_type))
+        await bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=query.message.message_id,
+            text=statistics_custom_period,
+            reply_markup=create_date_picker_markup(chart_type, today.year, today.month)
+        )
+        return
+
+    # Удаление только ставится в очередь отправки (без await): если следом уйдёт текстовый ответ,
+    # очередь заменит пару одним редактированием сообщения (см. outbound.can_coalesce)
+    bot.delete_message(chat_id=chat_id, message_id=query.message.message_id)
+
+    if chart_type == 'comparison':
+        interval, previous = comparison_intervals(interval_key)
+    else:
+        interval, previous = resolve_interval(interval_key), None
+    await send_statistics(bot, chat_id, query.from_user.id, chart_type, interval, previous)
+
+
+async def handle_date_picker_callback(query: types.CallbackQuery, bot: AsyncTeleBot):
+    """
+    Обрабатывает нажатия в календаре выбора произвольного периода
+    (см. handlers.statistics_handler.handle_date_picker_callback).
+    """
+    await bot.answer_callback_query(query.id)
+
+    parsed = parse_date_picker_callback(query.data)
+    if parsed is None:
+        print(f"Неизвестный callback_data в handle_date_picker_callback: {query.data}")
+        return
+    chart_type, start, action, value = parsed
+    chat_id, message_id = query.message.chat.id, query.message.message_id
+
+    try:
+        if action == 'm':
+            await bot.edit_message_reply_markup(
+                chat_id=chat_id, message_id=message_id,
+                reply_markup=create_date_picker_markup(chart_type, int(value[:4]), int(value[4:]), start)
+            )
+            return
+        if action != 'd':
+            return
+        day = datetime.strptime(value, '%Y%m%d').date()
+    except ValueError:
+        print(f"Некорректная дата в handle_date_picker_callback: {query.data}")
+        return
+
+    if start is None:
+        await bot.edit_message_text(
+            chat_id=chat_id, message_id=message_id,
+            text=statistics_period_end.format(start=f'{day:%d.%m.%Y}'),
+            reply_markup=create_date_picker_markup(chart_type, day.year, day.month, day)
+        )
+        return
+
+    if await bot.get_state(chat_id) in PERIOD_STATES:
+        await bot.set_state(chat_id, UserState.DEFAULT)
+    bot.delete_message(chat_id=chat_id, message_id=message_id)
+    await send_statistics(bot, chat_id, query.from_user.id, chart_type, date_range_interval(start, day))
+
+
+async def handle_statistics_period_text(message: types.Message, bot: AsyncTeleBot):
+    """
+    Обрабатывает произвольный период, введённый текстом
+    (см. handlers.statistics_handler.handle_statistics_period_text).
+    """
+    interval = parse_date_range(message.text)
+    if interval is None:
+        await bot.send_message(chat_id=message.chat.id, text=statistics_period_error)
+        return
+
+    chart_type = PERIOD_STATES.get(await bot.get_state(message.chat.id), 'expenses')
+    await bot.set_state(message.chat.id, UserState.DEFAULT)
+    await send_statistics(bot, message.chat.id, message.from_user.id, chart_type, interval)
+
+
+async def send_statistics(bot: AsyncTeleBot, chat_id: int, telegram_id: int, chart_type: str,
+                          interval: dict, previous: dict | None = None) -> None:
+    """
+    Получает статистику за период, строит и отправляет графики
+    (см. handlers.statistics_handler.send_statistics).
+    Рендеринг выполняется в пуле графиков через run_in_executor, не блокируя цикл событий.
+    """
+    start_date, end_date = interval['start_date'], interval['end_date']
+
+    db_user_id = await find_user_id_by_telegram_id(telegram_id=telegram_id)
+    if db_user_id is None:
+        await bot.send_message(chat_id=chat_id, text=error_user_not_found)
+        return
+
+    if chart_type == 'top_categories':
+        data = await get_top_categories_and_other_sum(db_user_id, start_date, end_date)
+    elif chart_type == 'comparison':
+        data = await comparison_statistics(db_user_id, interval, previous)
+        data.update(current_label=interval_label(interval), previous_label=interval_label(previous))
+    elif chart_type == 'forecast':
+        data = await daily_totals(db_user_id, interval)
+    else:
+        data = await full_statistics(db_user_id, start_date, end_date)
+
+    if not has_statistics_data(chart_type, data):
+        await bot.send_message(chat_id, statistics_error)
+        return
+
+    cache_key = chart_cache_key(chart_type, data)
+    charts = get_cached_charts(cache_key)
+    if not charts:
+        try:
+            charts = await render_chart_async(chart_type, data, CHARTS_DEBUG_DIR)
+        except ChartRendererBusy:
+            await bot.send_message(chat_id, charts_busy)
+            return
+        except Exception as e:
+            print(f"Ошибка построения графиков: {e!r}")
+            await bot.send_message(chat_id, charts_timeout if isinstance(e, TimeoutError) else statistics_error)
+            return
+
+    await _send_charts(bot, chat_id, charts, cache_key, statistics_caption(interval, previous, chart_type))
+
+
+async def _send_charts(bot: AsyncTeleBot, chat_id: int, charts, cache_key: str, caption: str | None = None) -> None:
+    """
+    Отправляет графики пользователю и сохраняет их в кэш графиков
+    (см. handlers.statistics_handler._send_charts).
+    """
+    if not isinstance(charts, list):
+        charts = [charts]
+
+    if not charts:
+        await bot.send_message(chat_id, statistics_error)
+        return
+
+    sent_messages = []
+    try:
+        for i, group in enumerate(chart_groups(charts)):
+            group_caption = caption if i == 0 else None
+            if len(group) == 1:
+                sent_messages.append(await bot.send_photo(chat_id, group[0], caption=group_caption))
+            else:
+                sent_messages.extend(await bot.send_media_group(chat_id, chart_media(group, group_caption)))
+    except Exception:
+        # Закэшированный file_id мог стать недействительным: следующий запрос построит графики заново
+        forget_charts(cache_key)
+        raise
+
+    remember_charts(cache_key, charts, sent_messages)
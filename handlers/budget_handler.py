@@ -0,0 +1,162 @@
+import re
+
+from telebot import TeleBot, types, util
+
+from database.budgets import (BUDGET_ALERT_LEVELS, delete_budget,
+                              get_monthly_budgets, set_budget, track_expenses)
+from database.user_data import (find_user_id_by_telegram_id,
+                                get_user_categories_names_and_ids)
+from inline_keyboard.date_picker import MONTH_NAMES
+from messages import (budget_alert_exceeded, budget_alert_warning,
+                      budget_bad_args, budget_deleted, budget_error,
+                      budget_list_header, budget_list_line,
+                      budget_load_error, budget_none, budget_not_found,
+                      budget_overall_name, budget_saved, budget_usage,
+                      error_user_not_found)
+
+BUDGET_MAX_AMOUNT = 9_999_999_999.99  # предел столбца budgets.amount (NUMERIC(12, 2))
+
+# Сумма бюджета (в том числе 0 — удаление): "10000", "10 000 ₽", ": 1500,50"
+_BUDGET_AMOUNT_RE = re.compile(r'[\s:=—–-]*(\d[\d ]*(?:[.,]\d+)?)\s*(?:₽|руб\.?|р\.?)?')
+
+
+def handle_budget_command(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает команду '/budget'.
+    Без аргументов показывает бюджеты текущего месяца и траты по ним;
+    '/budget 50000' задаёт бюджет на все траты, '/budget еда 10000' — бюджет категории,
+    а сумма 0 удаляет бюджет.
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (TeleBot): Экземпляр бота.
+    """
+    db_user_id = find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    categories = get_user_categories_names_and_ids(db_user_id)
+    args = util.extract_arguments(message.text or '')
+    if not args:
+        budgets = get_monthly_budgets(db_user_id)
+        text = budget_load_error if budgets is None else budgets_report_text(budgets, category_names(categories))
+        bot.send_message(chat_id=message.chat.id, text=text)
+        return
+
+    parsed = parse_budget_args(args, categories)
+    if parsed is None:
+        bot.send_message(chat_id=message.chat.id, text=budget_bad_args)
+        return
+
+    category_id, amount = parsed
+    name = budget_name(category_id, category_names(categories))
+    if amount:
+        text = budget_saved.format(name=name, limit=amount) if set_budget(db_user_id, category_id, amount) else budget_error
+    else:
+        deleted = delete_budget(db_user_id, category_id)
+        text = budget_error if deleted is None else (budget_deleted if deleted else budget_not_found).format(name=name)
+    bot.send_message(chat_id=message.chat.id, text=text)
+
+
+def send_budget_alerts(bot: TeleBot, chat_id: int, user_id: int, expenses: list[tuple[int, float]]):
+    """
+    Учитывает записанные траты в бюджетах месяца и отправляет предупреждения
+    о достигнутых порогах. Вызывается обработчиками записи расходов после успешной записи.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user_id (int): ID пользователя в БД.
+        expenses (list[tuple[int, float]]): Записанные траты — пары (ID категории, сумма).
+    """
+    alerts = track_expenses(user_id, expenses)
+    if not alerts:
+        return
+    names = category_names(get_user_categories_names_and_ids(user_id))
+    for alert in alerts:
+        bot.send_message(chat_id=chat_id, text=budget_alert_text(alert, names))
+
+
+def parse_budget_args(args: str, categories: list[dict]) -> tuple[int | None, float] | None:
+    """
+    Разбирает аргументы команды '/budget': сумму или название категории и сумму.
+    Название ищется без учёта регистра; если подходят несколько категорий, выбирается самая длинная.
+
+    Args:
+        args (str): Текст после команды.
+        categories (list[dict]): Категории пользователя с ключами 'id' и 'name'.
+
+    Returns:
+        tuple[int | None, float] | None: (ID категории или None для общего бюджета, сумма)
+                                         или None, если аргументы не распознаны.
+    """
+    key = args.strip().lower()
+    amount = parse_budget_amount(key)
+    if amount is not None:
+        return None, amount
+    for name, category_id in sorted(((category['name'].lower(), category['id']) for category in categories),
+                                    key=lambda item: len(item[0]), reverse=True):
+        if key.startswith(name):
+            amount = parse_budget_amount(key, len(name))
+            if amount is not None:
+                return category_id, amount
+    return None
+
+
+def parse_budget_amount(text: str, pos: int = 0) -> float | None:
+    """
+    Разбирает сумму бюджета, начиная с позиции pos.
+
+    Returns:
+        float | None: Сумма (0 — удаление бюджета) или None, если сумма некорректна.
+    """
+    match = _BUDGET_AMOUNT_RE.fullmatch(text, pos)
+    if match is None:
+        return None
+    amount = float(match.group(1).replace(' ', '').replace(',', '.'))
+    return amount if amount <= BUDGET_MAX_AMOUNT else None
+
+
+def category_names(categories: list[dict]) -> dict:
+    """Словарь ID категории -> название."""
+    return {category['id']: category['name'] for category in categories}
+
+
+def budget_name(category_id: int | None, names: dict) -> str:
+    """Название бюджета: категория или "Все траты" для общего бюджета."""
+    return budget_overall_name if category_id is None else names.get(category_id, str(category_id))
+
+
+def budgets_report_text(budgets, names: dict) -> str:
+    """
+    Формирует список бюджетов месяца с тратами по ним (см. MonthlyBudgets.report).
+
+    Args:
+        budgets (MonthlyBudgets): Бюджеты пользователя.
+        names (dict): ID категории -> название.
+
+    Returns:
+        str: Текст сообщения.
+    """
+    rows = budgets.report()
+    if not rows:
+        return f'{budget_none}\n\n{budget_usage}'
+
+    text = [budget_list_header.format(month=f'{MONTH_NAMES[budgets.month.month - 1].lower()} {budgets.month.year}')]
+    for row in rows:
+        line = budget_list_line.format(name=budget_name(row['category_id'], names), **row)
+        if row['percent'] >= BUDGET_ALERT_LEVELS[-1]:
+            line += ' 🚨'
+        elif row['percent'] >= BUDGET_ALERT_LEVELS[0]:
+            line += ' ⚠️'
+        text.append(line)
+    return '\n'.join(text)
+
+
+def budget_alert_text(alert: dict, names: dict) -> str:
+    """Текст предупреждения о бюджете (см. database.budgets.track_expenses)."""
+    name = budget_name(alert['category_id'], names)
+    if alert['level'] >= BUDGET_ALERT_LEVELS[-1]:
+        return budget_alert_exceeded.format(name=name, **alert)
+    return budget_alert_warning.format(name=name, percent=alert['level'], **alert)
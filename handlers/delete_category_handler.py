@@ -1,7 +1,7 @@
 from telebot import TeleBot, types
 
 from database.category import delete_category_func, get_category_name_by_id
-from inline_keyboard.categories import category_kb
+from inline_keyboard.categories import category_kb, parse_category_id
 from inline_keyboard.delete_confirmation import delete_category_confirmation
 from messages import (choose_category, choose_category_error,
                       delete_category_cancel_msg,
@@ -41,10 +41,9 @@ def handler_category_selection_for_delete(query: types.CallbackQuery, bot: TeleB
     """
     bot.answer_callback_query(query.id) # Отвечаем на callback_query, чтобы убрать индикатор загрузки на кнопке
 
-    try:
-        # Извлекаем ID категории из callback_data (формат 'префикс:ID')
-        category_id = int(query.data.split(':')[1])
-    except (ValueError, IndexError):
+    # Извлекаем ID категории из callback_data (формат 'префикс:ID')
+    category_id = parse_category_id(query.data)
+    if category_id is None:
         print(f"ERROR: Неверный формат callback data в handler_category_selection_for_delete: {query.data}")
         bot.send_message(query.message.chat.id, choose_category_error)
         bot.set_state(query.message.chat.id, UserState.DEFAULT)
@@ -84,10 +83,9 @@ def delete_category(query: types.CallbackQuery, bot: TeleBot):
         bot.set_state(query.message.chat.id, UserState.DEFAULT)
         return
 
-    try:
-        # Извлекаем ID категории из callback_data
-        category_id = int(data.split(':')[1])
-    except (ValueError, IndexError):
+    # Извлекаем ID категории из callback_data
+    category_id = parse_category_id(data)
+    if category_id is None:
         # Обработка некорректного формата ID
         bot.send_message(query.message.chat.id, "Ошибка: Неверный формат ID категории в запросе.")
         bot.set_state(query.message.chat.id, UserState.DEFAULT)
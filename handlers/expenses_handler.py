@@ -1,14 +1,38 @@
+import re
+from collections import Counter
+
 from telebot import TeleBot, types
 
-from database.expenses import write_down_expense
-from database.user_data import find_user_id_by_telegram_id
-from inline_keyboard.categories import category_kb
-from messages import (enter_amount_error, error_user_not_found,
+from database.expenses import write_down_expense, write_down_expenses
+from database.user_data import (find_user_id_by_telegram_id,
+                                get_user_categories_names_and_ids)
+from handlers.budget_handler import send_budget_alerts
+from handlers.start import echo_msg
+from inline_keyboard.categories import category_kb, parse_category_id
+from messages import (bulk_expenses_bad_amount, bulk_expenses_bad_line,
+                      bulk_expenses_deleted_category, bulk_expenses_line_error,
+                      bulk_expenses_nothing, bulk_expenses_success,
+                      bulk_expenses_too_many_lines,
+                      bulk_expenses_unknown_category, enter_amount_error,
+                      error_user_not_found,
                       write_down_expense_choose_category_msg,
                       write_down_expense_error, write_down_expense_msg,
                       write_down_expense_success)
 from states import UserState
 
+BULK_MAX_LINES = 100  # трат в одном сообщении
+BULK_MAX_AMOUNT = 9_999_999_999.99  # предел столбца expenses.amount (NUMERIC(12, 2))
+
+# Траты разделяются переводами строк, точкой с запятой или запятой перед словом
+# (запятая между цифрами — десятичный разделитель: "еда 1500,50, такси 420")
+_BULK_SEPARATOR_RE = re.compile(r'[\n;]|,(?=\s*[^\d\s,])')
+# Сумма после названия категории: "еда 350", "еда: 1 500,50 ₽"
+_AMOUNT_AFTER_NAME_RE = re.compile(r'[\s:=—–-]*(\d[\d ]*(?:[.,]\d+)?)\s*(?:₽|руб\.?|р\.?)?')
+# Сумма перед названием категории: "350 еда", "350₽ — еда"
+_AMOUNT_BEFORE_NAME_RE = re.compile(r'(\d[\d ]*(?:[.,]\d+)?)\s*(?:₽|руб\.?|р\.?)?[\s:=—–-]*')
+# Строка похожа на трату, если в ней есть и слово, и число
+_EXPENSE_LIKE_RE = re.compile(r'[^\W\d_].*\d|\d.*[^\W\d_]')
+
 
 def handle_expense_button(message: types.Message, bot: TeleBot):
     """
@@ -40,10 +64,9 @@ def handle_category_selection_for_expense(query: types.CallbackQuery, bot: TeleB
     """
     bot.answer_callback_query(query.id)
 
-    try:
-        # Извлекаем ID категории из callback_data (формат 'префикс:ID')
-        category_id = int(query.data.split(':')[1])
-    except (ValueError, IndexError):
+    # Извлекаем ID категории из callback_data (формат 'префикс:ID')
+    category_id = parse_category_id(query.data)
+    if category_id is None:
         print(f"ОШИБКА: Неверный формат callback_data в handle_category_selection_for_expense: {query.data}")
         bot.send_message(query.message.chat.id, "Ошибка выбора категории")
         return
@@ -98,14 +121,8 @@ def write_expenses(message: types.Message, bot: TeleBot):
         bot.set_state(message.chat.id, UserState.DEFAULT)
         return
 
-    try:
-        # Очистка и преобразование введенной суммы:
-        # Удаляем пробелы, заменяем запятые на точки для корректного преобразования в float
-        cleaned_amount_str = message.text.replace(' ', '').replace(',', '.')
-        amount = float(cleaned_amount_str)
-        if amount <= 0:
-            raise ValueError("Сумма должна быть положительной")
-    except ValueError:
+    amount = parse_amount(message.text)
+    if amount is None:
         # Обработка ошибки, если введенная сумма некорректна
         bot.send_message(
             chat_id=message.chat.id,
@@ -120,6 +137,7 @@ def write_expenses(message: types.Message, bot: TeleBot):
             chat_id=message.chat.id,
             text=write_down_expense_success
         )
+        send_budget_alerts(bot, message.chat.id, db_user_id, [(category_id, amount)])
     else:
         # В случае ошибки при записи в БД
         bot.send_message(
@@ -129,3 +147,140 @@ def write_expenses(message: types.Message, bot: TeleBot):
 
     # После успешной записи или фатальной ошибки, сбрасываем состояние пользователя
     bot.set_state(message.chat.id, UserState.DEFAULT)
+
+
+def parse_amount(text: str | None) -> float | None:
+    """
+    Разбирает введённую пользователем сумму расхода.
+    Пробелы удаляются, запятая считается десятичным разделителем.
+
+    Args:
+        text (str | None): Текст сообщения.
+
+    Returns:
+        float | None: Положительная сумма или None, если ввод некорректен.
+    """
+    try:
+        # Удаляем пробелы, заменяем запятые на точки для корректного преобразования в float
+        amount = float((text or '').replace(' ', '').replace(',', '.'))
+    except ValueError:
+        return None
+    # Сумма должна быть положительной (NaN тоже отбрасывается этим сравнением)
+    return amount if amount > 0 else None
+
+
+def write_bulk_expenses(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает текст вне сценариев как пакетную запись расходов: каждая строка
+    (или часть строки через запятую) — "категория сумма", например "еда 350, такси 420".
+    Все распознанные траты записываются одним запросом, а по остальным строкам
+    пользователь получает список ошибок. Сообщения без трат получают эхо-ответ, как раньше.
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (TeleBot): Экземпляр бота.
+    """
+    lines = split_bulk_expenses(message.text)
+    if not has_expense_lines(lines):
+        echo_msg(message, bot)
+        return
+    if len(lines) > BULK_MAX_LINES:
+        bot.send_message(message.chat.id, bulk_expenses_too_many_lines.format(max_lines=BULK_MAX_LINES))
+        return
+
+    db_user_id = find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    entries, errors = parse_bulk_expenses(lines, get_user_categories_names_and_ids(db_user_id))
+    written = write_down_expenses(db_user_id, [(category_id, amount) for _, _, category_id, amount in entries])
+    if written is None:
+        bot.send_message(chat_id=message.chat.id, text=write_down_expense_error)
+        return
+
+    bot.send_message(chat_id=message.chat.id, text=bulk_expenses_report(entries, errors, written))
+    send_budget_alerts(bot, message.chat.id, db_user_id, written)
+
+
+def split_bulk_expenses(text: str | None) -> list[str]:
+    """
+    Делит сообщение на строки-траты (по переводам строк, ';' и запятым перед словом).
+
+    Returns:
+        list[str]: Непустые строки без пробелов по краям.
+    """
+    return [line.strip() for line in _BULK_SEPARATOR_RE.split(text or '') if line.strip()]
+
+
+def has_expense_lines(lines: list[str]) -> bool:
+    """Проверяет, похожа ли хотя бы одна строка на трату (есть и слово, и число)."""
+    return any(_EXPENSE_LIKE_RE.search(line) for line in lines)
+
+
+def parse_bulk_expenses(lines: list[str], categories: list[dict]) -> tuple[list, list]:
+    """
+    Разбирает строки-траты по названиям категорий пользователя (без учёта регистра).
+    Название ищется в начале или в конце строки; если подходят несколько категорий,
+    выбирается самая длинная ("еда вне дома 300", а не "еда").
+
+    Args:
+        lines (list[str]): Строки из split_bulk_expenses.
+        categories (list[dict]): Категории пользователя с ключами 'id' и 'name'.
+
+    Returns:
+        tuple[list, list]: Траты — кортежи (номер строки, строка, ID категории, сумма)
+                           и ошибки — кортежи (номер строки, строка, причина).
+    """
+    names = sorted(((category['name'].lower(), category['id']) for category in categories),
+                   key=lambda item: len(item[0]), reverse=True)
+    entries, errors = [], []
+    for number, line in enumerate(lines, start=1):
+        # Разбор идёт по строке в нижнем регистре: позиции названия и суммы в ней согласованы
+        key = line.lower()
+        reason = bulk_expenses_unknown_category if _EXPENSE_LIKE_RE.search(line) else bulk_expenses_bad_line
+        for name, category_id in names:
+            if key.startswith(name):
+                match = _AMOUNT_AFTER_NAME_RE.fullmatch(key, len(name))
+            elif key.endswith(name):
+                match = _AMOUNT_BEFORE_NAME_RE.fullmatch(key, 0, len(key) - len(name))
+            else:
+                continue
+            amount = parse_amount(match.group(1)) if match else None
+            if amount is not None and amount <= BULK_MAX_AMOUNT:
+                entries.append((number, line, category_id, amount))
+                break
+            reason = bulk_expenses_bad_amount
+        else:
+            errors.append((number, line, reason))
+    return entries, errors
+
+
+def bulk_expenses_report(entries: list, errors: list, written: list[tuple[int, float]]) -> str:
+    """
+    Формирует ответ на пакетную запись: итог и ошибки по строкам.
+
+    Args:
+        entries (list): Траты из parse_bulk_expenses.
+        errors (list): Ошибки из parse_bulk_expenses.
+        written (list[tuple[int, float]]): Записанные траты (результат write_down_expenses).
+
+    Returns:
+        str: Текст сообщения.
+    """
+    # Траты, не попавшие в БД, относятся к категориям, удалённым после разбора
+    remaining = Counter(category_id for category_id, _ in written)
+    errors = list(errors)
+    count, total = 0, 0.0
+    for number, line, category_id, amount in entries:
+        if remaining[category_id] > 0:
+            remaining[category_id] -= 1
+            count += 1
+            total += amount
+        else:
+            errors.append((number, line, bulk_expenses_deleted_category))
+
+    report = [bulk_expenses_success.format(count=count, total=total) if count else bulk_expenses_nothing]
+    for number, line, reason in sorted(errors):
+        report.append(bulk_expenses_line_error.format(line=number, text=line[:50], reason=reason))
+    return '\n'.join(report)
@@ -0,0 +1,68 @@
+import io
+import os
+import tempfile
+from datetime import date
+
+from telebot import TeleBot, types
+
+from database.export import export_expenses_csv
+from database.user_data import find_user_id_by_telegram_id
+from messages import error_user_not_found, export_caption, export_empty, export_error
+
+# Размер выгрузки, до которого она хранится в памяти; большие выгрузки переносятся во временный файл
+EXPORT_SPOOL_SIZE = int(os.getenv('EXPORT_SPOOL_SIZE', 1024 * 1024))
+
+
+def handle_export_command(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает команду '/export'.
+    Выгружает историю расходов пользователя в CSV и отправляет её документом.
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (TeleBot): Экземпляр бота.
+    """
+    db_user_id = find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    buffer, stream = open_export_buffer()
+    count = export_expenses_csv(db_user_id, stream)
+    if not count:
+        buffer.close()
+        bot.send_message(chat_id=message.chat.id, text=export_error if count is None else export_empty)
+        return
+
+    sent = bot.send_document(
+        chat_id=message.chat.id,
+        document=finish_export_buffer(stream),
+        visible_file_name=export_file_name(),
+        caption=export_caption.format(count=count)
+    )
+    # Буфер нужен до завершения отправки (и для повтора после ответа 429)
+    sent.add_done_callback(lambda _: buffer.close())
+
+
+def open_export_buffer():
+    """
+    Создаёт буфер выгрузки: в памяти до EXPORT_SPOOL_SIZE байт, дальше во временном файле.
+
+    Returns:
+        tuple: Двоичный буфер и текстовый поток для записи CSV в него
+               (UTF-8 с BOM, чтобы Excel правильно показал кириллицу).
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+    return buffer, io.TextIOWrapper(buffer, encoding='utf-8-sig', newline='')
+
+
+def finish_export_buffer(stream: io.TextIOWrapper):
+    """Завершает запись CSV и возвращает двоичный буфер, перемотанный в начало."""
+    stream.flush()
+    buffer = stream.detach()  # Текстовая обёртка больше не нужна и не должна закрыть буфер
+    buffer.seek(0)
+    return buffer
+
+
+def export_file_name() -> str:
+    return f'expenses_{date.today().isoformat()}.csv'
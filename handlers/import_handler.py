@@ -0,0 +1,173 @@
+import csv
+import io
+from datetime import datetime
+
+from telebot import TeleBot, types
+
+from database.category import is_valid_category_name
+from database.import_expenses import import_expenses
+from database.user_data import find_user_id_by_telegram_id
+from handlers.expenses_handler import BULK_MAX_AMOUNT, parse_amount
+from messages import (error_user_not_found, import_bad_amount,
+                      import_bad_category, import_bad_date, import_bad_row,
+                      import_empty, import_error, import_line_error,
+                      import_missing_columns, import_more_errors,
+                      import_not_csv, import_prompt, import_success,
+                      import_too_many_rows, import_validation_failed)
+from states import UserState
+
+IMPORT_MAX_ROWS = 100_000
+IMPORT_MAX_FILE_SIZE = 20 * 1024 * 1024  # предел скачивания файлов через Bot API
+IMPORT_ERRORS_SHOWN = 10  # ошибок в ответе пользователю
+
+# Названия столбцов файла (без учёта регистра) -> поле импорта
+IMPORT_COLUMNS = {
+    'date': 'date', 'дата': 'date',
+    'category': 'category', 'категория': 'category',
+    'amount': 'amount', 'сумма': 'amount',
+}
+
+# Форматы дат помимо ISO 8601 (2024-05-31, 2024-05-31 18:30:00)
+_DATE_FORMATS = ('%d.%m.%Y', '%d.%m.%Y %H:%M', '%d.%m.%Y %H:%M:%S', '%d/%m/%Y')
+
+
+def handle_import_command(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает команду '/import'.
+    Переводит пользователя в состояние ожидания CSV-файла с историей трат.
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (TeleBot): Экземпляр бота.
+    """
+    bot.set_state(message.chat.id, UserState.WAITING_FOR_IMPORT_FILE)
+    bot.send_message(chat_id=message.chat.id, text=import_prompt)
+
+
+def import_expenses_file(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает CSV-файл в состоянии WAITING_FOR_IMPORT_FILE.
+    Проверяет все строки файла и, если ошибок нет, импортирует их одной транзакцией;
+    иначе сообщает об ошибках по строкам и ждёт исправленный файл.
+
+    Args:
+        message (types.Message): Сообщение с документом.
+        bot (TeleBot): Экземпляр бота.
+    """
+    if not is_csv_document(message.document):
+        bot.send_message(chat_id=message.chat.id, text=import_not_csv)
+        return
+
+    db_user_id = find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        bot.set_state(message.chat.id, UserState.DEFAULT)
+        return
+
+    file_info = bot.get_file(message.document.file_id)
+    rows, errors = parse_import_csv(bot.download_file(file_info.file_path))
+    if errors:
+        bot.send_message(chat_id=message.chat.id, text=import_errors_text(errors))
+        return  # Не сбрасываем состояние, чтобы пользователь мог отправить исправленный файл
+    if not rows:
+        bot.send_message(chat_id=message.chat.id, text=import_empty)
+        return
+
+    report = import_expenses(db_user_id, rows)
+    bot.send_message(chat_id=message.chat.id, text=import_success.format(**report) if report else import_error)
+    bot.set_state(message.chat.id, UserState.DEFAULT)
+
+
+def is_csv_document(document: types.Document | None) -> bool:
+    """Проверяет, что сообщение содержит CSV-файл допустимого размера."""
+    return (document is not None
+            and (document.file_name or '').lower().endswith('.csv')
+            and (document.file_size or 0) <= IMPORT_MAX_FILE_SIZE)
+
+
+def parse_import_date(value: str) -> datetime | None:
+    """
+    Разбирает дату расхода: ISO 8601 или ДД.ММ.ГГГГ (со временем или без).
+
+    Returns:
+        datetime | None: Дата или None, если формат не распознан.
+    """
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_import_csv(data: bytes) -> tuple[list, list]:
+    """
+    Разбирает и проверяет CSV-файл импорта.
+
+    Кодировка — UTF-8 (в том числе с BOM) или Windows-1251, разделитель (',', ';' или табуляция)
+    определяется по строке заголовка. Столбцы ищутся по названиям из IMPORT_COLUMNS,
+    остальные столбцы игнорируются.
+
+    Args:
+        data (bytes): Содержимое файла.
+
+    Returns:
+        tuple[list, list]: Строки — кортежи (номер строки, дата, категория, сумма)
+                           и ошибки — кортежи (номер строки, причина).
+    """
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = data.decode('cp1251')
+
+    header_line = text.split('\n', 1)[0]
+    reader = csv.reader(io.StringIO(text), delimiter=max(',;\t', key=header_line.count))
+    columns = {}
+    for index, name in enumerate(next(reader, [])):
+        field = IMPORT_COLUMNS.get(name.strip().lower())
+        if field is not None:
+            columns.setdefault(field, index)
+    missing = [name for name in ('date', 'category', 'amount') if name not in columns]
+    if missing:
+        return [], [(1, import_missing_columns.format(columns=', '.join(missing)))]
+
+    date_index, category_index, amount_index = columns['date'], columns['category'], columns['amount']
+    rows, errors = [], []
+    for record in reader:
+        if not any(field.strip() for field in record):
+            continue  # Пустые строки (например, в конце файла) пропускаются
+        line = reader.line_num
+        if len(rows) + len(errors) >= IMPORT_MAX_ROWS:
+            errors.append((line, import_too_many_rows.format(max_rows=IMPORT_MAX_ROWS)))
+            break
+        try:
+            date = parse_import_date(record[date_index])
+            category = record[category_index].strip()
+            amount = parse_amount(record[amount_index])
+        except IndexError:
+            errors.append((line, import_bad_row))
+            continue
+
+        if date is None:
+            errors.append((line, import_bad_date))
+        elif amount is None or amount > BULK_MAX_AMOUNT:
+            errors.append((line, import_bad_amount))
+        elif not is_valid_category_name(category):
+            errors.append((line, import_bad_category))
+        else:
+            rows.append((line, date, category, amount))
+    return rows, errors
+
+
+def import_errors_text(errors: list) -> str:
+    """Формирует сообщение об ошибках импорта (не больше IMPORT_ERRORS_SHOWN строк)."""
+    text = [import_validation_failed]
+    text.extend(import_line_error.format(line=line, reason=reason) for line, reason in errors[:IMPORT_ERRORS_SHOWN])
+    if len(errors) > IMPORT_ERRORS_SHOWN:
+        text.append(import_more_errors.format(count=len(errors) - IMPORT_ERRORS_SHOWN))
+    return '\n'.join(text)
@@ -0,0 +1,155 @@
+import re
+from datetime import date
+
+from telebot import TeleBot, types, util
+
+from database.recurring import (create_recurring_expense,
+                                delete_recurring_expense, first_occurrence,
+                                get_recurring_expenses,
+                                materialize_recurring_expenses)
+from database.user_data import (find_user_id_by_telegram_id,
+                                get_user_categories_names_and_ids)
+from handlers.expenses_handler import parse_bulk_expenses
+from inline_keyboard.date_picker import WEEKDAY_NAMES
+from messages import (error_user_not_found, recurring_bad_args,
+                      recurring_daily, recurring_deleted, recurring_error,
+                      recurring_list_header, recurring_list_line,
+                      recurring_monthly, recurring_none, recurring_not_found,
+                      recurring_saved, recurring_usage, recurring_weekly)
+
+RECURRING_FREQUENCY_WORDS = {'ежедневно': 'daily', 'еженедельно': 'weekly', 'ежемесячно': 'monthly'}
+
+# "<категория и сумма> [периодичность [день]]": "аренда 30000 ежемесячно 5", "спорт 1500 еженедельно пн"
+_RECURRING_RE = re.compile(r'(.+?)(?:\s+(ежедневно|еженедельно|ежемесячно)(?:\s+(\S+))?)?')
+_RECURRING_DELETE_RE = re.compile(r'удалить\s+№?(\d+)')
+_MONTH_DAY_RE = re.compile(r'(\d{1,2})(?:-?е|-?го)?')
+
+
+def handle_recurring_command(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает команду '/recurring'.
+    Без аргументов показывает правила регулярных расходов пользователя;
+    '/recurring аренда 30000 ежемесячно 5' создаёт правило (расход за сегодня, если он
+    положен по правилу, записывается сразу), '/recurring удалить 3' удаляет правило.
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя.
+        bot (TeleBot): Экземпляр бота.
+    """
+    db_user_id = find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if db_user_id is None:
+        bot.send_message(chat_id=message.chat.id, text=error_user_not_found)
+        return
+
+    args = util.extract_arguments(message.text or '').strip().lower()
+    if not args:
+        rules = get_recurring_expenses(db_user_id)
+        bot.send_message(chat_id=message.chat.id, text=recurring_error if rules is None else recurring_list_text(rules))
+        return
+
+    rule_id = parse_recurring_delete(args)
+    if rule_id is not None:
+        deleted = delete_recurring_expense(db_user_id, rule_id)
+        text = recurring_error if deleted is None else (recurring_deleted if deleted else recurring_not_found)
+        bot.send_message(chat_id=message.chat.id, text=text.format(id=rule_id))
+        return
+
+    today = date.today()
+    rule = parse_recurring_args(args, get_user_categories_names_and_ids(db_user_id), today)
+    if rule is None:
+        bot.send_message(chat_id=message.chat.id, text=recurring_bad_args)
+        return
+
+    rule_id = create_recurring_expense(db_user_id, rule['category_id'], rule['amount'], rule['frequency'],
+                                       rule['day'], today)
+    if rule_id is None:
+        bot.send_message(chat_id=message.chat.id, text=recurring_error)
+        return
+
+    first_date = first_occurrence(rule['frequency'], rule['day'], today)
+    if first_date <= today:
+        materialize_recurring_expenses(today, user_id=db_user_id)
+    bot.send_message(chat_id=message.chat.id, text=recurring_saved.format(
+        id=rule_id, category=rule['category'], amount=rule['amount'],
+        schedule=schedule_text(rule['frequency'], rule['day']), first_date=first_date
+    ))
+
+
+def parse_recurring_delete(args: str) -> int | None:
+    """Возвращает номер правила из аргументов вида 'удалить 3' или None, если это не удаление."""
+    match = _RECURRING_DELETE_RE.fullmatch(args)
+    return int(match.group(1)) if match else None
+
+
+def parse_recurring_args(args: str, categories: list[dict], today: date) -> dict | None:
+    """
+    Разбирает аргументы команды '/recurring': категорию и сумму (как в пакетной записи трат),
+    периодичность и день. Без периодичности правило ежемесячное; без дня — день недели
+    или число месяца сегодняшней даты.
+
+    Args:
+        args (str): Текст после команды в нижнем регистре.
+        categories (list[dict]): Категории пользователя с ключами 'id' и 'name'.
+        today (date): Сегодняшняя дата.
+
+    Returns:
+        dict | None: Словарь {'category_id', 'category', 'amount', 'frequency', 'day'}
+                     или None, если аргументы не распознаны.
+    """
+    # Категорию и сумму можно написать на разных строках, как в пакетной записи трат
+    match = _RECURRING_RE.fullmatch(' '.join(args.split()))
+    if match is None:
+        return None
+    head, frequency_word, day_text = match.groups()
+    entries, _ = parse_bulk_expenses([head], categories)
+    if not entries:
+        return None
+    _, _, category_id, amount = entries[0]
+
+    frequency = RECURRING_FREQUENCY_WORDS.get(frequency_word, 'monthly')
+    if frequency == 'daily':
+        if day_text is not None:
+            return None
+        day = None
+    elif frequency == 'weekly':
+        weekdays = [name.lower() for name in WEEKDAY_NAMES]
+        if day_text is None:
+            day = today.isoweekday()
+        elif day_text in weekdays:
+            day = weekdays.index(day_text) + 1
+        elif day_text.isdigit() and 1 <= int(day_text) <= 7:
+            day = int(day_text)
+        else:
+            return None
+    else:
+        day_match = _MONTH_DAY_RE.fullmatch(day_text) if day_text is not None else None
+        if day_text is None:
+            day = today.day
+        elif day_match and 1 <= int(day_match.group(1)) <= 31:
+            day = int(day_match.group(1))
+        else:
+            return None
+
+    category = next(item['name'] for item in categories if item['id'] == category_id)
+    return {'category_id': category_id, 'category': category, 'amount': amount, 'frequency': frequency, 'day': day}
+
+
+def schedule_text(frequency: str, day: int | None) -> str:
+    """Периодичность правила словами: 'ежедневно', 'еженедельно, пн', 'ежемесячно, 5-го числа'."""
+    if frequency == 'daily':
+        return recurring_daily
+    if frequency == 'weekly':
+        return recurring_weekly.format(weekday=WEEKDAY_NAMES[day - 1].lower())
+    return recurring_monthly.format(day=day)
+
+
+def recurring_list_text(rules: list[dict]) -> str:
+    """Формирует список правил регулярных расходов (см. database.recurring.get_recurring_expenses)."""
+    if not rules:
+        return f'{recurring_none}\n\n{recurring_usage}'
+    text = [recurring_list_header]
+    text.extend(
+        recurring_list_line.format(schedule=schedule_text(rule['frequency'], rule['day']), **rule)
+        for rule in rules
+    )
+    return '\n'.join(text)
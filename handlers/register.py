@@ -1,240 +1,93 @@
 from telebot import TeleBot
 
+from config import key_board_buttons
+from handlers.budget_handler import handle_budget_command
 from handlers.create_category_handler import (handle_create_category_button,
                                               save_new_category)
 from handlers.delete_category_handler import (
     delete_category, handle_delete_category_button,
     handler_category_selection_for_delete)
 from handlers.expenses_handler import (handle_category_selection_for_expense,
-                                       handle_expense_button, write_expenses)
+                                       handle_expense_button,
+                                       write_bulk_expenses, write_expenses)
+from handlers.export_handler import handle_export_command
+from handlers.import_handler import (handle_import_command,
+                                     import_expenses_file)
+from handlers.recurring_handler import handle_recurring_command
 from handlers.rename_category_handler import (
     handle_category_selection_for_rename, handle_rename_category_button,
     rename_category)
-from handlers.start import echo_msg, handle_command_start
+from handlers.router import Router
+from handlers.start import handle_command_start
 from handlers.statistics_handler import (handle_basic_expenses_button,
+                                         handle_date_picker_callback,
+                                         handle_forecast_button,
                                          handle_statistics_button,
-                                         handle_statistics_interval_callback)
-
-# --- Функции регистрации обработчиков сообщений ---
-
-def register_start_command_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для команды '/start'.
-    """
-    bot.register_message_handler(
-        callback=handle_command_start,
-        commands=['start'],
-        pass_bot=True # Передача экземпляра бота в обработчик
-    )
-
-
-def register_create_category_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для кнопки "💲 Создать категорию".
-    """
-    bot.register_message_handler(
-        callback=handle_create_category_button,
-        func=lambda message: message.text == '💲 Создать категорию', # Фильтр по тексту кнопки
-        pass_bot=True
-    )
-
-
-def register_save_category_name_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для сохранения нового названия категории,
-    когда пользователь находится в соответствующем состоянии.
-    """
-    bot.register_message_handler(
-        callback=save_new_category,
-        # Проверяем, что пользователь находится в состоянии ожидания названия категории,
-        # используя строковое представление состояния.
-        func=lambda message: bot.get_state(message.chat.id) == 'UserState:WAITING_FOR_CATEGORY_NAME',
-        content_types=['text'], # Обрабатываем только текстовые сообщения
-        pass_bot=True
-    )
-
-
-def register_rename_category_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для кнопки "✏️ Переименовать категорию".
-    """
-    bot.register_message_handler(
-        callback=handle_rename_category_button,
-        func=lambda message: message.text == '✏️ Переименовать категорию',
-        pass_bot=True
-    )
-
-
-def register_save_new_category_name_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для сохранения нового названия переименованной категории,
-    когда пользователь находится в соответствующем состоянии.
-    """
-    bot.register_message_handler(
-        callback=rename_category,
-        func=lambda message: bot.get_state(message.chat.id) == 'UserState:WAITING_FOR_NEW_CATEGORY_NAME',
-        content_types=['text'],
-        pass_bot=True
-    )
-
-
-def register_delete_category_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для кнопки "🗑️ Удалить категорию".
-    """
-    bot.register_message_handler(
-        callback=handle_delete_category_button,
-        func=lambda message: message.text == '🗑️ Удалить категорию',
-        pass_bot=True
-    )
-
-
-def register_expense_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для кнопки "✍️ Записать расходы".
-    """
-    bot.register_message_handler(
-        callback=handle_expense_button,
-        func=lambda message: message.text == '✍️ Записать расходы',
-        pass_bot=True
-    )
-
-
-def register_expense_amount_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для сохранения суммы расхода,
-    когда пользователь находится в соответствующем состоянии.
-    """
-    bot.register_message_handler(
-        callback=write_expenses,
-        func=lambda message: bot.get_state(message.chat.id) == 'UserState:WAITING_FOR_EXPENSE_AMOUNT',
-        content_types=['text'],
-        pass_bot=True
-    )
-
-
-def register_statistics_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для кнопки "📊 Статистика".
-    """
-    bot.register_message_handler(
-        callback=handle_statistics_button,
-        func=lambda message: message.text == '📊 Статистика',
-        pass_bot=True
-    )
-
-
-def register_basic_expenses_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для кнопки "📉 Основные траты".
-    """
-    bot.register_message_handler(
-        callback=handle_basic_expenses_button,
-        func=lambda message: message.text == '📉 Основные траты',
-        pass_bot=True
-    )
-
-
-def register_echo_message_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует "эхо" обработчик для всех остальных текстовых сообщений.
-    Должен быть зарегистрирован последним, чтобы не перехватывать другие команды.
-    """
-    bot.register_message_handler(
-        callback=echo_msg,
-        func=lambda message: True, # Обрабатывает любое сообщение
-        pass_bot=True
-    )
-
-
-# --- Функции регистрации обработчиков CallbackQuery (инлайн-кнопки) ---
-
-def register_rename_category_callback_query_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для выбора категории при переименовании.
-    """
-    bot.register_callback_query_handler(
-        callback=handle_category_selection_for_rename,
-        func=lambda query: query.data.startswith('rename_category:'), # Фильтр по префиксу callback_data
-        pass_bot=True
-    )
-
-
-def register_delete_category_selection_callback_query_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для выбора категории при удалении.
-    """
-    bot.register_callback_query_handler(
-        callback=handler_category_selection_for_delete,
-        func=lambda query: query.data.startswith('delete_category:'),
-        pass_bot=True
-    )
-
-
-def register_delete_category_confirmation_callback_query_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для подтверждения/отмены удаления категории.
-    """
-    bot.register_callback_query_handler(
-        callback=delete_category,
-        func=lambda query: query.data.startswith('confirm_delete:') or \
-                           query.data.startswith('cancel_delete:'), # Фильтр для кнопок подтверждения/отмены
-        pass_bot=True
-    )
-
-
-def register_expense_category_callback_query_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для выбора категории при записи расхода.
-    """
-    bot.register_callback_query_handler(
-        callback=handle_category_selection_for_expense,
-        func=lambda query: query.data.startswith('select_expense_category:'),
-        pass_bot=True
-    )
-
-
-def register_statistics_interval_callback_query_handler(bot: TeleBot) -> None:
-    """
-    Регистрирует обработчик для выбора временного интервала для статистики (как общей, так и основных трат).
-    """
-    # Этот обработчик универсален для обоих типов статистики, так как handle_statistics_interval_callback
-    # сама различает их по префиксу 'time_interval_' и 'time_interval_for_basic_expenses_'
-    # Поэтому достаточно одного обработчика, который ловит оба префикса.
-    bot.register_callback_query_handler(
-        callback=handle_statistics_interval_callback,
-        func=lambda query: query.data.startswith('time_interval_'),
-        pass_bot=True
-    )
+                                         handle_statistics_interval_callback,
+                                         handle_statistics_period_text)
+from inline_keyboard.date_picker import DATE_PICKER_PREFIX
+from states import UserState
+
+
+def build_router(bot: TeleBot, sender=None) -> Router:
+    """
+    Создаёт роутер со всеми обработчиками бота.
+
+    Вместо цепочки обработчиков с фильтрами, которые telebot проверяет по очереди
+    для каждого обновления, обработчик находится поиском в таблицах: по команде,
+    по тексту кнопки, по состоянию пользователя или по префиксу callback_data.
+    `sender` (outbound.OutboundBot) передаётся обработчикам вместо бота.
+    """
+    router = Router(bot, sender)
+
+    # --- Команды ---
+    router.command('start', handle_command_start)
+    router.command('export', handle_export_command)
+    router.command('import', handle_import_command)
+    router.command('budget', handle_budget_command)
+    router.command('recurring', handle_recurring_command)
+
+    # --- Кнопки основной клавиатуры (config.key_board_buttons) ---
+    router.button(key_board_buttons['create_category'], handle_create_category_button)
+    router.button(key_board_buttons['rename_category'], handle_rename_category_button)
+    router.button(key_board_buttons['delete_category'], handle_delete_category_button)
+    router.button(key_board_buttons['expenses'], handle_expense_button)
+    router.button(key_board_buttons['statistics'], handle_statistics_button)
+    router.button(key_board_buttons['basic_expenses'], handle_basic_expenses_button)
+    router.button(key_board_buttons['forecast'], handle_forecast_button)
+
+    # --- Обработчики состояний (ввод текста после нажатия кнопки) ---
+    router.state(UserState.WAITING_FOR_CATEGORY_NAME, save_new_category)
+    router.state(UserState.WAITING_FOR_NEW_CATEGORY_NAME, rename_category)
+    router.state(UserState.WAITING_FOR_EXPENSE_AMOUNT, write_expenses)
+    router.state(UserState.WAITING_FOR_IMPORT_FILE, import_expenses_file, documents=True)
+    router.state(UserState.WAITING_FOR_STATISTICS_PERIOD, handle_statistics_period_text)
+    router.state(UserState.WAITING_FOR_BASIC_EXPENSES_PERIOD, handle_statistics_period_text)
+
+    # --- Обработчики CallbackQuery (инлайн-кнопки), по префиксу callback_data ---
+    router.callback('rename_category:', handle_category_selection_for_rename)
+    router.callback('delete_category:', handler_category_selection_for_delete)
+    router.callback('confirm_delete:', delete_category)
+    router.callback('cancel_delete:', delete_category)
+    router.callback('select_expense_category:', handle_category_selection_for_expense)
+    # Один обработчик для обоих видов статистики: handle_statistics_interval_callback
+    # сама различает префиксы 'time_interval_' и 'time_interval_for_basic_expenses_'
+    router.callback('time_interval_', handle_statistics_interval_callback)
+    router.callback(DATE_PICKER_PREFIX, handle_date_picker_callback)
+
+    # Остальные сообщения: пакетная запись трат ("еда 350, такси 420") или "эхо"
+    router.default_message_handler = write_bulk_expenses
+
+    return router
 
 
 # --- Основная функция для регистрации всех хендлеров ---
 
-def register_all_handlers(bot: TeleBot) -> None:
+def register_all_handlers(bot: TeleBot, sender=None) -> Router:
     """
     Регистрирует все обработчики сообщений и callback-запросов бота.
+    В telebot регистрируются только два обработчика роутера, остальное он выбирает сам.
     """
-    register_start_command_handler(bot)
-
-    register_create_category_message_handler(bot)
-    register_save_category_name_handler(bot) # Это обработчик состояния
-
-    register_rename_category_message_handler(bot)
-    register_save_new_category_name_message_handler(bot) # Это обработчик состояния
-
-    register_delete_category_message_handler(bot)
-
-    register_expense_message_handler(bot)
-    register_expense_amount_message_handler(bot) # Это обработчик состояния
-
-    register_statistics_message_handler(bot)
-    register_basic_expenses_message_handler(bot)
-
-    # Регистрируем обработчики CallbackQuery (InlineKeyboardMarkup кнопки)
-    register_rename_category_callback_query_handler(bot)
-    register_delete_category_selection_callback_query_handler(bot)
-    register_delete_category_confirmation_callback_query_handler(bot)
-    register_expense_category_callback_query_handler(bot)
-    register_statistics_interval_callback_query_handler(bot)
-
-    register_echo_message_handler(bot)
+    router = build_router(bot, sender)
+    router.attach()
+    return router
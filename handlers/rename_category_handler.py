@@ -1,7 +1,7 @@
 from telebot import TeleBot, types
 
 from database.category import is_valid_category_name, rename_category_in_db
-from inline_keyboard.categories import category_kb
+from inline_keyboard.categories import category_kb, parse_category_id
 from messages import (choose_category, choose_category_error, delete_msg_error,
                       rename_category_error, rename_category_msg,
                       rename_category_success, valid_category_name)
@@ -38,10 +38,9 @@ def handle_category_selection_for_rename(query: types.CallbackQuery, bot: TeleBo
     """
     bot.answer_callback_query(query.id) # Отвечаем на callback_query, чтобы убрать индикатор загрузки на кнопке
 
-    try:
-        # Извлекаем ID категории из callback_data (формат 'префикс:ID')
-        category_id = int(query.data.split(':')[1])
-    except (ValueError, IndexError):
+    # Извлекаем ID категории из callback_data (формат 'префикс:ID')
+    category_id = parse_category_id(query.data)
+    if category_id is None:
         print(f"ERROR: Неверный формат callback data в handle_category_selection_for_rename: {query.data}")
         bot.send_message(query.message.chat.id, choose_category_error) # Сообщение об ошибке
         return
@@ -0,0 +1,182 @@
+from telebot import TeleBot, types, util
+
+
+class PrefixTrie:
+    """
+    Префиксное дерево для поиска обработчика по началу строки (callback_data).
+    Поиск идёт по символам строки и возвращает значение самого длинного
+    зарегистрированного префикса, поэтому его стоимость не зависит от числа префиксов.
+    """
+
+    _VALUE = object()  # Ключ узла, под которым хранится значение префикса
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, prefix: str, value) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._VALUE] = value
+
+    def longest_prefix_value(self, text: str, default=None):
+        """
+        Возвращает значение самого длинного префикса строки `text` или `default`.
+        """
+        node = self._root
+        found = node.get(self._VALUE, default)
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._VALUE in node:
+                found = node[self._VALUE]
+        return found
+
+
+class Router:
+    """
+    Диспетчер обновлений: определяет обработчик за один шаг вместо последовательной
+    проверки фильтров всех зарегистрированных обработчиков.
+
+    Сообщения маршрутизируются в порядке приоритета:
+        1. команда ('/start') — поиск в словаре;
+        2. текст кнопки основной клавиатуры — поиск в словаре;
+        3. текущее состояние FSM — одно обращение к хранилищу состояний и поиск в словаре;
+        4. обработчик по умолчанию.
+    Документы (например, CSV-файл импорта) передаются только обработчикам состояний,
+    зарегистрированным с documents=True.
+    Callback-запросы маршрутизируются по самому длинному префиксу callback_data.
+
+    Если задан `sender` (outbound.OutboundBot), обработчики получают его вместо бота,
+    и их запросы к Bot API проходят через очередь отправки с ограничением частоты.
+    """
+
+    # Типы сообщений, которые telebot передаёт роутеру
+    content_types = ['text', 'document']
+
+    def __init__(self, bot: TeleBot, sender=None):
+        self.bot = bot
+        self.sender = sender
+        self.commands = {}
+        self.buttons = {}
+        self.states = {}
+        self.document_states = set()
+        self.callbacks = PrefixTrie()
+        self.default_message_handler = None
+
+    def command(self, command: str, handler) -> None:
+        self.commands[command] = handler
+
+    def button(self, text: str, handler) -> None:
+        self.buttons[text] = handler
+
+    def state(self, state, handler, documents: bool = False) -> None:
+        # Хранилище состояний возвращает строковое имя вида 'UserState:WAITING_FOR_CATEGORY_NAME'
+        self.states[state.name] = handler
+        if documents:
+            self.document_states.add(state.name)
+
+    def callback(self, prefix: str, handler) -> None:
+        self.callbacks.insert(prefix, handler)
+
+    def resolve_message(self, message: types.Message):
+        """
+        Находит обработчик сообщения.
+
+        Args:
+            message (types.Message): Входящее сообщение.
+
+        Returns:
+            Callable | None: Обработчик или None, если сообщение обрабатывать не нужно.
+        """
+        handler = self._resolve_text(message)
+        if handler is None and self.states:
+            # Единственное обращение к хранилищу состояний за всё сообщение
+            handler = self._state_handler(message, self.bot.get_state(message.chat.id))
+        return self._with_default(message, handler)
+
+    def _state_handler(self, message: types.Message, state):
+        if message.text is None and state not in self.document_states:
+            return None
+        return self.states.get(state)
+
+    def _with_default(self, message: types.Message, handler):
+        if handler is not None:
+            return handler
+        # Обработчик по умолчанию работает с текстом; документы вне сценариев игнорируются
+        return self.default_message_handler if message.text is not None else None
+
+    def _resolve_text(self, message: types.Message):
+        """Ищет обработчик по команде или тексту кнопки (без обращения к хранилищу состояний)."""
+        text = message.text
+        if text:
+            if text.startswith('/'):
+                handler = self.commands.get(util.extract_command(text))
+                if handler is not None:
+                    return handler
+            return self.buttons.get(text)
+        return None
+
+    def resolve_callback(self, query: types.CallbackQuery):
+        """
+        Находит обработчик callback-запроса по префиксу callback_data.
+
+        Returns:
+            Callable | None: Обработчик или None, если префикс не зарегистрирован.
+        """
+        return self.callbacks.longest_prefix_value(query.data or '')
+
+    def dispatch_message(self, message: types.Message, bot: TeleBot) -> None:
+        handler = self.resolve_message(message)
+        if handler is not None:
+            handler(message, self.sender or bot)
+
+    def dispatch_callback(self, query: types.CallbackQuery, bot: TeleBot) -> None:
+        handler = self.resolve_callback(query)
+        if handler is not None:
+            handler(query, self.sender or bot)
+        else:
+            print(f"Нет обработчика для callback_data: {query.data}")
+
+    def attach(self) -> None:
+        """
+        Регистрирует роутер в боте: по одному обработчику для сообщений и callback-запросов.
+        """
+        self.bot.register_message_handler(
+            callback=self.dispatch_message,
+            func=lambda message: True,
+            content_types=self.content_types,
+            pass_bot=True
+        )
+        self.bot.register_callback_query_handler(
+            callback=self.dispatch_callback,
+            func=lambda query: True,
+            pass_bot=True
+        )
+
+
+class AsyncRouter(Router):
+    """
+    Роутер для AsyncTeleBot (асинхронный режим бота, см. async_main.py).
+    Таблицы маршрутизации и порядок приоритета те же, что у Router,
+    но обработчики — корутины, а хранилище состояний читается через await.
+    """
+
+    async def resolve_message(self, message: types.Message):
+        handler = self._resolve_text(message)
+        if handler is None and self.states:
+            handler = self._state_handler(message, await self.bot.get_state(message.chat.id))
+        return self._with_default(message, handler)
+
+    async def dispatch_message(self, message: types.Message, bot) -> None:
+        handler = await self.resolve_message(message)
+        if handler is not None:
+            await handler(message, self.sender or bot)
+
+    async def dispatch_callback(self, query: types.CallbackQuery, bot) -> None:
+        handler = self.resolve_callback(query)
+        if handler is not None:
+            await handler(query, self.sender or bot)
+        else:
+            print(f"Нет обработчика для callback_data: {query.data}")
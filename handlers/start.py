@@ -28,19 +28,29 @@ def handle_command_start(message: types.Message, bot: TeleBot):
     # Устанавливаем состояние пользователя по умолчанию (DEFAULT)
     bot.set_state(message.chat.id, UserState.DEFAULT)
 
+    # Отправляем приветственное сообщение с основной клавиатурой
+    bot.send_message(
+        chat_id=message.chat.id,
+        text=messages.start_message,
+        reply_markup=main_menu_markup()
+    )
+
+
+def main_menu_markup() -> types.ReplyKeyboardMarkup:
+    """
+    Создаёт основную клавиатуру бота с кнопками меню (config.key_board_buttons).
+
+    Returns:
+        types.ReplyKeyboardMarkup: Объект клавиатуры.
+    """
     # Создаем объект ReplyKeyboardMarkup для отображения кнопок меню
     markup = types.ReplyKeyboardMarkup(resize_keyboard=True)
     # Добавляем кнопки в разметку
     markup.add(key_board_buttons['create_category'], key_board_buttons['rename_category'])
     markup.add(key_board_buttons['delete_category'], key_board_buttons['expenses'])
     markup.add(key_board_buttons['basic_expenses'], key_board_buttons['statistics'])
-
-    # Отправляем приветственное сообщение с основной клавиатурой
-    bot.send_message(
-        chat_id=message.chat.id,
-        text=messages.start_message,
-        reply_markup=markup
-    )
+    markup.add(key_board_buttons['forecast'])
+    return markup
 
 
 def echo_msg(message: types.Message, bot: TeleBot):
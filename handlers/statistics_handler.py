@@ -1,17 +1,39 @@
-import os
+import math
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime
 
 from telebot import TeleBot, types
 
-from charts.statistics_charts import generate_expense_charts
-from charts.top_categories_charts import generate_top_categories_pie
-from config import days_for_statistics
+from charts.chart_cache import (chart_cache_key, forget_charts,
+                                get_cached_charts, remember_charts)
+from charts.renderer import ChartRendererBusy, render_chart
+from config import CHARTS_DEBUG_DIR
 from database.expenses import get_top_categories_and_other_sum
-from database.statistics import full_statistics
+from database.statistics import (comparison_statistics, daily_totals,
+                                 full_statistics)
 from database.user_data import find_user_id_by_telegram_id
+from inline_keyboard.date_picker import (create_date_picker_markup,
+                                         parse_date_picker_callback)
 from inline_keyboard.statistics import create_time_interval_markup
-from messages import (error_user_not_found, select_statistics_interval,
-                      statistics_error)
-from time_interval import get_time_interval
+from messages import (charts_busy, charts_timeout, error_user_not_found,
+                      select_statistics_interval,
+                      statistics_comparison_caption, statistics_custom_period,
+                      statistics_error, statistics_forecast_caption,
+                      statistics_period_caption,
+                      statistics_period_end, statistics_period_error)
+from states import UserState
+from time_interval import (comparison_intervals, date_range_interval,
+                           forecast_interval, interval_label,
+                           parse_date_range, resolve_interval)
+
+# Состояния ввода произвольного периода текстом -> тип графика
+PERIOD_STATES = {
+    UserState.WAITING_FOR_STATISTICS_PERIOD.name: 'expenses',
+    UserState.WAITING_FOR_BASIC_EXPENSES_PERIOD.name: 'top_categories',
+}
+
+MEDIA_GROUP_MAX = 10  # Telegram принимает в sendMediaGroup от 2 до 10 картинок
 
 
 def handle_statistics_button(message: types.Message, bot: TeleBot):
@@ -25,8 +47,9 @@ def handle_statistics_button(message: types.Message, bot: TeleBot):
         bot (TeleBot): Экземпляр бота.
     """
     # Создаем инлайн-клавиатуру с вариантами временных интервалов
-    # Префикс 'time_interval_' будет использоваться для идентификации callback_data
-    time_interval_markup = create_time_interval_markup('time_interval_')
+    # Префикс 'time_interval_' будет использоваться для идентификации callback_data;
+    # общей статистике доступно и сравнение с предыдущим периодом
+    time_interval_markup = create_time_interval_markup('time_interval_', with_comparison=True)
     bot.send_message(
         chat_id=message.chat.id,
         text=select_statistics_interval,
@@ -54,6 +77,19 @@ def handle_basic_expenses_button(message: types.Message, bot: TeleBot):
     )
 
 
+def handle_forecast_button(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает нажатие кнопки "📈 Прогноз".
+    Строит по дневным итогам за последний год график трат со скользящими средними
+    и прогнозом суммы на конец месяца (см. forecast.build_forecast).
+
+    Args:
+        message (types.Message): Объект сообщения от пользователя, содержащий текст кнопки.
+        bot (TeleBot): Экземпляр бота.
+    """
+    send_statistics(bot, message.chat.id, message.from_user.id, 'forecast', forecast_interval())
+
+
 def handle_statistics_interval_callback(query: types.CallbackQuery, bot: TeleBot):
     """
     Универсальный обработчик выбора временного интервала для статистики.
@@ -66,28 +102,24 @@ def handle_statistics_interval_callback(query: types.CallbackQuery, bot: TeleBot
     """
     bot.answer_callback_query(query.id) # Отвечаем на callback_query, чтобы убрать индикатор загрузки
 
-    data_str = query.data
-
     # Определяем, какой тип статистики был запрошен, исходя из префикса callback_data
-    if data_str.startswith('time_interval_for_basic_expenses_'):
-        interval = data_str.replace('time_interval_for_basic_expenses_', '')
-        is_basic = True # Это запрос на основные траты (круговая диаграмма)
-    elif data_str.startswith('time_interval_'):
-        interval = data_str.replace('time_interval_', '')
-        is_basic = False # Это запрос на общую статистику (столбчатые диаграммы)
-    else:
+    parsed = parse_statistics_callback(query.data)
+    if parsed is None:
         # Если префикс не распознан, выходим из функции
-        print(f"Неизвестный callback_data в handle_statistics_interval_callback: {data_str}")
+        print(f"Неизвестный callback_data в handle_statistics_interval_callback: {query.data}")
         return
+    interval_key, chart_type = parsed
 
-    # Получаем начальную и конечную даты на основе выбранного интервала
-    dates = get_time_interval(days_for_statistics[interval])
-    start_date, end_date = dates['start_date'], dates['end_date']
-
-    # Находим внутренний ID пользователя в БД
-    db_user_id = find_user_id_by_telegram_id(telegram_id=query.from_user.id)
-    if db_user_id is None:
-        bot.send_message(chat_id=query.message.chat.id, text=error_user_not_found)
+    if interval_key == 'custom':
+        # Произвольный период: ждём его текстом или выбора дат в календаре
+        today = date.today()
+        bot.set_state(query.message.chat.id, period_state(chart_type))
+        bot.edit_message_text(
+            chat_id=query.message.chat.id,
+            message_id=query.message.message_id,
+            text=statistics_custom_period,
+            reply_markup=create_date_picker_markup(chart_type, today.year, today.month)
+        )
         return
 
     # Удаляем сообщение с выбором интервала, чтобы не загромождать чат
@@ -96,52 +128,294 @@ def handle_statistics_interval_callback(query: types.CallbackQuery, bot: TeleBot
     except Exception as e:
         print(f"Ошибка удаления сообщения в handle_statistics_interval_callback: {e}")
 
-    if is_basic:
-        # 🔸 Обработка запроса на "Основные траты" (круговая диаграмма)
-        data = get_top_categories_and_other_sum(db_user_id, start_date, end_date)
-        if not data or (not data['top_categories'] and data['other_sum'] == 0.0): # Проверяем наличие данных
-            bot.send_message(query.message.chat.id, statistics_error) # Если данных нет, сообщаем
-            return
+    if chart_type == 'comparison':
+        interval, previous = comparison_intervals(interval_key)
+    else:
+        interval, previous = resolve_interval(interval_key), None
+    send_statistics(bot, query.message.chat.id, query.from_user.id, chart_type, interval, previous)
+
+
+def handle_date_picker_callback(query: types.CallbackQuery, bot: TeleBot):
+    """
+    Обрабатывает нажатия в календаре выбора произвольного периода:
+    листание месяцев, выбор начала и конца периода.
+    После выбора конца периода отправляет статистику.
+
+    Args:
+        query (types.CallbackQuery): Объект callback-запроса от кнопки календаря.
+        bot (TeleBot): Экземпляр бота.
+    """
+    bot.answer_callback_query(query.id)
 
-        # Генерируем круговую диаграмму и получаем путь к файлу
-        chart_path = generate_top_categories_pie(data)
-        if not chart_path or not os.path.exists(chart_path): # Проверяем, что файл создан
-            bot.send_message(query.message.chat.id, statistics_error)
+    parsed = parse_date_picker_callback(query.data)
+    if parsed is None:
+        print(f"Неизвестный callback_data в handle_date_picker_callback: {query.data}")
+        return
+    chart_type, start, action, value = parsed
+    chat_id, message_id = query.message.chat.id, query.message.message_id
+
+    try:
+        if action == 'm':
+            # Листание календаря: выбор начала периода сохраняется
+            bot.edit_message_reply_markup(
+                chat_id=chat_id, message_id=message_id,
+                reply_markup=create_date_picker_markup(chart_type, int(value[:4]), int(value[4:]), start)
+            )
             return
+        if action != 'd':
+            return  # Пустые кнопки (название месяца, дни недели)
+        day = datetime.strptime(value, '%Y%m%d').date()
+    except ValueError:
+        print(f"Некорректная дата в handle_date_picker_callback: {query.data}")
+        return
+
+    if start is None:
+        # Выбрано начало периода: показываем тот же месяц для выбора конца
+        bot.edit_message_text(
+            chat_id=chat_id, message_id=message_id,
+            text=statistics_period_end.format(start=f'{day:%d.%m.%Y}'),
+            reply_markup=create_date_picker_markup(chart_type, day.year, day.month, day)
+        )
+        return
+
+    if bot.get_state(chat_id) in PERIOD_STATES:
+        bot.set_state(chat_id, UserState.DEFAULT)
+    bot.delete_message(chat_id=chat_id, message_id=message_id)
+    send_statistics(bot, chat_id, query.from_user.id, chart_type, date_range_interval(start, day))
+
+
+def handle_statistics_period_text(message: types.Message, bot: TeleBot):
+    """
+    Обрабатывает произвольный период, введённый текстом
+    (состояния WAITING_FOR_STATISTICS_PERIOD и WAITING_FOR_BASIC_EXPENSES_PERIOD).
+
+    Args:
+        message (types.Message): Сообщение с периодом, например "01.05.2024 - 31.05.2024".
+        bot (TeleBot): Экземпляр бота.
+    """
+    interval = parse_date_range(message.text)
+    if interval is None:
+        bot.send_message(chat_id=message.chat.id, text=statistics_period_error)
+        return  # Состояние не сбрасываем: пользователь может ввести период ещё раз
 
-        # Отправляем фотографию графика пользователю
-        with open(chart_path, 'rb') as img:
-            bot.send_photo(query.message.chat.id, img)
-        os.remove(chart_path) # Удаляем временный файл графика
+    chart_type = PERIOD_STATES.get(bot.get_state(message.chat.id), 'expenses')
+    bot.set_state(message.chat.id, UserState.DEFAULT)
+    send_statistics(bot, message.chat.id, message.from_user.id, chart_type, interval)
+
+
+def period_state(chart_type: str):
+    """Возвращает состояние ввода произвольного периода для типа графика."""
+    return (UserState.WAITING_FOR_BASIC_EXPENSES_PERIOD if chart_type == 'top_categories'
+            else UserState.WAITING_FOR_STATISTICS_PERIOD)
+
+
+def send_statistics(bot: TeleBot, chat_id: int, telegram_id: int, chart_type: str,
+                    interval: dict, previous: dict | None = None) -> None:
+    """
+    Получает статистику за период, строит и отправляет графики.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        telegram_id (int): Telegram ID пользователя.
+        chart_type (str): 'expenses' (столбчатые диаграммы), 'top_categories' (круговая диаграмма),
+                          'comparison' (сравнение с периодом `previous`) или 'forecast' (прогноз трат
+                          по дневным итогам периода).
+        interval (dict): Период {'start_date', 'end_date'} (см. time_interval).
+        previous (dict | None): Период для сравнения (только для 'comparison').
+    """
+    start_date, end_date = interval['start_date'], interval['end_date']
+
+    # Находим внутренний ID пользователя в БД
+    db_user_id = find_user_id_by_telegram_id(telegram_id=telegram_id)
+    if db_user_id is None:
+        bot.send_message(chat_id=chat_id, text=error_user_not_found)
+        return
 
+    if chart_type == 'top_categories':
+        # 🔸 Обработка запроса на "Основные траты" (круговая диаграмма)
+        data = get_top_categories_and_other_sum(db_user_id, start_date, end_date)
+    elif chart_type == 'comparison':
+        # ⚖️ Сравнение с предыдущим периодом (оба периода — одним запросом)
+        data = comparison_statistics(db_user_id, interval, previous)
+        data.update(current_label=interval_label(interval), previous_label=interval_label(previous))
+    elif chart_type == 'forecast':
+        # 📈 Прогноз: дневные итоги периода, вычисления — в процессе рендеринга
+        data = daily_totals(db_user_id, interval)
     else:
         # 🔹 Обработка запроса на "Статистику" (столбчатые диаграммы)
         data = full_statistics(db_user_id, start_date, end_date)
-        # Проверяем наличие данных: общая сумма > 0 или есть категории с расходами
-        if not data or (data['total_expenses'] == 0.0 and not data['expenses_by_category']):
-            bot.send_message(query.message.chat.id, statistics_error)
-            return
 
-        # Генерируем столбчатые диаграммы и получаем список путей к файлам
-        charts_paths = generate_expense_charts(data)
+    if not has_statistics_data(chart_type, data):
+        bot.send_message(chat_id, statistics_error) # Если данных нет, сообщаем
+        return
 
-        if not charts_paths: # Если графики не были сгенерированы (например, нет данных)
-            bot.send_message(query.message.chat.id, statistics_error)
-            return
+    caption = statistics_caption(interval, previous, chart_type)
+
+    # Если такие же графики по тем же данным уже отправлялись, повторно используем их
+    cache_key = chart_cache_key(chart_type, data)
+    cached_charts = get_cached_charts(cache_key)
+    if cached_charts:
+        _send_charts(bot, chat_id, cached_charts, cache_key, caption)
+        return
+
+    # Строим графики в пуле рендеринга; поток обработчика не ждёт результата,
+    # графики отправятся из колбэка, как только будут готовы
+    try:
+        render_chart(
+            chart_type, data, CHARTS_DEBUG_DIR,
+            on_result=lambda charts: _send_charts(bot, chat_id, charts, cache_key, caption),
+            on_error=lambda error: _handle_chart_error(bot, chat_id, error)
+        )
+    except ChartRendererBusy:
+        # Очередь рендеринга переполнена: просим пользователя повторить позже
+        bot.send_message(chat_id, charts_busy)
+
+
+def statistics_caption(interval: dict, previous: dict | None = None, chart_type: str = 'expenses') -> str:
+    """Подпись к графикам: период статистики и, для сравнения, предыдущий период."""
+    if chart_type == 'forecast':
+        return statistics_forecast_caption.format(period=interval_label(interval))
+    if previous is None:
+        return statistics_period_caption.format(period=interval_label(interval))
+    return statistics_comparison_caption.format(period=interval_label(interval), previous=interval_label(previous))
+
+
+def parse_statistics_callback(data_str: str) -> tuple[str, str] | None:
+    """
+    Разбирает callback_data кнопки выбора интервала статистики.
+
+    Args:
+        data_str (str): callback_data вида 'time_interval_<интервал>' (общая статистика,
+                        столбчатые диаграммы) или 'time_interval_for_basic_expenses_<интервал>'
+                        (основные траты, круговая диаграмма). Ключ 'compare:<период>'
+                        в общей статистике означает сравнение с предыдущим периодом,
+                        'compare:<период>:ly' — с тем же периодом год назад.
+
+    Returns:
+        tuple[str, str] | None: Пара (ключ периода — 'custom' или ключ time_interval.resolve_interval,
+                                тип графика из charts.renderer.CHART_TYPES) или None, если формат не распознан.
+    """
+    if data_str.startswith('time_interval_for_basic_expenses_'):
+        interval, chart_type = data_str.replace('time_interval_for_basic_expenses_', ''), 'top_categories'
+    elif data_str.startswith('time_interval_compare:'):
+        interval, chart_type = data_str.replace('time_interval_compare:', ''), 'comparison'
+    elif data_str.startswith('time_interval_'):
+        interval, chart_type = data_str.replace('time_interval_', ''), 'expenses'
+    else:
+        return None
+    if interval == 'custom':
+        # Произвольный период выбирается для обычной статистики и основных трат, но не для сравнения
+        return (interval, chart_type) if chart_type != 'comparison' else None
+    if resolve_interval(interval) is None:
+        return None
+    return interval, chart_type
+
+
+def has_statistics_data(chart_type: str, data: dict) -> bool:
+    """
+    Проверяет, есть ли в статистике данные для построения графика.
+
+    Args:
+        chart_type (str): 'top_categories', 'expenses', 'comparison' или 'forecast'.
+        data (dict): Результат get_top_categories_and_other_sum, full_statistics,
+                     comparison_statistics или daily_totals.
+
+    Returns:
+        bool: True, если есть хотя бы один расход.
+    """
+    if not data:
+        return False
+    if chart_type == 'top_categories':
+        return bool(data['top_categories']) or data['other_sum'] != 0.0
+    if chart_type in ('comparison', 'forecast'):
+        return bool(data['categories'])
+    # Общая сумма > 0 или есть категории с расходами
+    return data['total_expenses'] != 0.0 or bool(data['expenses_by_category'])
 
-        if len(charts_paths) == 1:
-            # Если только один график, отправляем его как фото
-            with open(charts_paths[0], 'rb') as img:
-                bot.send_photo(query.message.chat.id, img)
-            os.remove(charts_paths[0]) # Удаляем временный файл
-        else:
-            # Если несколько графиков, отправляем их группой
-            opened_images = [open(path, 'rb') for path in charts_paths]
-            media = [types.InputMediaPhoto(img) for img in opened_images]
-            bot.send_media_group(query.message.chat.id, media)
-            # Закрываем все открытые файловые дескрипторы
-            for img_file in opened_images:
-                img_file.close()
-            # Удаляем все временные файлы графиков
-            for path in charts_paths:
-                os.remove(path)
+
+def _send_charts(bot: TeleBot, chat_id: int, charts, cache_key: str, caption: str | None = None) -> None:
+    """
+    Ставит графики в очередь отправки и сохраняет их в кэш графиков после отправки.
+
+    Args:
+        bot (TeleBot): Экземпляр бота (outbound.OutboundBot: методы отправки возвращают Future).
+        chat_id (int): ID чата.
+        charts (io.BytesIO | list): Один график или список графиков: PNG-буферы
+                                    или file_id ранее отправленных картинок.
+        cache_key (str): Ключ кэша графиков (см. charts.chart_cache.chart_cache_key).
+        caption (str | None): Подпись к графикам (период статистики).
+    """
+    if not isinstance(charts, list):
+        charts = [charts]
+
+    if not charts: # Если графики не были сгенерированы (например, нет данных)
+        bot.send_message(chat_id, statistics_error)
+        return
+
+    # Один график отправляется как фото, несколько — группами (подпись группы берётся из первой картинки)
+    futures = [
+        bot.send_photo(chat_id, group[0], caption=caption if i == 0 else None) if len(group) == 1
+        else bot.send_media_group(chat_id, chart_media(group, caption if i == 0 else None))
+        for i, group in enumerate(chart_groups(charts))
+    ]
+
+    pending = [len(futures)]
+    lock = threading.Lock()
+
+    def on_sent(_future: Future) -> None:
+        with lock:
+            pending[0] -= 1
+            if pending[0]:
+                return
+        _remember_sent_charts(futures, cache_key, charts)
+
+    for future in futures:
+        future.add_done_callback(on_sent)
+
+
+def chart_groups(charts: list) -> list[list]:
+    """
+    Делит графики на группы для отправки: не больше MEDIA_GROUP_MAX в группе и поровну,
+    чтобы при нескольких группах ни в одной не оказалось единственной картинки
+    (11 графиков — группы по 6 и 5, а не 10 и 1).
+    """
+    count = math.ceil(len(charts) / MEDIA_GROUP_MAX)
+    size, extra = divmod(len(charts), count) if count else (0, 0)
+    groups, start = [], 0
+    for i in range(count):
+        end = start + size + (i < extra)
+        groups.append(charts[start:end])
+        start = end
+    return groups
+
+
+def chart_media(charts: list, caption: str | None) -> list[types.InputMediaPhoto]:
+    """Формирует группу картинок для send_media_group с подписью у первой картинки."""
+    return [types.InputMediaPhoto(chart, caption=caption if i == 0 else None) for i, chart in enumerate(charts)]
+
+
+def _remember_sent_charts(futures: list[Future], cache_key: str, charts: list) -> None:
+    """Сохраняет отправленные графики в кэш или удаляет запись, если отправка не удалась."""
+    if any(future.exception() is not None for future in futures):
+        # Закэшированный file_id мог стать недействительным: следующий запрос построит графики заново
+        forget_charts(cache_key)
+        return
+    sent_messages = []
+    for future in futures:
+        sent = future.result()
+        sent_messages.extend(sent if isinstance(sent, list) else [sent])
+    remember_charts(cache_key, charts, sent_messages)
+
+
+def _handle_chart_error(bot: TeleBot, chat_id: int, error: BaseException) -> None:
+    """
+    Сообщает пользователю об ошибке или превышении времени построения графиков.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        error (BaseException): Исключение, возникшее при рендеринге.
+    """
+    print(f"Ошибка построения графиков: {error!r}")
+    bot.send_message(chat_id, charts_timeout if isinstance(error, TimeoutError) else statistics_error)
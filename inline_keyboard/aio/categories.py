@@ -0,0 +1,27 @@
+from telebot import types
+from telebot.types import InlineKeyboardMarkup
+
+from database.aio.user_data import (find_user_id_by_telegram_id,
+                                    get_user_categories_names_and_ids)
+from inline_keyboard.categories import get_category_markup
+
+
+async def category_kb(message: types.Message, callback_prefix: str) -> InlineKeyboardMarkup:
+    """
+    Асинхронная версия inline_keyboard.categories.category_kb: клавиатура с активными
+    категориями пользователя. Использует тот же кэш клавиатур markup_cache.
+
+    Args:
+        message (types.Message): Объект сообщения (используется для получения ID пользователя).
+        callback_prefix (str): Префикс callback_data кнопок категорий.
+
+    Returns:
+        InlineKeyboardMarkup: Объект инлайн-клавиатуры.
+    """
+    user_id_in_db = await find_user_id_by_telegram_id(telegram_id=message.from_user.id)
+    if user_id_in_db is None:
+        # Если пользователь не найден в БД, возвращаем пустую клавиатуру
+        return InlineKeyboardMarkup()
+
+    categories = await get_user_categories_names_and_ids(user_id_in_db)
+    return get_category_markup(user_id_in_db, categories, callback_prefix)
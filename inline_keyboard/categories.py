@@ -1,15 +1,23 @@
 from telebot import types
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from database.user_data import (find_user_id_by_telegram_id,
+from cache import MISSING, TTLCache
+from database.user_data import (CATEGORIES_CACHE_SIZE, CATEGORIES_CACHE_TTL,
+                                find_user_id_by_telegram_id,
                                 get_user_categories_names_and_ids)
 
+# Кэш готовых клавиатур: (user_id, callback_prefix) -> (список категорий, клавиатура).
+# Клавиатура переиспользуется, только пока get_user_categories_names_and_ids возвращает
+# тот же объект списка, то есть пока кэш категорий пользователя не был сброшен.
+markup_cache = TTLCache(maxsize=CATEGORIES_CACHE_SIZE * 3, ttl=CATEGORIES_CACHE_TTL)
+
 
 def category_kb(message: types.Message, callback_prefix: str) -> InlineKeyboardMarkup:
     """
     Создаёт инлайн-клавиатуру с кнопками для выбора категорий пользователя.
     Предлагает создать новую категорию, если у пользователя их нет.
     Отображает только активные (неудаленные) категории.
+    Готовая клавиатура кэшируется для пары (пользователь, префикс).
 
     Args:
         message (types.Message): Объект сообщения, от которого исходит запрос (используется для получения ID пользователя).
@@ -19,16 +27,70 @@ def category_kb(message: types.Message, callback_prefix: str) -> InlineKeyboardM
     Returns:
         InlineKeyboardMarkup: Объект инлайн-клавиатуры.
     """
-    markup = InlineKeyboardMarkup()
-
     # Находим внутренний ID пользователя в базе данных по его Telegram ID
     user_id_in_db = find_user_id_by_telegram_id(telegram_id=message.from_user.id)
     if user_id_in_db is None:
         # Если пользователь не найден в БД, возвращаем пустую клавиатуру
-        return markup
+        return InlineKeyboardMarkup()
 
-    # Получаем список АКТИВНЫХ категорий пользователя из базы данных
+    # Получаем список АКТИВНЫХ категорий пользователя (из кэша или базы данных)
     categories = get_user_categories_names_and_ids(user_id_in_db)
+    return get_category_markup(user_id_in_db, categories, callback_prefix)
+
+
+def get_category_markup(user_id: int, categories: list[dict], callback_prefix: str) -> InlineKeyboardMarkup:
+    """
+    Возвращает клавиатуру категорий пользователя из кэша markup_cache или строит новую.
+    Общая часть синхронной и асинхронной (inline_keyboard/aio) версий category_kb.
+
+    Args:
+        user_id (int): Внутренний ID пользователя.
+        categories (list[dict]): Список категорий, полученный get_user_categories_names_and_ids.
+        callback_prefix (str): Префикс callback_data кнопок.
+
+    Returns:
+        InlineKeyboardMarkup: Объект инлайн-клавиатуры.
+    """
+    cache_key = (user_id, callback_prefix)
+    cached = markup_cache.get(cache_key)
+    if cached is not MISSING and cached[0] is categories:
+        return cached[1]
+
+    markup = _build_category_markup(categories, callback_prefix)
+    # При ошибке БД возвращается новый пустой список, не попадающий в кэш категорий,
+    # поэтому такая клавиатура никогда не будет переиспользована
+    markup_cache.set(cache_key, (categories, markup))
+    return markup
+
+
+def parse_category_id(callback_data: str) -> int | None:
+    """
+    Извлекает ID категории из callback_data кнопки (формат 'префикс:ID').
+
+    Args:
+        callback_data (str): Данные callback-запроса.
+
+    Returns:
+        int | None: ID категории или None, если формат некорректен.
+    """
+    try:
+        return int(callback_data.split(':')[1])
+    except (ValueError, IndexError, AttributeError):
+        return None
+
+
+def _build_category_markup(categories: list[dict], callback_prefix: str) -> InlineKeyboardMarkup:
+    """
+    Строит инлайн-клавиатуру по списку категорий.
+
+    Args:
+        categories (list[dict]): Список категорий с ключами 'id' и 'name'.
+        callback_prefix (str): Префикс callback_data кнопок.
+
+    Returns:
+        InlineKeyboardMarkup: Объект инлайн-клавиатуры.
+    """
+    markup = InlineKeyboardMarkup()
 
     if not categories:
         # Если у пользователя нет активных категорий, предлагаем создать новую
@@ -0,0 +1,77 @@
+import calendar
+from datetime import date
+
+from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+# Инлайн-календарь для выбора произвольного периода статистики.
+# Состояние выбора хранится в самой callback_data, поэтому календарь не требует
+# хранилища и продолжает работать после перезапуска бота:
+#   '<префикс><тип графика>:<начало ГГГГММДД или ->:<действие>:<значение>'
+# Действия: 'm' — показать месяц ГГГГММ, 'd' — выбрать день ГГГГММДД, 'n' — пустая кнопка.
+DATE_PICKER_PREFIX = 'stats_calendar:'
+DATE_PICKER_CHART_TYPES = ('expenses', 'top_categories')
+
+MONTH_NAMES = ('Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь',
+               'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь')
+WEEKDAY_NAMES = ('Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс')
+
+
+def create_date_picker_markup(chart_type: str, year: int, month: int,
+                              start: date | None = None) -> InlineKeyboardMarkup:
+    """
+    Создаёт инлайн-календарь на месяц для выбора начала или конца периода.
+
+    Args:
+        chart_type (str): Тип графика (ключ charts.renderer.CHART_TYPES), для которого выбирается период.
+        year (int): Показываемый год.
+        month (int): Показываемый месяц.
+        start (date | None): Уже выбранное начало периода (None — выбирается начало).
+
+    Returns:
+        InlineKeyboardMarkup: Объект инлайн-клавиатуры.
+    """
+    prefix = f"{DATE_PICKER_PREFIX}{chart_type}:{f'{start:%Y%m%d}' if start else '-'}:"
+    noop = f'{prefix}n:'
+
+    previous_year, previous_month = (year, month - 1) if month > 1 else (year - 1, 12)
+    next_year, next_month = (year, month + 1) if month < 12 else (year + 1, 1)
+
+    markup = InlineKeyboardMarkup()
+    markup.row(
+        InlineKeyboardButton('◀️', callback_data=f'{prefix}m:{previous_year}{previous_month:02d}'),
+        InlineKeyboardButton(f'{MONTH_NAMES[month - 1]} {year}', callback_data=noop),
+        InlineKeyboardButton('▶️', callback_data=f'{prefix}m:{next_year}{next_month:02d}'),
+    )
+    markup.row(*(InlineKeyboardButton(name, callback_data=noop) for name in WEEKDAY_NAMES))
+    for week in calendar.monthcalendar(year, month):
+        markup.row(*(
+            InlineKeyboardButton(_day_text(year, month, day, start), callback_data=f'{prefix}d:{year}{month:02d}{day:02d}')
+            if day else InlineKeyboardButton(' ', callback_data=noop)
+            for day in week
+        ))
+    return markup
+
+
+def _day_text(year: int, month: int, day: int, start: date | None) -> str:
+    # Выбранное начало периода выделяется
+    return f'[{day}]' if start == date(year, month, day) else str(day)
+
+
+def parse_date_picker_callback(data: str) -> tuple[str, date | None, str, str] | None:
+    """
+    Разбирает callback_data кнопки календаря.
+
+    Returns:
+        tuple[str, date | None, str, str] | None: (тип графика, начало периода или None, действие, значение)
+                                                  или None, если формат не распознан.
+    """
+    if not data.startswith(DATE_PICKER_PREFIX):
+        return None
+    try:
+        chart_type, start, action, value = data[len(DATE_PICKER_PREFIX):].split(':')
+        start = None if start == '-' else date(int(start[:4]), int(start[4:6]), int(start[6:]))
+    except ValueError:
+        return None
+    if chart_type not in DATE_PICKER_CHART_TYPES:
+        return None
+    return chart_type, start, action, value
@@ -1,9 +1,9 @@
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from config import kb_for_statistics
+from config import kb_for_comparison, kb_for_statistics
 
 
-def create_time_interval_markup(callback_prefix: str) -> InlineKeyboardMarkup:
+def create_time_interval_markup(callback_prefix: str, with_comparison: bool = False) -> InlineKeyboardMarkup:
     """
     Создаёт инлайн-клавиатуру с кнопками выбора временного промежутка для статистики.
 
@@ -12,15 +12,18 @@ def create_time_interval_markup(callback_prefix: str) -> InlineKeyboardMarkup:
                                Это позволяет обработчикам различать, для какого типа статистики
                                был выбран интервал (например, 'time_interval_' для общей статистики,
                                'time_interval_for_basic_expenses_' для основных трат).
+        with_comparison (bool): Добавить строки кнопок сравнения с предыдущим периодом
+                                и с тем же периодом год назад (config.kb_for_comparison).
 
     Returns:
         InlineKeyboardMarkup: Объект инлайн-клавиатуры с кнопками временных интервалов.
     """
     markup = InlineKeyboardMarkup()
-    for interval_key, button_text in kb_for_statistics.items(): # Итерируемся по элементам словаря
-        button = InlineKeyboardButton(
-            text=button_text,
-            callback_data=f'{callback_prefix}{interval_key}'
-        )
-        markup.row(button) # Каждая кнопка в новой строке
+    rows = [*kb_for_statistics, *kb_for_comparison] if with_comparison else kb_for_statistics
+    for row in rows: # Каждый словарь — отдельная строка клавиатуры
+        buttons = [
+            InlineKeyboardButton(text=button_text, callback_data=f'{callback_prefix}{interval_key}')
+            for interval_key, button_text in row.items()
+        ]
+        markup.row(*buttons)
     return markup
@@ -1,14 +1,104 @@
+import hmac
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
 
-from flask import Flask
+from flask import Flask, abort, request
+from telebot import TeleBot, types
 
 app = Flask(__name__)
 
+# Заголовок, в котором Telegram передаёт secret_token, указанный при setWebhook
+SECRET_TOKEN_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
 @app.route('/')
 def home():
     return 'Bot is running!'
 
+
+class WebhookWorkers:
+    """
+    Ограниченный пул обработки входящих обновлений.
+
+    Принимает не больше `max_pending` обновлений одновременно (выполняемые + ожидающие).
+    Если пул заполнен, обновление не принимается: вебхук отвечает 503, и Telegram
+    повторит доставку позже — так нагрузка не копится в памяти процесса.
+    """
+
+    def __init__(self, bot: TeleBot, workers: int, max_pending: int):
+        self.bot = bot
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='webhook')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, update: types.Update) -> bool:
+        """
+        Ставит обновление в обработку.
+
+        Returns:
+            bool: True, если обновление принято, False, если пул заполнен.
+        """
+        if not self._slots.acquire(blocking=False):
+            return False
+        self._executor.submit(self._process, update)
+        return True
+
+    def _process(self, update: types.Update) -> None:
+        try:
+            self.bot.process_new_updates([update])
+        except Exception as e:
+            print(f"Ошибка обработки обновления {update.update_id}: {e}")
+        finally:
+            self._slots.release()
+
+
+def enable_webhook(bot: TeleBot, path: str, secret_token: str | None, workers: int, max_pending: int) -> None:
+    """
+    Регистрирует в Flask-приложении маршрут для приёма обновлений Telegram.
+
+    Локально маршрут можно проверить, отправив записанное обновление:
+        curl -X POST http://localhost:5000/<path> \\
+             -H 'Content-Type: application/json' \\
+             -H 'X-Telegram-Bot-Api-Secret-Token: <secret>' \\
+             -d @update.json
+
+    Args:
+        bot (TeleBot): Экземпляр бота (в режиме вебхука создаётся с threaded=False:
+                       обработчики выполняются в пуле WebhookWorkers).
+        path (str): Секретный путь маршрута, например '/webhook/<случайная строка>'.
+        secret_token (str | None): Ожидаемое значение заголовка X-Telegram-Bot-Api-Secret-Token.
+                                   None — заголовок не проверяется (только для локальной отладки).
+        workers (int): Количество потоков обработки обновлений.
+        max_pending (int): Максимальное количество принятых, но не обработанных обновлений.
+    """
+    pool = WebhookWorkers(bot, workers, max_pending)
+
+    def receive_update():
+        if secret_token is not None:
+            received = request.headers.get(SECRET_TOKEN_HEADER, '')
+            # Сравнение за постоянное время, чтобы секрет нельзя было подобрать по времени ответа
+            if not hmac.compare_digest(received.encode(), secret_token.encode()):
+                abort(403)
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or 'update_id' not in payload:
+            abort(400)
+
+        try:
+            update = types.Update.de_json(payload)
+        except Exception as e:
+            # Некорректное тело не исправится при повторной доставке: отвечаем 400, а не 500
+            print(f"Некорректное обновление {payload.get('update_id')}: {e}")
+            abort(400)
+
+        if not pool.submit(update):
+            abort(503)  # Пул заполнен: Telegram повторит доставку
+        return ''
+
+    app.add_url_rule(path, endpoint='telegram_webhook', view_func=receive_update, methods=['POST'])
+
+
 def run():
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
 
@@ -1,48 +1,142 @@
-import threading
-import time
+"""
+Синхронный режим бота: TeleBot и пул соединений psycopg2.
 
-import telebot
-from telebot.storage import StateMemoryStorage
+Запуск: python main.py.
+Процессы отрисовки графиков (ProcessPoolExecutor со 'spawn', см. charts/renderer.py)
+заново импортируют этот модуль как __mp_main__. Поэтому на уровне модуля ничего
+не создаётся, а telebot, Flask и слой БД импортируются внутри функций: процесс
+отрисовки загружает только стек графиков.
+"""
+from config import (BOT_MODE, BOT_TOKEN, CLEANUP_SCHEDULE, RECURRING_SCHEDULE,
+                    SCHEDULER_JITTER, STATS_SCHEDULE, WEBHOOK_DROP_PENDING,
+                    WEBHOOK_MAX_PENDING, WEBHOOK_PATH, WEBHOOK_SECRET,
+                    WEBHOOK_URL, WEBHOOK_WORKERS)
 
-from config import BOT_TOKEN
-from database.clean_old_categories import delete_old_deleted_categories
-from handlers.register import register_all_handlers
-from keep_alive import keep_alive
 
-# Инициализируем хранилище состояний FSM
-storage = StateMemoryStorage()
+def create_bot():
+    """
+    Создаёт хранилище состояний FSM, бота и очередь отправки и регистрирует все обработчики.
+
+    Returns:
+        tuple: (bot, storage, outbound).
+    """
+    import telebot
+
+    from handlers.register import register_all_handlers
+    from outbound import OutboundBot, OutboundDispatcher
+    from state_storage import create_state_storage
+
+    # Хранилище состояний FSM: в памяти или в PostgreSQL, см. STATE_STORAGE
+    storage = create_state_storage()
+
+    # В режиме вебхука обработчики выполняются в ограниченном пуле keep_alive.WebhookWorkers,
+    # поэтому собственный (неограниченный) пул потоков бота не используется
+    bot = telebot.TeleBot(BOT_TOKEN, state_storage=storage, threaded=BOT_MODE != 'webhook')
+
+    # Запросы обработчиков к Bot API проходят через очередь отправки с ограничением частоты
+    outbound = OutboundDispatcher(bot)
+    register_all_handlers(bot, OutboundBot(bot, outbound))
+    return bot, storage, outbound
+
+
+def create_scheduler(storage, outbound):
+    """
+    Создаёт планировщик фоновых задач: очистку и запись регулярных расходов выполняет
+    одна реплика, метрики выводит каждая.
+    """
+    from database.clean_old_categories import delete_old_deleted_categories
+    from database.connection import get_pool_stats
+    from database.recurring import materialize_recurring_expenses
+    from database.states import purge_idle_states
+    from database.user_data import user_id_cache
+    from scheduler import Scheduler
+    from state_storage import STATE_IDLE_TTL, STATE_STORAGE
 
-# Создаём экземпляр бота с токеном и FSM
-bot = telebot.TeleBot(BOT_TOKEN, state_storage=storage)
+    scheduler = Scheduler()
 
+    def report_stats():
+        """Выводит метрики пула соединений, кэшей и фоновых задач."""
+        print(f'[i] Пул соединений с БД: {get_pool_stats()}')
+        print(f'[i] Кэш состояний чатов: {storage.stats()}')
+        print(f'[i] Кэш ID пользователей: {user_id_cache.stats()}')
+        print(f'[i] Очередь отправки: {outbound.stats()}')
+        print(f'[i] Фоновые задачи: {scheduler.stats()}')
 
-def register_handlers():
-    """Регистрирует все обработчики команд, сообщений и состояний."""
-    register_all_handlers(bot)
+    def purge_idle_chat_states():
+        """Удаляет из таблицы bot_states состояния давно неактивных чатов."""
+        print(f'Удалено неактивных состояний чатов: {purge_idle_states(STATE_IDLE_TTL)}')
 
+    scheduler.add_job('clean_old_categories', CLEANUP_SCHEDULE, delete_old_deleted_categories, jitter=SCHEDULER_JITTER)
+    if STATE_STORAGE == 'postgres':
+        scheduler.add_job('purge_idle_states', CLEANUP_SCHEDULE, purge_idle_chat_states, jitter=SCHEDULER_JITTER)
+    scheduler.add_job('recurring_expenses', RECURRING_SCHEDULE, materialize_recurring_expenses, jitter=SCHEDULER_JITTER)
+    scheduler.add_job('report_stats', STATS_SCHEDULE, report_stats, exclusive=False)
+    return scheduler
 
-register_handlers()
 
+def register_webhook(bot, url: str) -> None:
+    """
+    Регистрирует вебхук в Telegram, только если он ещё не указывает на этот адрес
+    (или число соединений отличается от WEBHOOK_WORKERS). Реплики за балансировщиком
+    стартуют с одинаковыми настройками: повторная регистрация при каждом перезапуске
+    не нужна, а накопленные в Telegram обновления по умолчанию не сбрасываются.
+    """
+    info = bot.get_webhook_info()
+    if info.url == url and info.max_connections == WEBHOOK_WORKERS:
+        print(f'[i] Вебхук уже зарегистрирован, ожидающих обновлений: {info.pending_update_count}')
+        return
+    bot.set_webhook(
+        url=url,
+        secret_token=WEBHOOK_SECRET,
+        max_connections=WEBHOOK_WORKERS,
+        drop_pending_updates=WEBHOOK_DROP_PENDING
+    )
+    print('[i] Вебхук зарегистрирован')
 
-def start_cleanup_scheduler():
+
+def start_webhook(bot):
     """
-    Запускает фоновый поток, который ежедневно удаляет
-    старые удалённые категории из базы данных.
+    Запускает приём обновлений через вебхук: маршрут обслуживается Flask-приложением
+    из keep_alive.py, а при заданном WEBHOOK_URL вебхук регистрируется в Telegram.
+    Публичный вебхук без WEBHOOK_SECRET не запускается: иначе любой, кто знает путь,
+    мог бы прислать поддельное обновление от имени любого пользователя.
     """
-    def job():
-        while True:
-            try:
-                delete_old_deleted_categories()
-            except Exception as e:
-                print(f'[!] Ошибка при очистке категорий: {e}')
-            time.sleep(24 * 60 * 60)  # запуск раз в сутки
+    from keep_alive import enable_webhook, run
+
+    if WEBHOOK_URL and not WEBHOOK_SECRET:
+        raise SystemExit('[!] WEBHOOK_URL задан без WEBHOOK_SECRET: вебхук не запущен.')
+    if not WEBHOOK_SECRET:
+        print('[!] WEBHOOK_SECRET не задан: заголовок секрета вебхука не проверяется (только локальный режим).')
+    enable_webhook(bot, WEBHOOK_PATH, WEBHOOK_SECRET or None, WEBHOOK_WORKERS, WEBHOOK_MAX_PENDING)
+
+    if WEBHOOK_URL:
+        register_webhook(bot, WEBHOOK_URL.rstrip('/') + WEBHOOK_PATH)
+    else:
+        print(f'[i] WEBHOOK_URL не задан: обновления принимаются только локально по пути {WEBHOOK_PATH}')
+
+    run()  # Flask-сервер в основном потоке
+
+
+def main():
+    from charts.renderer import prewarm_charts_in_background
+    from database.migrations import apply_migrations
+    from keep_alive import keep_alive
+
+    # Приводим схему БД к актуальной версии до начала обработки обновлений
+    if not apply_migrations():
+        raise SystemExit('[!] Не удалось применить миграции базы данных.')
+    bot, storage, outbound = create_bot()
+    create_scheduler(storage, outbound).start()
+    # Стек графиков (Matplotlib) не импортируется при старте: загружаем его в фоне,
+    # параллельно с началом обработки обновлений
+    prewarm_charts_in_background()
 
-    t = threading.Thread(target=job)
-    t.daemon = True  # не мешает завершению основной программы
-    t.start()
+    if BOT_MODE == 'webhook':
+        start_webhook(bot)
+    else:
+        keep_alive()
+        bot.infinity_polling(skip_pending=True)
 
 
 if __name__ == '__main__':
-    start_cleanup_scheduler()
-    keep_alive()
-    bot.infinity_polling(skip_pending=True)
+    main()
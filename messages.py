@@ -31,11 +31,95 @@ write_down_expense_success = "Записал 💾"
 enter_amount_error = "Введи сумму корректно (например: 2500 или 1500.50)"
 write_down_expense_error = "Не удалось записать трату. Попробуй снова."
 
+bulk_expenses_success = "Записал трат: {count} на сумму {total:.2f} 💾"
+bulk_expenses_nothing = "Ни одной траты не записано."
+bulk_expenses_line_error = "Строка {line}: «{text}» — {reason}"
+bulk_expenses_unknown_category = "категория не найдена"
+bulk_expenses_bad_amount = "некорректная сумма"
+bulk_expenses_deleted_category = "категория удалена"
+bulk_expenses_bad_line = "ожидается «категория сумма»"
+bulk_expenses_too_many_lines = "Можно записать не больше {max_lines} трат за раз."
+
 error_user_not_found = "Не удалось найти твои данные. Пожалуйста, начни с команды /start."
 error_category_not_found = "Категория не найдена."
 
 select_statistics_interval = "Выбери период:"
 statistics_interval_error = "Ошибка при выборе периода 😕"
 statistics_error = "Не удалось получить статистику. Попробуй позже."
+statistics_custom_period = (
+    "Введи период текстом, например «01.05.2024 - 31.05.2024», или выбери начало периода в календаре:"
+)
+statistics_period_end = "Начало периода: {start}. Теперь выбери конец:"
+statistics_period_error = "Не получилось разобрать период 😕 Введи две даты, например «01.05.2024 - 31.05.2024»."
+statistics_period_caption = "Период: {period}"
+statistics_comparison_caption = "Период: {period}\nСравнение с: {previous}"
+statistics_forecast_caption = "📈 Прогноз трат по данным за {period}"
+charts_busy = "Сейчас строится слишком много графиков ⏳ Попробуй через минуту."
+charts_timeout = "Графики строятся слишком долго 😕 Попробуй позже."
+
+export_caption = "Твои траты: {count} шт. 📄"
+export_empty = "Пока нечего выгружать: трат ещё нет."
+export_error = "Не удалось выгрузить траты. Попробуй позже."
+
+import_prompt = (
+    "Отправь CSV-файл с тратами. Нужны столбцы date (дата), category (категория) и amount (сумма), "
+    "разделитель — запятая или точка с запятой. Дата — 2024-05-31 или 31.05.2024.\n"
+    "Недостающие категории создам сам, а уже записанные траты пропущу."
+)
+import_not_csv = "Нужен CSV-файл (.csv) размером до 20 МБ."
+import_validation_failed = "Файл не импортирован, ничего не записано. Исправь ошибки и отправь файл снова:"
+import_line_error = "Строка {line}: {reason}"
+import_more_errors = "…и ещё ошибок: {count}"
+import_missing_columns = "нет столбцов: {columns}"
+import_bad_row = "не хватает значений"
+import_bad_date = "некорректная дата"
+import_bad_amount = "некорректная сумма"
+import_bad_category = "название категории должно быть от 1 до 50 символов"
+import_too_many_rows = "больше {max_rows} строк"
+import_empty = "В файле нет трат."
+import_success = (
+    "Импортировано трат: {imported} из {rows} (уже записанных: {duplicates}), новых категорий: {categories_created}.\n"
+    "Скорость: {rows_per_sec:.0f} строк/с."
+)
+import_error = "Не удалось импортировать траты. Попробуй позже."
+
+budget_usage = (
+    "Месячные бюджеты:\n"
+    "/budget 50000 — бюджет на все траты\n"
+    "/budget еда 10000 — бюджет категории\n"
+    "/budget еда 0 — удалить бюджет\n"
+    "Предупрежу, когда потрачено 80% и 100% бюджета."
+)
+budget_list_header = "Бюджеты на {month}:"
+budget_list_line = "{name}: {spent:.2f} из {limit:.2f} ₽ ({percent}%)"
+budget_overall_name = "Все траты"
+budget_none = "Бюджетов пока нет."
+budget_saved = "Бюджет «{name}» на месяц: {limit:.2f} ₽ ✅"
+budget_deleted = "Бюджет «{name}» удалён."
+budget_not_found = "Бюджета «{name}» нет."
+budget_bad_args = "Не понял 😕 Напиши сумму или категорию и сумму, например «/budget еда 10000»."
+budget_error = "Не удалось сохранить бюджет. Попробуй позже."
+budget_load_error = "Не удалось загрузить бюджеты. Попробуй позже."
+budget_alert_warning = "⚠️ Потрачено {percent}% бюджета «{name}»: {spent:.2f} из {limit:.2f} ₽."
+budget_alert_exceeded = "🚨 Бюджет «{name}» превышен: {spent:.2f} из {limit:.2f} ₽."
+
+recurring_usage = (
+    "Регулярные расходы записываются сами:\n"
+    "/recurring аренда 30000 ежемесячно 5 — каждый месяц 5-го числа\n"
+    "/recurring спорт 1500 еженедельно пн — каждую неделю\n"
+    "/recurring кофе 200 ежедневно — каждый день\n"
+    "/recurring удалить 3 — удалить правило №3"
+)
+recurring_list_header = "Регулярные расходы:"
+recurring_list_line = "№{id} {category}: {amount:.2f} ₽ — {schedule}, следующая запись {next_date:%d.%m.%Y}"
+recurring_none = "Регулярных расходов пока нет."
+recurring_saved = "Регулярный расход №{id} сохранён: {category} {amount:.2f} ₽ — {schedule}. Первая запись: {first_date:%d.%m.%Y}."
+recurring_deleted = "Регулярный расход №{id} удалён. Уже записанные траты остались."
+recurring_not_found = "Регулярного расхода №{id} нет."
+recurring_bad_args = "Не понял 😕 Напиши категорию, сумму и периодичность, например «/recurring аренда 30000 ежемесячно 5»."
+recurring_error = "Не удалось сохранить регулярный расход. Попробуй позже."
+recurring_daily = "ежедневно"
+recurring_weekly = "еженедельно, {weekday}"
+recurring_monthly = "ежемесячно, {day}-го числа"
 
 valid_category_name = "Название категории не должно превышать 50 символов"
@@ -0,0 +1,490 @@
+import asyncio
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from telebot import TeleBot, types
+from telebot.apihelper import ApiTelegramException
+
+# Очереди отправки (lanes): задачи более приоритетной очереди отправляются первыми
+INTERACTIVE = 0  # ответы пользователю на его действия
+BACKGROUND = 1  # фоновые рассылки (уведомления, сводки)
+
+# Ограничения Telegram (можно переопределить через переменные окружения)
+OUTBOUND_GLOBAL_RATE = float(os.getenv('OUTBOUND_GLOBAL_RATE', 30))  # сообщений в секунду на бота
+OUTBOUND_CHAT_RATE = float(os.getenv('OUTBOUND_CHAT_RATE', 1))  # сообщений в секунду в один чат
+OUTBOUND_CHAT_BURST = int(os.getenv('OUTBOUND_CHAT_BURST', 3))  # допустимая короткая серия в один чат
+OUTBOUND_WORKERS = int(os.getenv('OUTBOUND_WORKERS', 8))  # одновременных запросов к Bot API
+OUTBOUND_MAX_RETRIES = 5  # повторов после ответа 429
+# Сколько удаление сообщения ждёт следующую отправку в тот же чат, чтобы объединиться с ней
+OUTBOUND_COALESCE_WINDOW = 0.3
+
+# Методы Bot API, которые проходят через очередь отправки
+QUEUED_METHODS = ('send_message', 'send_photo', 'send_media_group', 'send_document', 'delete_message',
+                  'edit_message_text')
+
+# Сигнатуры методов: аргументы задачи приводятся к именованным, чтобы их можно было разбирать
+_SIGNATURES = {name: inspect.signature(getattr(TeleBot, name)) for name in QUEUED_METHODS}
+
+# Параметры send_message, которые можно перенести в edit_message_text
+_EDITABLE_SEND_ARGS = frozenset(('chat_id', 'text', 'parse_mode', 'entities', 'disable_web_page_preview',
+                                 'reply_markup'))
+
+
+class TokenBucket:
+    """
+    Ведро токенов: допускает серию до `capacity` запросов подряд
+    и в среднем не более `rate` запросов в секунду.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float, cost: float = 1) -> float:
+        """Возвращает, сколько секунд осталось до появления `cost` токенов (0 — можно сейчас)."""
+        self._refill(now)
+        cost = min(cost, self.capacity)
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def take(self, now: float, cost: float = 1) -> None:
+        self._refill(now)
+        self.tokens -= min(cost, self.capacity)
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class OutboundTask:
+    """Вызов метода Bot API в очереди отправки; результат передаётся в `future`."""
+
+    __slots__ = ('method', 'kwargs', 'lane', 'future', 'created', 'retries', 'coalesce')
+
+    def __init__(self, method: str, kwargs: dict, lane: int, future, created: float):
+        self.method = method
+        self.kwargs = kwargs
+        self.lane = lane
+        self.future = future
+        self.created = created
+        self.retries = 0
+        self.coalesce = True  # False после неудачной попытки объединения
+
+    @property
+    def chat_id(self):
+        return self.kwargs['chat_id']
+
+    @property
+    def cost(self) -> int:
+        # Альбом из N фотографий — это N сообщений
+        return len(self.kwargs['media']) if self.method == 'send_media_group' else 1
+
+
+def make_task(method: str, args: tuple, kwargs: dict, lane: int, future, now: float) -> OutboundTask:
+    """Создаёт задачу, приводя позиционные аргументы вызова к именованным."""
+    bound = _SIGNATURES[method].bind(None, *args, **kwargs)
+    bound.arguments.pop('self')
+    call_kwargs = dict(bound.arguments)
+    call_kwargs.update(call_kwargs.pop('kwargs', {}))
+    return OutboundTask(method, call_kwargs, lane, future, now)
+
+
+def can_coalesce(delete: OutboundTask, send: OutboundTask) -> bool:
+    """
+    Проверяет, можно ли заменить удаление сообщения и следующую за ним отправку текста
+    одним редактированием удаляемого сообщения (один запрос и один токен вместо двух).
+    Редактирование поддерживает только инлайн-клавиатуру.
+    """
+    return (delete.coalesce and send.coalesce
+            and send.method == 'send_message'
+            and send.lane == delete.lane
+            and _EDITABLE_SEND_ARGS.issuperset(send.kwargs)
+            and isinstance(send.kwargs.get('reply_markup'), (types.InlineKeyboardMarkup, type(None))))
+
+
+def coalesced_call(delete: OutboundTask, send: OutboundTask) -> tuple[str, dict]:
+    """Возвращает вызов edit_message_text, заменяющий пару удаление + отправка."""
+    return 'edit_message_text', {**send.kwargs, 'message_id': delete.kwargs['message_id']}
+
+
+def retry_after(error: BaseException) -> float | None:
+    """
+    Возвращает паузу из ответа 429 Too Many Requests (parameters.retry_after)
+    или None, если ошибка другая.
+    """
+    if isinstance(error, ApiTelegramException) and error.error_code == 429:
+        return float(error.result_json.get('parameters', {}).get('retry_after', 1))
+    return None
+
+
+def rewind_files(kwargs: dict) -> None:
+    """Перематывает буферы файлов в начало перед повторной отправкой."""
+    for value in kwargs.values():
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            item = getattr(item, 'media', item)  # types.InputMedia*
+            if hasattr(item, 'seek'):
+                item.seek(0)
+
+
+class OutboundQueue:
+    """
+    Очередь исходящих запросов к Bot API без собственных потоков (её обслуживают
+    OutboundDispatcher и AsyncOutboundDispatcher).
+
+    - Задачи каждого чата выполняются по порядку и не более одной одновременно.
+    - Запрос уходит, только если есть токены в общем ведре (OUTBOUND_GLOBAL_RATE)
+      и в ведре чата (OUTBOUND_CHAT_RATE, серия до OUTBOUND_CHAT_BURST).
+    - Задачи очереди INTERACTIVE выбираются раньше BACKGROUND; внутри очереди чаты
+      обслуживаются по кругу, поэтому один активный чат не задерживает остальных.
+    - После ответа 429 чат не обслуживается retry_after секунд.
+    - Удаление сообщения, за которым следует отправка текста в тот же чат,
+      выполняется одним edit_message_text (см. can_coalesce).
+
+    Все методы принимают текущее время `now` (time.monotonic()) и не потокобезопасны.
+    """
+
+    def __init__(self, global_rate: float = OUTBOUND_GLOBAL_RATE, chat_rate: float = OUTBOUND_CHAT_RATE,
+                 chat_burst: int = OUTBOUND_CHAT_BURST, coalesce_window: float = OUTBOUND_COALESCE_WINDOW):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.coalesce_window = coalesce_window
+        self.global_bucket = TokenBucket(global_rate, global_rate, time.monotonic())
+        self.lanes = (OrderedDict(), OrderedDict())  # очередь -> {chat_id: deque задач}
+        self.chat_buckets = {}
+        self.blocked = {}  # chat_id -> момент, до которого чат не обслуживается (после 429)
+        self.busy = set()  # чаты, запрос в которые выполняется сейчас
+        self.pending = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+
+    def put(self, task: OutboundTask, front: bool = False) -> None:
+        tasks = self.lanes[task.lane].setdefault(task.chat_id, deque())
+        if front:
+            tasks.appendleft(task)  # повтор после 429 сохраняет порядок сообщений чата
+        else:
+            tasks.append(task)
+        self.pending += 1
+
+    def block(self, chat_id, until: float) -> None:
+        self.blocked[chat_id] = max(until, self.blocked.get(chat_id, 0.0))
+        self.rate_limited += 1
+
+    def done(self, chat_id) -> None:
+        self.busy.discard(chat_id)
+
+    def pop(self, now: float) -> tuple[list | None, float | None]:
+        """
+        Выбирает следующий запрос.
+
+        Returns:
+            tuple[list | None, float | None]: Задачи одного запроса (одна или пара "удаление + отправка")
+                                              и None либо None и время ожидания в секундах
+                                              (None — ждать нечего, пока не придут новые задачи).
+        """
+        wait = None
+        for lane in self.lanes:
+            for chat_id, tasks in lane.items():
+                if chat_id in self.busy:
+                    continue
+                delay = self.blocked.get(chat_id, 0.0) - now
+                batch = None
+                if delay <= 0:
+                    batch, delay = self._batch(tasks, now)
+                if batch is not None:
+                    cost = 1 if len(batch) > 1 else batch[0].cost
+                    bucket = self._chat_bucket(chat_id, now)
+                    delay = max(bucket.delay(now, cost), self.global_bucket.delay(now, cost))
+                    if delay <= 0:
+                        bucket.take(now, cost)
+                        self.global_bucket.take(now, cost)
+                        for _ in batch:
+                            tasks.popleft()
+                        if tasks:
+                            lane.move_to_end(chat_id)
+                        else:
+                            del lane[chat_id]
+                        self.pending -= len(batch)
+                        self.busy.add(chat_id)
+                        self.blocked.pop(chat_id, None)
+                        self.sent += 1
+                        self.coalesced += len(batch) - 1
+                        return batch, None
+                wait = delay if wait is None else min(wait, delay)
+        self._sweep(now)
+        return None, wait
+
+    def _batch(self, tasks: deque, now: float) -> tuple[list | None, float]:
+        head = tasks[0]
+        if head.method == 'delete_message' and head.coalesce:
+            if len(tasks) > 1:
+                return ([head, tasks[1]] if can_coalesce(head, tasks[1]) else [head]), 0.0
+            hold = head.created + self.coalesce_window - now
+            if hold > 0:
+                return None, hold  # ждём, не последует ли отправка в тот же чат
+        return [head], 0.0
+
+    def _chat_bucket(self, chat_id, now: float) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, now)
+        return bucket
+
+    def _sweep(self, now: float) -> None:
+        # Полное ведро равносильно отсутствующему: такие вёдра простаивающих чатов удаляются
+        if len(self.chat_buckets) > 2 * self.pending + 1000:
+            self.chat_buckets = {chat_id: bucket for chat_id, bucket in self.chat_buckets.items()
+                                 if not bucket.is_full(now)}
+
+    def stats(self) -> dict:
+        """Возвращает счётчики очереди."""
+        return {
+            'pending': self.pending,
+            'in_flight': len(self.busy),
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'rate_limited': self.rate_limited,
+        }
+
+
+class OutboundDispatcher:
+    """
+    Отправляет запросы из OutboundQueue пулом потоков (OUTBOUND_WORKERS).
+    Потоки запускаются при первой задаче.
+
+    Args:
+        bot (TeleBot): Экземпляр бота, методы которого вызываются для отправки.
+        queue (OutboundQueue | None): Очередь с настройками ограничений.
+        workers (int): Количество потоков отправки.
+    """
+
+    def __init__(self, bot: TeleBot, queue: OutboundQueue | None = None, workers: int = OUTBOUND_WORKERS):
+        self.bot = bot
+        self.queue = queue or OutboundQueue()
+        self.workers = workers
+        self._condition = threading.Condition()
+        self._threads = []
+
+    def submit(self, method: str, args: tuple, kwargs: dict, lane: int = INTERACTIVE) -> Future:
+        """
+        Ставит вызов метода бота в очередь.
+
+        Returns:
+            Future: Результат вызова (например, types.Message) или исключение.
+        """
+        future = Future()
+        task = make_task(method, args, kwargs, lane, future, time.monotonic())
+        with self._condition:
+            if not self._threads:
+                self._start()
+            self.queue.put(task)
+            self._condition.notify()
+        return future
+
+    def stats(self) -> dict:
+        with self._condition:
+            return self.queue.stats()
+
+    def _start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'outbound-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                batch, wait = self.queue.pop(time.monotonic())
+                while batch is None:
+                    self._condition.wait(wait)
+                    batch, wait = self.queue.pop(time.monotonic())
+            try:
+                self._execute(batch)
+            finally:
+                with self._condition:
+                    self.queue.done(batch[0].chat_id)
+                    self._condition.notify_all()
+
+    def _execute(self, batch: list) -> None:
+        if len(batch) > 1:
+            method, kwargs = coalesced_call(*batch)
+        else:
+            method, kwargs = batch[0].method, batch[0].kwargs
+        try:
+            rewind_files(kwargs)
+            result = getattr(self.bot, method)(**kwargs)
+        except Exception as e:
+            self._handle_error(batch, e)
+            return
+        for task in batch[:-1]:
+            task.future.set_result(True)  # удаление, объединённое с отправкой
+        batch[-1].future.set_result(result)
+
+    def _handle_error(self, batch: list, error: Exception) -> None:
+        pause = retry_after(error)
+        with self._condition:
+            if pause is not None and batch[0].retries < OUTBOUND_MAX_RETRIES:
+                self.queue.block(batch[0].chat_id, time.monotonic() + pause)
+                for task in reversed(batch):
+                    task.retries += 1
+                    self.queue.put(task, front=True)
+                return
+            if len(batch) > 1:
+                # Сообщение не удалось отредактировать: выполняем удаление и отправку по отдельности
+                for task in reversed(batch):
+                    task.coalesce = False
+                    self.queue.put(task, front=True)
+                return
+        print(f"Ошибка отправки {batch[0].method} в чат {batch[0].chat_id}: {error}")
+        batch[0].future.set_exception(error)
+
+
+class OutboundBot:
+    """
+    Обёртка бота для обработчиков: методы отправки (QUEUED_METHODS) ставят вызов
+    в очередь OutboundDispatcher и сразу возвращают Future, не дожидаясь Bot API;
+    остальные атрибуты берутся у самого бота.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        dispatcher (OutboundDispatcher): Диспетчер отправки.
+        lane (int): Очередь отправки (INTERACTIVE или BACKGROUND).
+    """
+
+    def __init__(self, bot: TeleBot, dispatcher: OutboundDispatcher, lane: int = INTERACTIVE):
+        self.bot = bot
+        self.dispatcher = dispatcher
+        self.lane = lane
+
+    @property
+    def background(self) -> 'OutboundBot':
+        """Та же обёртка, отправляющая через очередь BACKGROUND (для фоновых рассылок)."""
+        return OutboundBot(self.bot, self.dispatcher, BACKGROUND)
+
+    def __getattr__(self, name):
+        if name in QUEUED_METHODS:
+            return lambda *args, **kwargs: self.dispatcher.submit(name, args, kwargs, self.lane)
+        return getattr(self.bot, name)
+
+
+class AsyncOutboundDispatcher:
+    """
+    Асинхронная версия OutboundDispatcher для AsyncTeleBot: очередь обслуживают
+    OUTBOUND_WORKERS задач цикла событий, результаты возвращаются в asyncio.Future.
+    """
+
+    def __init__(self, bot, queue: OutboundQueue | None = None, workers: int = OUTBOUND_WORKERS):
+        self.bot = bot
+        self.queue = queue or OutboundQueue()
+        self.workers = workers
+        self._wakeup = None
+        self._tasks = []
+
+    def submit(self, method: str, args: tuple, kwargs: dict, lane: int = INTERACTIVE) -> asyncio.Future:
+        """
+        Ставит вызов метода бота в очередь (вызывается из цикла событий).
+
+        Returns:
+            asyncio.Future: Результат вызова; его можно не ожидать.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Ошибка уже выведена диспетчером: не ожидаемый никем Future не должен предупреждать о ней
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+        self.queue.put(make_task(method, args, kwargs, lane, future, time.monotonic()))
+        self._wakeup.set()
+        return future
+
+    def stats(self) -> dict:
+        return self.queue.stats()
+
+    async def close(self) -> None:
+        """Останавливает задачи отправки."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            batch, wait = self.queue.pop(time.monotonic())
+            if batch is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._execute(batch)
+            finally:
+                self.queue.done(batch[0].chat_id)
+                self._wakeup.set()
+
+    async def _execute(self, batch: list) -> None:
+        if len(batch) > 1:
+            method, kwargs = coalesced_call(*batch)
+        else:
+            method, kwargs = batch[0].method, batch[0].kwargs
+        try:
+            rewind_files(kwargs)
+            result = await getattr(self.bot, method)(**kwargs)
+        except Exception as e:
+            self._handle_error(batch, e)
+            return
+        for task in batch[:-1]:
+            task.future.set_result(True)
+        batch[-1].future.set_result(result)
+
+    def _handle_error(self, batch: list, error: Exception) -> None:
+        pause = retry_after(error)
+        if pause is not None and batch[0].retries < OUTBOUND_MAX_RETRIES:
+            self.queue.block(batch[0].chat_id, time.monotonic() + pause)
+            for task in reversed(batch):
+                task.retries += 1
+                self.queue.put(task, front=True)
+            return
+        if len(batch) > 1:
+            for task in reversed(batch):
+                task.coalesce = False
+                self.queue.put(task, front=True)
+            return
+        print(f"Ошибка отправки {batch[0].method} в чат {batch[0].chat_id}: {error}")
+        batch[0].future.set_exception(error)
+
+
+class AsyncOutboundBot:
+    """
+    Обёртка AsyncTeleBot для обработчиков (см. OutboundBot). Методы отправки возвращают
+    asyncio.Future: `await bot.send_message(...)` дожидается отправки, а вызов без await
+    только ставит запрос в очередь (так удаление может объединиться со следующей отправкой).
+    """
+
+    def __init__(self, bot, dispatcher: AsyncOutboundDispatcher, lane: int = INTERACTIVE):
+        self.bot = bot
+        self.dispatcher = dispatcher
+        self.lane = lane
+
+    @property
+    def background(self) -> 'AsyncOutboundBot':
+        return AsyncOutboundBot(self.bot, self.dispatcher, BACKGROUND)
+
+    def __getattr__(self, name):
+        if name in QUEUED_METHODS:
+            return lambda *args, **kwargs: self.dispatcher.submit(name, args, kwargs, self.lane)
+        return getattr(self.bot, name)
@@ -0,0 +1,303 @@
+import asyncio
+import inspect
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from cache import MISSING
+from database.scheduler import get_last_run, job_lock, record_run
+
+# Синонимы расписаний в стиле cron
+_CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+# Границы полей: минута, час, день месяца, месяц, день недели (0 и 7 — воскресенье)
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Дальше этого горизонта очередной запуск не ищется (выражения вроде '0 0 30 2 *' никогда не срабатывают)
+_CRON_SEARCH_YEARS = 5
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> frozenset:
+    """
+    Разбирает поле cron-выражения: '*', 'N', 'A-B', списки через запятую и шаг '/S'.
+
+    Returns:
+        frozenset: Допустимые значения поля.
+
+    Raises:
+        ValueError: Если поле записано неверно или выходит за границы.
+    """
+    values = set()
+    for part in field.split(','):
+        part, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = map(int, part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Неверное поле cron-выражения: {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    Расписание в формате cron: 'минута час день_месяца месяц день_недели' (время локальное).
+
+    Как и в cron, если ограничены и день месяца, и день недели,
+    запуск происходит при совпадении любого из них.
+
+    Пример:
+        CronSchedule('30 3 * * *').next_after(datetime.now())  # ближайшие 03:30
+
+    Args:
+        expression (str): Cron-выражение или синоним ('@hourly', '@daily', '@weekly', '@monthly').
+
+    Raises:
+        ValueError: Если выражение записано неверно.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = _CRON_ALIASES.get(expression, expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron-выражение должно состоять из 5 полей: {expression}")
+        minutes, hours, days, months, weekdays = (
+            _parse_cron_field(field, low, high) for field, (low, high) in zip(fields, _CRON_FIELDS)
+        )
+        self.minutes, self.hours, self.days, self.months = minutes, hours, days, months
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays  # в cron воскресенье — 0
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Возвращает ближайший момент запуска строго после `moment`.
+        Несовпадающие месяцы, дни и часы пропускаются целиком.
+
+        Raises:
+            ValueError: Если расписание не срабатывает в ближайшие годы.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        horizon = candidate.year + _CRON_SEARCH_YEARS
+        while candidate.year <= horizon:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Расписание никогда не срабатывает: {self.expression}")
+
+
+class Job:
+    """
+    Задача планировщика и её метрики.
+
+    Args:
+        name (str): Уникальное имя задачи (ключ блокировки и записи в scheduler_jobs).
+        schedule (CronSchedule): Расписание.
+        func: Функция без аргументов или корутинная функция.
+        jitter (float): Максимальная случайная задержка запуска в секундах.
+        exclusive (bool): Выполнять только на одной реплике (advisory-блокировка и история в БД).
+                          Неэксклюзивные задачи (например, вывод метрик процесса) выполняются
+                          на каждой реплике и историю не сохраняют.
+    """
+
+    def __init__(self, name: str, schedule: CronSchedule, func, jitter: float = 0.0, exclusive: bool = True):
+        self.name = name
+        self.schedule = schedule
+        self.func = func
+        self.jitter = jitter
+        self.exclusive = exclusive
+        self.occurrence = None  # Запуск по расписанию, который ожидает выполнения
+        self.run_at = None  # Момент фактического запуска: occurrence + случайная задержка
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0  # Запуски, выполненные другой репликой или пропущенные из-за ошибки БД
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+
+    def plan(self, occurrence: datetime) -> None:
+        self.occurrence = occurrence
+        self.run_at = occurrence + timedelta(seconds=random.uniform(0, self.jitter))
+
+    def stats(self) -> dict:
+        """Возвращает метрики задачи (длительности в секундах)."""
+        return {
+            'schedule': self.schedule.expression,
+            'next_run': self.run_at.isoformat(timespec='seconds') if self.run_at else None,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_duration': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'avg_duration': round(self.total_duration / self.runs, 3) if self.runs else None,
+            'max_duration': round(self.max_duration, 3),
+        }
+
+
+class Scheduler:
+    """
+    Планировщик фоновых задач по cron-расписанию (вместо потока с time.sleep(24 часа)).
+
+    - Запуски привязаны к расписанию, а не к моменту старта процесса, поэтому не дрейфуют.
+    - Эксклюзивную задачу выполняет одна реплика: перед запуском захватывается advisory-блокировка
+      задачи, а по истории в таблице scheduler_jobs реплика, опоздавшая из-за случайной задержки,
+      видит, что этот запуск уже выполнен другой.
+    - Если запуск был пропущен (процесс не работал в момент срабатывания), он выполняется сразу после старта.
+    - Случайная задержка (jitter) разносит запуски реплик и разных задач во времени.
+    - Для каждой задачи собираются метрики длительности (см. stats()).
+
+    Каждый запуск выполняется в отдельном потоке; следующий запуск задачи не начинается,
+    пока не завершён предыдущий. Корутинные функции выполняются в цикле событий `loop`.
+
+    Args:
+        loop (asyncio.AbstractEventLoop | None): Цикл событий для корутинных задач (асинхронный режим).
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self.loop = loop
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add_job(self, name: str, schedule: str, func, jitter: float = 0.0, exclusive: bool = True) -> Job:
+        """
+        Добавляет задачу (параметры см. Job).
+
+        Raises:
+            ValueError: Если задача с таким именем уже есть или расписание записано неверно.
+        """
+        if name in self.jobs:
+            raise ValueError(f"Задача {name} уже добавлена")
+        job = Job(name, CronSchedule(schedule), func, jitter, exclusive)
+        job.plan(job.schedule.next_after(datetime.now()))
+        with self._lock:
+            self.jobs[name] = job
+        self._wakeup.set()
+        return job
+
+    def start(self) -> None:
+        """Запускает планировщик в фоновом потоке (daemon)."""
+        self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает планировщик; уже выполняющиеся задачи доработают в своих потоках."""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        """Возвращает метрики всех задач: {имя: Job.stats()}."""
+        with self._lock:
+            return {name: job.stats() for name, job in self.jobs.items()}
+
+    def _run(self) -> None:
+        self._catch_up()
+        while not self._stopped.is_set():
+            now = datetime.now()
+            with self._lock:
+                due = [job for job in self.jobs.values() if job.run_at <= now and not job.running]
+                for job in due:
+                    job.running = True
+                waiting = [job.run_at for job in self.jobs.values() if not job.running]
+            for job in due:
+                threading.Thread(target=self._execute, args=(job,), name=f'job-{job.name}', daemon=True).start()
+
+            timeout = (min(waiting) - now).total_seconds() if waiting else None
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def _catch_up(self) -> None:
+        """Планирует немедленный запуск эксклюзивных задач, пропущенных, пока процесс не работал."""
+        now = datetime.now()
+        for job in list(self.jobs.values()):
+            if not job.exclusive:
+                continue
+            last_run = get_last_run(job.name)
+            if last_run is MISSING:
+                continue
+            missed = job.schedule.next_after(last_run) if last_run else None
+            if last_run is None or missed <= now:
+                # Никогда не выполнявшаяся задача тоже запускается сразу, как прежде при старте бота
+                with self._lock:
+                    job.plan(missed if missed is not None else now)
+
+    def _execute(self, job: Job) -> None:
+        occurrence = job.occurrence
+        try:
+            if not job.exclusive:
+                self._call(job)
+                return
+
+            try:
+                with job_lock(job.name) as acquired:
+                    last_run = get_last_run(job.name) if acquired else MISSING
+                    if last_run is MISSING or (last_run is not None and last_run >= occurrence):
+                        # Задачу выполняет (или уже выполнила) другая реплика, либо БД недоступна
+                        job.skipped += 1
+                        return
+                    started_at, duration, succeeded = self._call(job)
+                    record_run(job.name, started_at, duration, succeeded)
+            except Exception as e:
+                job.skipped += 1
+                print(f"[!] Задача {job.name} пропущена: нет блокировки в БД ({e})")
+        finally:
+            with self._lock:
+                job.plan(job.schedule.next_after(max(datetime.now(), occurrence)))
+                job.running = False
+            self._wakeup.set()
+
+    def _call(self, job: Job) -> tuple[datetime, float, bool]:
+        """
+        Выполняет функцию задачи и обновляет её метрики.
+
+        Returns:
+            tuple[datetime, float, bool]: Время начала, длительность в секундах и признак успеха.
+        """
+        started_at = datetime.now()
+        started = time.monotonic()
+        succeeded = True
+        try:
+            result = job.func()
+            if inspect.isawaitable(result):
+                asyncio.run_coroutine_threadsafe(result, self.loop).result()
+        except Exception as e:
+            succeeded = False
+            print(f"[!] Ошибка в задаче {job.name}: {e}")
+        duration = time.monotonic() - started
+
+        with self._lock:
+            job.runs += 1
+            job.failures += not succeeded
+            job.last_duration = duration
+            job.total_duration += duration
+            job.max_duration = max(job.max_duration, duration)
+        print(f"[{started_at:%Y-%m-%d %H:%M:%S}] Задача {job.name} выполнена за {duration:.3f} с")
+        return started_at, duration, succeeded
@@ -0,0 +1,315 @@
+import os
+import threading
+from collections import Counter
+
+from telebot.asyncio_storage import StateContext as AsyncStateContext
+from telebot.asyncio_storage import StateStorageBase as AsyncStateStorageBase
+from telebot.storage import StateContext, StateStorageBase
+
+from cache import MISSING, TTLCache
+from config import BOT_MODE
+from states import UserState
+
+# Хранилище состояний FSM (можно переопределить через переменные окружения):
+#   'memory'   — только в памяти процесса, состояния теряются при перезапуске;
+#   'postgres' — таблица bot_states со сквозной записью и кэшем чтения в памяти (STATE_CACHE_TTL).
+STATE_STORAGE = os.getenv('STATE_STORAGE', 'memory')
+STATE_CACHE_SIZE = int(os.getenv('STATE_CACHE_SIZE', 100_000))  # чатов в памяти процесса
+# Простой чата, после которого его состояние удаляется (в памяти — вытеснение, в БД — очистка)
+STATE_IDLE_TTL = float(os.getenv('STATE_IDLE_TTL', 7 * 24 * 60 * 60))
+# Время жизни записи в кэше перед таблицей bot_states; 0 — без кэша, каждое чтение идёт в БД.
+# Кэш безопасен, только если обновления чата обрабатывает одна реплика. В режиме polling так всегда
+# (Telegram отдаёт обновления одному процессу), поэтому кэш включён. В режиме вебхука за балансировщиком
+# реплик может быть несколько, и по умолчанию кэша нет: иначе реплика могла бы вернуть устаревшее состояние
+STATE_CACHE_TTL = float(os.getenv('STATE_CACHE_TTL', 60 * 60 if BOT_MODE == 'polling' else 0))
+
+# Количество блокировок для чтения-изменения-записи состояний (чаты распределяются по хэшу ключа)
+_LOCK_STRIPES = 64
+
+
+def _entry_key(chat_id: int, user_id: int):
+    # В личных чатах chat_id == user_id: ключ — одно число вместо кортежа
+    return chat_id if chat_id == user_id else (chat_id, user_id)
+
+
+def _state_name(state) -> str | None:
+    return state.name if hasattr(state, 'name') else state
+
+
+def _storage_stats(entries: TTLCache, use_cache: bool, backend_counts: Counter | None) -> dict:
+    # Счётчики кэша — только если он используется, обращения к БД — только при заданном бэкенде
+    stats = entries.stats() if use_cache else {}
+    if backend_counts is not None:
+        stats.update({f'db_{name}': backend_counts[name] for name in ('reads', 'writes', 'errors')})
+    return stats
+
+
+class CompactStateStorage(StateStorageBase):
+    """
+    Хранилище состояний FSM для TeleBot вместо StateMemoryStorage.
+
+    Запись чата — кортеж (состояние, данные сценария или None) в TTLCache: число чатов
+    в памяти ограничено `maxsize`, а простаивающие дольше `ttl` секунд вытесняются.
+    Переход в `default_state` завершает сценарий: запись (вместе с данными) удаляется,
+    поэтому для таких чатов get_state возвращает None, как для новых.
+
+    Если задан `backend` (модуль database.states), хранилище становится постоянным:
+    изменения сразу записываются в БД (write-through), а TTLCache служит кэшем чтения,
+    в том числе для отсутствующих записей. Кэш обновляется только после успешной записи.
+    При `ttl=0` кэш отключён и каждое чтение — запрос к БД по первичному ключу
+    (несколько реплик за балансировщиком, см. STATE_CACHE_TTL).
+
+    Args:
+        maxsize (int): Максимальное количество чатов в памяти.
+        ttl (float | None): Время жизни записи в памяти в секундах (с `backend`: 0 — без кэша).
+        default_state: Состояние по умолчанию (State или его имя), которое не хранится.
+        backend: Модуль с функциями load_state, save_state и delete_state или None.
+    """
+
+    def __init__(self, maxsize: int = STATE_CACHE_SIZE, ttl: float | None = STATE_IDLE_TTL,
+                 default_state=None, backend=None):
+        super().__init__()
+        self.default_state = _state_name(default_state)
+        self.backend = backend
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._use_cache = backend is None or ttl != 0
+        self._backend_counts = Counter() if backend is not None else None
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._counts_lock = threading.Lock()
+
+    def _lock(self, chat_id: int, user_id: int) -> threading.Lock:
+        return self._locks[hash(_entry_key(chat_id, user_id)) % _LOCK_STRIPES]
+
+    def _count(self, name: str) -> None:
+        with self._counts_lock:
+            self._backend_counts[name] += 1
+
+    def _get(self, chat_id: int, user_id: int):
+        key = _entry_key(chat_id, user_id)
+        if self._use_cache:
+            entry = self._entries.get(key)
+            if entry is not MISSING or self.backend is None:
+                return None if entry is MISSING else entry
+
+        self._count('reads')
+        entry = self.backend.load_state(chat_id, user_id)
+        if entry is MISSING:
+            self._count('errors')
+            return None  # Ошибка БД: результат не кэшируется
+        if self._use_cache:
+            self._entries.set(key, entry)
+        return entry
+
+    def _put(self, chat_id: int, user_id: int, entry) -> None:
+        key = _entry_key(chat_id, user_id)
+        if self.backend is None:
+            if entry is None:
+                self._entries.pop(key)
+            else:
+                self._entries.set(key, entry)
+            return
+
+        self._count('writes')
+        if entry is None:
+            saved = self.backend.delete_state(chat_id, user_id)
+        else:
+            saved = self.backend.save_state(chat_id, user_id, *entry)
+        if not saved:
+            # В БД осталось прежнее состояние: следующее чтение загрузит его заново
+            self._count('errors')
+            self._entries.pop(key)
+        elif self._use_cache:
+            # Отсутствие записи тоже кэшируется: чаты в состоянии по умолчанию не читают БД
+            self._entries.set(key, entry)
+
+    def set_state(self, chat_id, user_id, state):
+        state = _state_name(state)
+        with self._lock(chat_id, user_id):
+            if state == self.default_state:
+                self._put(chat_id, user_id, None)
+            else:
+                entry = self._get(chat_id, user_id)
+                self._put(chat_id, user_id, (state, entry[1] if entry else None))
+        return True
+
+    def delete_state(self, chat_id, user_id):
+        with self._lock(chat_id, user_id):
+            if self._get(chat_id, user_id) is None:
+                return False
+            self._put(chat_id, user_id, None)
+            return True
+
+    def get_state(self, chat_id, user_id):
+        entry = self._get(chat_id, user_id)
+        return entry[0] if entry else None
+
+    def get_data(self, chat_id, user_id):
+        entry = self._get(chat_id, user_id)
+        if entry is None:
+            return None
+        # Копия: изменения возвращённого словаря не должны обходить запись в хранилище
+        return dict(entry[1]) if entry[1] else {}
+
+    def reset_data(self, chat_id, user_id):
+        with self._lock(chat_id, user_id):
+            entry = self._get(chat_id, user_id)
+            if entry is None:
+                return False
+            self._put(chat_id, user_id, (entry[0], None))
+            return True
+
+    def set_data(self, chat_id, user_id, key, value):
+        with self._lock(chat_id, user_id):
+            entry = self._get(chat_id, user_id)
+            if entry is None:
+                raise RuntimeError('chat_id {} and user_id {} does not exist'.format(chat_id, user_id))
+            self._put(chat_id, user_id, (entry[0], {**(entry[1] or {}), key: value}))
+        return True
+
+    def get_interactive_data(self, chat_id, user_id):
+        return StateContext(self, chat_id, user_id)
+
+    def save(self, chat_id, user_id, data):
+        with self._lock(chat_id, user_id):
+            entry = self._get(chat_id, user_id)
+            if entry is not None:
+                self._put(chat_id, user_id, (entry[0], data or None))
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики кэша состояний (см. TTLCache.stats), если кэш используется,
+        и с бэкендом — обращения к БД: 'db_reads', 'db_writes' и 'db_errors'.
+        """
+        return _storage_stats(self._entries, self._use_cache, self._backend_counts)
+
+
+class AsyncCompactStateStorage(AsyncStateStorageBase):
+    """
+    Асинхронная версия CompactStateStorage для AsyncTeleBot (см. async_main.py).
+    Формат записей и правила хранения те же; `backend` — модуль database.aio.states.
+    """
+
+    def __init__(self, maxsize: int = STATE_CACHE_SIZE, ttl: float | None = STATE_IDLE_TTL,
+                 default_state=None, backend=None):
+        super().__init__()
+        self.default_state = _state_name(default_state)
+        self.backend = backend
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._use_cache = backend is None or ttl != 0
+        self._backend_counts = Counter() if backend is not None else None
+
+    async def _get(self, chat_id: int, user_id: int):
+        key = _entry_key(chat_id, user_id)
+        if self._use_cache:
+            entry = self._entries.get(key)
+            if entry is not MISSING or self.backend is None:
+                return None if entry is MISSING else entry
+
+        self._backend_counts['reads'] += 1
+        entry = await self.backend.load_state(chat_id, user_id)
+        if entry is MISSING:
+            self._backend_counts['errors'] += 1
+            return None  # Ошибка БД: результат не кэшируется
+        if self._use_cache:
+            self._entries.set(key, entry)
+        return entry
+
+    async def _put(self, chat_id: int, user_id: int, entry) -> None:
+        key = _entry_key(chat_id, user_id)
+        if self.backend is None:
+            if entry is None:
+                self._entries.pop(key)
+            else:
+                self._entries.set(key, entry)
+            return
+
+        self._backend_counts['writes'] += 1
+        if entry is None:
+            saved = await self.backend.delete_state(chat_id, user_id)
+        else:
+            saved = await self.backend.save_state(chat_id, user_id, *entry)
+        if not saved:
+            # В БД осталось прежнее состояние: следующее чтение загрузит его заново
+            self._backend_counts['errors'] += 1
+            self._entries.pop(key)
+        elif self._use_cache:
+            self._entries.set(key, entry)
+
+    async def set_state(self, chat_id, user_id, state):
+        state = _state_name(state)
+        if state == self.default_state:
+            await self._put(chat_id, user_id, None)
+        else:
+            entry = await self._get(chat_id, user_id)
+            await self._put(chat_id, user_id, (state, entry[1] if entry else None))
+        return True
+
+    async def delete_state(self, chat_id, user_id):
+        if await self._get(chat_id, user_id) is None:
+            return False
+        await self._put(chat_id, user_id, None)
+        return True
+
+    async def get_state(self, chat_id, user_id):
+        entry = await self._get(chat_id, user_id)
+        return entry[0] if entry else None
+
+    async def get_data(self, chat_id, user_id):
+        entry = await self._get(chat_id, user_id)
+        if entry is None:
+            return None
+        return dict(entry[1]) if entry[1] else {}
+
+    async def reset_data(self, chat_id, user_id):
+        entry = await self._get(chat_id, user_id)
+        if entry is None:
+            return False
+        await self._put(chat_id, user_id, (entry[0], None))
+        return True
+
+    async def set_data(self, chat_id, user_id, key, value):
+        entry = await self._get(chat_id, user_id)
+        if entry is None:
+            raise RuntimeError('chat_id {} and user_id {} does not exist'.format(chat_id, user_id))
+        await self._put(chat_id, user_id, (entry[0], {**(entry[1] or {}), key: value}))
+        return True
+
+    def get_interactive_data(self, chat_id, user_id):
+        return AsyncStateContext(self, chat_id, user_id)
+
+    async def save(self, chat_id, user_id, data):
+        entry = await self._get(chat_id, user_id)
+        if entry is not None:
+            await self._put(chat_id, user_id, (entry[0], data or None))
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики кэша состояний (см. TTLCache.stats), если кэш используется,
+        и с бэкендом — обращения к БД: 'db_reads', 'db_writes' и 'db_errors'.
+        """
+        return _storage_stats(self._entries, self._use_cache, self._backend_counts)
+
+
+def create_state_storage() -> CompactStateStorage:
+    """
+    Создаёт хранилище состояний для TeleBot по настройке STATE_STORAGE.
+
+    Returns:
+        CompactStateStorage: Хранилище в памяти или с постоянным хранением в PostgreSQL.
+    """
+    if STATE_STORAGE == 'postgres':
+        from database import states
+        return CompactStateStorage(ttl=STATE_CACHE_TTL, default_state=UserState.DEFAULT, backend=states)
+    if STATE_STORAGE != 'memory':
+        raise ValueError(f"Неизвестное хранилище состояний: {STATE_STORAGE}")
+    return CompactStateStorage(default_state=UserState.DEFAULT)
+
+
+def create_async_state_storage() -> AsyncCompactStateStorage:
+    """Создаёт хранилище состояний для AsyncTeleBot по настройке STATE_STORAGE."""
+    if STATE_STORAGE == 'postgres':
+        from database.aio import states
+        return AsyncCompactStateStorage(ttl=STATE_CACHE_TTL, default_state=UserState.DEFAULT, backend=states)
+    if STATE_STORAGE != 'memory':
+        raise ValueError(f"Неизвестное хранилище состояний: {STATE_STORAGE}")
+    return AsyncCompactStateStorage(default_state=UserState.DEFAULT)
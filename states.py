@@ -11,3 +11,6 @@ class UserState(StatesGroup):
     WAITING_FOR_EXPENSE_CATEGORY = State()
     WAITING_FOR_EXPENSE_AMOUNT = State()
     WAITING_FOR_NEW_CATEGORY_NAME = State()
+    WAITING_FOR_IMPORT_FILE = State()
+    WAITING_FOR_STATISTICS_PERIOD = State()
+    WAITING_FOR_BASIC_EXPENSES_PERIOD = State()
@@ -1,4 +1,8 @@
-from datetime import datetime, timedelta
+import calendar
+import re
+from datetime import date, datetime, time, timedelta
+
+from config import days_for_statistics
 
 
 def get_time_interval(days: int):
@@ -25,3 +29,220 @@ def get_time_interval(days: int):
     start_date = (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
 
     return {'start_date': start_date, 'end_date': end_date}
+
+
+# --- Движок периодов статистики ---
+# Период — словарь {'start_date', 'end_date'} того же вида, что возвращает get_time_interval.
+# Ключ периода — строка из callback_data кнопок статистики:
+#   'week', 'month'                                  — скользящие N дней (config.days_for_statistics);
+#   'calendar_week', 'calendar_month', 'calendar_quarter', 'calendar_year'
+#                                                    — текущая календарная неделя/месяц/квартал/год;
+#   'range:ГГГГММДД-ГГГГММДД'                        — произвольный диапазон дат;
+#   любой из ключей с суффиксом ':ly'                — тот же период годом ранее.
+# В сравнении (comparison_intervals) суффикс ':ly' означает сравнение периода с тем же периодом
+# годом ранее, а без суффикса период сравнивается с предыдущим (previous_interval).
+
+CALENDAR_PERIODS = ('calendar_week', 'calendar_month', 'calendar_quarter', 'calendar_year')
+LAST_YEAR_SUFFIX = ':ly'
+RANGE_PREFIX = 'range:'
+FORECAST_HISTORY_DAYS = 365  # история для прогноза трат (см. forecast_interval)
+
+# Форматы дат, которые пользователь может ввести текстом
+_DATE_FORMATS = ('%d.%m.%Y', '%d.%m.%y', '%d/%m/%Y', '%Y-%m-%d')
+
+# Даты в тексте: 2024-05-31, 31.05.2024, 31.05.24, 31/05/2024
+_DATE_RE = re.compile(r'\d{4}-\d{1,2}-\d{1,2}|\d{1,2}[./]\d{1,2}[./]\d{2,4}')
+
+
+def date_range_interval(start: date, end: date) -> dict[str, datetime]:
+    """
+    Строит период по двум датам (обе входят в период; порядок не важен).
+
+    Returns:
+        dict[str, datetime]: Словарь с ключами 'start_date' и 'end_date'.
+    """
+    start, end = min(start, end), max(start, end)
+    return {
+        'start_date': datetime.combine(start, time.min),
+        'end_date': datetime.combine(end, time.max),
+    }
+
+
+def calendar_interval(period: str, today: date | None = None) -> dict[str, datetime]:
+    """
+    Вычисляет текущую календарную неделю (с понедельника), месяц, квартал или год целиком.
+
+    Args:
+        period (str): 'calendar_week', 'calendar_month', 'calendar_quarter' или 'calendar_year'.
+        today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Returns:
+        dict[str, datetime]: Словарь с ключами 'start_date' и 'end_date'.
+
+    Raises:
+        ValueError: Если период неизвестен.
+    """
+    today = today or date.today()
+    if period == 'calendar_week':
+        start = today - timedelta(days=today.weekday())
+        return date_range_interval(start, start + timedelta(days=6))
+    if period == 'calendar_month':
+        first_month, months = today.month, 1
+    elif period == 'calendar_quarter':
+        first_month, months = (today.month - 1) // 3 * 3 + 1, 3
+    elif period == 'calendar_year':
+        first_month, months = 1, 12
+    else:
+        raise ValueError(f"Неизвестный календарный период: {period}")
+
+    start = today.replace(month=first_month, day=1)
+    last_month = first_month + months - 1
+    end = start.replace(month=last_month, day=calendar.monthrange(today.year, last_month)[1])
+    return date_range_interval(start, end)
+
+
+def same_period_last_year(interval: dict[str, datetime]) -> dict[str, datetime]:
+    """
+    Сдвигает период на год назад (29 февраля переходит в 28 февраля).
+
+    Returns:
+        dict[str, datetime]: Словарь с ключами 'start_date' и 'end_date'.
+    """
+    return {key: _shift_year(value, -1) for key, value in interval.items()}
+
+
+def previous_interval(key: str, today: date | None = None) -> dict[str, datetime] | None:
+    """
+    Вычисляет период, с которым сравнивается период `key`: предыдущий календарный период
+    (прошлая неделя, месяц, ...) или столько же дней непосредственно перед периодом.
+
+    Args:
+        key (str): Ключ периода (см. resolve_interval).
+        today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Returns:
+        dict[str, datetime] | None: Предыдущий период или None, если ключ не распознан.
+    """
+    interval = resolve_interval(key, today)
+    if interval is None:
+        return None
+    start = interval['start_date'].date()
+    base_key = key.removesuffix(LAST_YEAR_SUFFIX)
+    if base_key in CALENDAR_PERIODS:
+        return calendar_interval(base_key, start - timedelta(days=1))
+    days = (interval['end_date'].date() - start).days + 1
+    return date_range_interval(start - timedelta(days=days), start - timedelta(days=1))
+
+
+def comparison_intervals(key: str, today: date | None = None) -> tuple[dict, dict] | None:
+    """
+    Вычисляет пару периодов для сравнения: 'calendar_month' — этот месяц и прошлый,
+    'calendar_month:ly' — этот месяц и тот же месяц год назад.
+
+    Args:
+        key (str): Ключ периода (см. resolve_interval).
+        today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Returns:
+        tuple[dict, dict] | None: Текущий период и период для сравнения или None, если ключ не распознан.
+    """
+    if key.endswith(LAST_YEAR_SUFFIX):
+        current = resolve_interval(key.removesuffix(LAST_YEAR_SUFFIX), today)
+        previous = resolve_interval(key, today)
+    else:
+        current, previous = resolve_interval(key, today), previous_interval(key, today)
+    if current is None or previous is None:
+        return None
+    return current, previous
+
+
+def forecast_interval(today: date | None = None) -> dict[str, datetime]:
+    """
+    Период истории для прогноза трат: последние FORECAST_HISTORY_DAYS дней, включая сегодня.
+    Длина истории не зависит от того, сколько лет пользователь ведёт учёт.
+
+    Args:
+        today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Returns:
+        dict[str, datetime]: Словарь с ключами 'start_date' и 'end_date'.
+    """
+    today = today or date.today()
+    return date_range_interval(today - timedelta(days=FORECAST_HISTORY_DAYS - 1), today)
+
+
+def _shift_year(moment, years: int):
+    try:
+        return moment.replace(year=moment.year + years)
+    except ValueError:
+        return moment.replace(year=moment.year + years, day=28)
+
+
+def resolve_interval(key: str, today: date | None = None) -> dict[str, datetime] | None:
+    """
+    Вычисляет период по ключу из callback_data (см. описание ключей выше).
+
+    Args:
+        key (str): Ключ периода.
+        today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Returns:
+        dict[str, datetime] | None: Период или None, если ключ не распознан.
+    """
+    last_year = key.endswith(LAST_YEAR_SUFFIX)
+    if last_year:
+        key = key[:-len(LAST_YEAR_SUFFIX)]
+
+    if key in days_for_statistics:
+        interval = get_time_interval(days_for_statistics[key])
+    elif key in CALENDAR_PERIODS:
+        # Календарный период прошлого года вычисляется заново: февраль високосного года длиннее
+        today = today or date.today()
+        return calendar_interval(key, _shift_year(today, -1) if last_year else today)
+    elif key.startswith(RANGE_PREFIX):
+        try:
+            start, end = (datetime.strptime(value, '%Y%m%d').date()
+                          for value in key[len(RANGE_PREFIX):].split('-'))
+        except ValueError:
+            return None
+        interval = date_range_interval(start, end)
+    else:
+        return None
+    return same_period_last_year(interval) if last_year else interval
+
+
+def parse_date(text: str) -> date | None:
+    """
+    Разбирает дату, введённую пользователем: ДД.ММ.ГГГГ, ДД.ММ.ГГ, ДД/ММ/ГГГГ или ГГГГ-ММ-ДД.
+
+    Returns:
+        date | None: Дата или None, если формат не распознан.
+    """
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_date_range(text: str) -> dict[str, datetime] | None:
+    """
+    Разбирает период, введённый текстом: две даты ("01.05.2024 - 31.05.2024")
+    или одна дата (период из одного дня).
+
+    Returns:
+        dict[str, datetime] | None: Период или None, если даты не распознаны.
+    """
+    dates = [parse_date(value) for value in _DATE_RE.findall(text)]
+    if not 1 <= len(dates) <= 2 or None in dates:
+        return None
+    return date_range_interval(dates[0], dates[-1])
+
+
+def interval_label(interval: dict[str, datetime]) -> str:
+    """Возвращает период в виде 'ДД.ММ.ГГГГ — ДД.ММ.ГГГГ' (или одну дату для периода из одного дня)."""
+    start, end = interval['start_date'].date(), interval['end_date'].date()
+    if start == end:
+        return f'{start:%d.%m.%Y}'
+    return f'{start:%d.%m.%Y} — {end:%d.%m.%Y}'